@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Height Estimator Error Benchmark
+
+Compares the analytic block offsets of the 'estimate' split mode (SourceSans3
+glyph metrics, no rendering) against a real WeasyPrint layout of the same blocks
+on the bundled Tickers. Reports per-block offset error, timing, and whether the
+estimated first-page split matches the rendered one.
+
+Usage:
+    python benchmarks/estimator_error.py
+    python benchmarks/estimator_error.py --ticker AZEK --report-type Update --max-height 9.5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+import frontmatter
+
+from generate_report import (
+    estimate_block_offsets,
+    extract_appendix,
+    measure_block_offsets,
+    parse_blocks,
+)
+from measure_backends import COLUMN_WIDTHS, find_reports
+
+# Same first-section height as load_markdown_with_front_matter uses per report type
+HEIGHT_FACTORS = {'Initiating': 1.0, 'Update': 1.85}
+
+
+def first_overflow(offsets, max_height):
+    return next((i for i, height in enumerate(offsets) if height > max_height), len(offsets))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the analytic height estimator against real renders')
+    parser.add_argument('--ticker', '-t', action='append', help='Ticker to benchmark (repeatable, default: all)')
+    parser.add_argument('--report-type', '-r', action='append', choices=['Initiating', 'Update'],
+                        help='Report type to benchmark (repeatable, default: both)')
+    parser.add_argument('--max-height', type=float, default=9.5,
+                        help='Maximum first-section height in inches, as passed to generate_report (default: 9.5)')
+    args = parser.parse_args()
+
+    errors = []
+    split_matches = 0
+    reports = 0
+    time_estimate = time_render = 0.0
+
+    for ticker, report_type, md_path in find_reports(args.ticker, args.report_type):
+        main_content, _, _ = extract_appendix(frontmatter.load(md_path).content)
+        blocks = parse_blocks(main_content)
+        if not blocks:
+            continue
+        column_width = COLUMN_WIDTHS[report_type]
+        max_height = args.max_height * HEIGHT_FACTORS[report_type]
+
+        start = time.perf_counter()
+        estimated = estimate_block_offsets(blocks, project_root, column_width)
+        elapsed_estimate = time.perf_counter() - start
+        start = time.perf_counter()
+        rendered = measure_block_offsets(blocks, project_root, column_width)
+        elapsed_render = time.perf_counter() - start
+
+        diffs = [est - real for est, real in zip(estimated, rendered)]
+        abs_diffs = [abs(diff) for diff in diffs]
+        split_estimated = first_overflow(estimated, max_height)
+        split_rendered = first_overflow(rendered, max_height)
+
+        reports += 1
+        errors.extend(abs_diffs)
+        split_matches += split_estimated == split_rendered
+        time_estimate += elapsed_estimate
+        time_render += elapsed_render
+
+        print(f"\n📊 {ticker} ({report_type}): {len(blocks)} blocks, {rendered[-1]:.2f}in rendered")
+        print(f"   mean |error| {sum(abs_diffs) / len(abs_diffs):.3f}in, max |error| {max(abs_diffs):.3f}in, "
+              f"final offset {diffs[-1]:+.3f}in")
+        print(f"   split at {max_height:.2f}in: estimated {split_estimated}, rendered {split_rendered} "
+              f"{'✅' if split_estimated == split_rendered else '❌'}")
+        print(f"   estimate {elapsed_estimate * 1000:8.1f} ms, render {elapsed_render * 1000:8.1f} ms")
+
+    if not reports:
+        print("⚠️  No markdown reports found under Tickers/ (run the DOCX conversion first)")
+        sys.exit(1)
+
+    errors.sort()
+    p95 = errors[min(len(errors) - 1, int(len(errors) * 0.95))]
+    print(f"\n{'='*60}")
+    print(f"{reports} report(s), {len(errors)} block offsets")
+    print(f"mean |error| {sum(errors) / len(errors):.3f}in, p95 {p95:.3f}in, max {errors[-1]:.3f}in")
+    print(f"split matched in {split_matches}/{reports} report(s)")
+    print(f"estimate {time_estimate * 1000:.1f} ms total, render {time_render * 1000:.1f} ms total")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Measurement Backend Benchmark
+
+Measures the same markdown prefixes with every backend of measure_content_height
+('pdf': write_pdf + PyMuPDF, 'render': WeasyPrint layout tree) on the bundled
+Tickers, and reports time per measurement and the height difference between backends.
+
+Usage:
+    python benchmarks/measure_backends.py
+    python benchmarks/measure_backends.py --ticker AZEK --report-type Initiating --prefixes 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+import frontmatter
+
+from generate_report import (
+    MEASURE_BACKENDS,
+    extract_appendix,
+    md_to_html,
+    measure_content_height,
+    parse_markdown_blocks,
+)
+
+COLUMN_WIDTHS = {'Initiating': 4.85, 'Update': 3.81}
+
+
+def find_reports(tickers=None, report_types=None):
+    """Yield (ticker, report_type, markdown path) for every bundled report with markdown"""
+    for ticker_dir in sorted((project_root / 'Tickers').iterdir()):
+        if not ticker_dir.is_dir() or (tickers and ticker_dir.name not in tickers):
+            continue
+        for report_type in ('Initiating', 'Update'):
+            if report_types and report_type not in report_types:
+                continue
+            md_path = ticker_dir / report_type / f'{ticker_dir.name}.md'
+            if md_path.exists():
+                yield ticker_dir.name, report_type, md_path
+
+
+def benchmark_report(md_path: Path, column_width: float, prefixes: int):
+    """Measure evenly spaced prefixes of one report with every backend"""
+    main_content, _, _ = extract_appendix(frontmatter.load(md_path).content)
+    blocks = parse_markdown_blocks(main_content)
+    if not blocks:
+        return None
+
+    step = max(1, len(blocks) // prefixes)
+    counts = list(range(step, len(blocks) + 1, step))[:prefixes]
+    htmls = [md_to_html("\n\n".join(blocks[:count])) for count in counts]
+
+    results = {}
+    for backend in MEASURE_BACKENDS:
+        start = time.perf_counter()
+        heights = [measure_content_height(html, project_root, column_width, backend) for html in htmls]
+        results[backend] = (heights, time.perf_counter() - start)
+    return len(blocks), counts, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark height measurement backends on the bundled Tickers')
+    parser.add_argument('--ticker', '-t', action='append', help='Ticker to benchmark (repeatable, default: all)')
+    parser.add_argument('--report-type', '-r', action='append', choices=['Initiating', 'Update'],
+                        help='Report type to benchmark (repeatable, default: both)')
+    parser.add_argument('--prefixes', type=int, default=10,
+                        help='Number of evenly spaced prefixes measured per report (default: 10)')
+    args = parser.parse_args()
+
+    totals = {backend: [0.0, 0] for backend in MEASURE_BACKENDS}
+    found = False
+
+    for ticker, report_type, md_path in find_reports(args.ticker, args.report_type):
+        found = True
+        outcome = benchmark_report(md_path, COLUMN_WIDTHS[report_type], args.prefixes)
+        if outcome is None:
+            continue
+        n_blocks, counts, results = outcome
+
+        print(f"\n📊 {ticker} ({report_type}): {n_blocks} blocks, {len(counts)} prefixes")
+        for backend, (heights, elapsed) in results.items():
+            totals[backend][0] += elapsed
+            totals[backend][1] += len(heights)
+            print(f"   {backend:<7} {elapsed / len(heights) * 1000:8.1f} ms/measurement")
+
+        reference = results['pdf'][0]
+        for backend, (heights, _) in results.items():
+            if backend == 'pdf':
+                continue
+            max_diff = max(abs(a - b) for a, b in zip(reference, heights))
+            print(f"   max |{backend} - pdf| = {max_diff:.3f}in")
+
+    if not found:
+        print("⚠️  No markdown reports found under Tickers/ (run the DOCX conversion first)")
+        sys.exit(1)
+
+    print(f"\n{'='*60}")
+    for backend, (elapsed, count) in totals.items():
+        if count:
+            print(f"{backend:<7} {elapsed / count * 1000:8.1f} ms/measurement over {count} measurements")
+
+
+if __name__ == '__main__':
+    main()
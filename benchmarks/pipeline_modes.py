@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Pipeline Mode Benchmark
+
+Runs process_ticker for each bundled ticker in both execution modes (child
+processes per step vs --in-process) and reports the wall-clock difference per
+ticker. Every run is a fresh `python src/process_ticker.py` so both modes pay
+the same outer interpreter startup.
+
+Usage:
+    python benchmarks/pipeline_modes.py
+    python benchmarks/pipeline_modes.py --ticker AZEK --report-type Initiating --repeat 3 --with-conversion
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+
+def find_tickers(tickers=None, report_types=None):
+    """Yield (ticker, report_type) for every bundled ticker folder with a DOCX or markdown"""
+    for ticker_dir in sorted((project_root / 'Tickers').iterdir()):
+        if not ticker_dir.is_dir() or (tickers and ticker_dir.name not in tickers):
+            continue
+        for report_type in ('Initiating', 'Update'):
+            if report_types and report_type not in report_types:
+                continue
+            type_dir = ticker_dir / report_type
+            if type_dir.is_dir() and (any(type_dir.glob('*.docx')) or (type_dir / f'{ticker_dir.name}.md').exists()):
+                yield ticker_dir.name, report_type
+
+
+def time_run(ticker: str, report_type: str, in_process: bool, with_conversion: bool) -> float:
+    cmd = [sys.executable, str(project_root / 'src' / 'process_ticker.py'), ticker, '--report-type', report_type]
+    if not with_conversion:
+        cmd.append('--skip-conversion')
+    if in_process:
+        cmd.append('--in-process')
+    start = time.perf_counter()
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"process_ticker exited with {result.returncode}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare subprocess and in-process pipeline wall clock per ticker')
+    parser.add_argument('--ticker', '-t', action='append', help='Ticker to benchmark (repeatable, default: all)')
+    parser.add_argument('--report-type', '-r', action='append', choices=['Initiating', 'Update'],
+                        help='Report type to benchmark (repeatable, default: both)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per mode and ticker (median is reported, default: 1)')
+    parser.add_argument('--with-conversion', action='store_true',
+                        help='Include the DOCX conversion step (default: reuse existing markdown)')
+    args = parser.parse_args()
+
+    rows = []
+    for ticker, report_type in find_tickers(args.ticker, args.report_type):
+        try:
+            medians = {}
+            for in_process in (False, True):
+                runs = [time_run(ticker, report_type, in_process, args.with_conversion) for _ in range(args.repeat)]
+                medians[in_process] = statistics.median(runs)
+        except RuntimeError as e:
+            print(f"❌ {ticker} ({report_type}): {e}")
+            continue
+        saved = medians[False] - medians[True]
+        rows.append((ticker, report_type, medians[False], medians[True], saved))
+        print(f"📊 {ticker:<8} {report_type:<10} subprocess {medians[False]:6.2f}s   in-process {medians[True]:6.2f}s   "
+              f"saved {saved:+.2f}s ({saved / medians[False]:+.0%})")
+
+    if not rows:
+        print("⚠️  No tickers could be processed under Tickers/")
+        sys.exit(1)
+
+    total_sub = sum(row[2] for row in rows)
+    total_in = sum(row[3] for row in rows)
+    print(f"\n{'='*60}")
+    print(f"{len(rows)} report(s): subprocess {total_sub:.2f}s, in-process {total_in:.2f}s, "
+          f"saved {total_sub - total_in:.2f}s ({(total_sub - total_in) / total_sub:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Split / Render Scaling Benchmark
+
+Generates synthetic reports of increasing size (see synthetic_report.py) and runs
+the full render once per size for every split mode and measurement backend, each
+in a fresh interpreter (via suite.py's case runner). Records split time, total
+render time, measurement renders and peak RSS against the number of blocks, writes
+them to JSON and, when matplotlib is installed, plots time and memory vs size.
+
+Usage:
+    python benchmarks/scaling.py
+    python benchmarks/scaling.py --sizes 50 100 200 400 --modes linear layout --plot scaling.png
+    python benchmarks/scaling.py --report-type Update --backends pdf render --keep
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from suite import SPLIT_MODES
+from synthetic_report import write_report
+
+project_root = Path(__file__).parent.parent
+SUITE = Path(__file__).parent / 'suite.py'
+
+MEASURE_BACKENDS = ('pdf', 'render')
+# Split modes that lay blocks out directly and never use the prefix measurement backend
+BACKEND_INDEPENDENT = ('layout', 'fragment')
+
+
+def run_point(ticker: str, report_type: str, mode: str, backend: str, max_height: float) -> dict:
+    cmd = [sys.executable, str(SUITE), '_case', ticker, report_type, '--repeat', '1', '--split-mode', mode,
+           '--measure-backend', backend, '--max-height', str(max_height)]
+    child = subprocess.run(cmd, capture_output=True, text=True)
+    if child.returncode != 0:
+        return {'error': (child.stderr.strip().splitlines() or ['no output'])[-1]}
+    case = json.loads(child.stdout.strip().splitlines()[-1])
+    return {
+        'split_seconds': case['split_seconds'][0],
+        'render_seconds': case['render_seconds'][0],
+        'measurements': case['measurements'],
+        'peak_rss_mb': case['peak_rss_mb'],
+    }
+
+
+def plot(results: dict, path: Path):
+    """Time and peak RSS against report size, one line per mode/backend (needs matplotlib)"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("ℹ️  matplotlib is not installed; skipping the plot (pip install matplotlib)")
+        return
+
+    fig, (ax_split, ax_render, ax_memory) = plt.subplots(1, 3, figsize=(18, 5))
+    for series, points in results['series'].items():
+        ok = [point for point in points if 'error' not in point]
+        blocks = [point['blocks'] for point in ok]
+        ax_split.plot(blocks, [point['split_seconds'] for point in ok], marker='o', label=series)
+        ax_render.plot(blocks, [point['render_seconds'] for point in ok], marker='o', label=series)
+        ax_memory.plot(blocks, [point['peak_rss_mb'] for point in ok], marker='o', label=series)
+    for axis, title, unit in ((ax_split, 'First-page split', 's'), (ax_render, 'Full render', 's'),
+                              (ax_memory, 'Peak RSS', 'MB')):
+        axis.set_title(title)
+        axis.set_xlabel('markdown blocks')
+        axis.set_ylabel(unit)
+        axis.set_xscale('log')
+        axis.set_yscale('log')
+        axis.grid(True, which='both', alpha=0.3)
+    ax_split.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    print(f"📈 Plot written to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark split and render scaling on synthetic reports')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200, 400, 800],
+                        help='Report sizes in markdown blocks (default: 50 100 200 400 800)')
+    parser.add_argument('--modes', nargs='+', choices=SPLIT_MODES, default=list(SPLIT_MODES),
+                        help='Split modes (default: all)')
+    parser.add_argument('--backends', nargs='+', choices=MEASURE_BACKENDS, default=['pdf'],
+                        help='Measurement backends for the prefix-measuring modes (default: pdf)')
+    parser.add_argument('--report-type', '-r', default='Initiating', choices=['Initiating', 'Update'])
+    parser.add_argument('--max-height', type=float, default=9.5, help='First-page height in inches (default: 9.5)')
+    parser.add_argument('--ticker', default='ZZSCALE', help='Scratch ticker folder for the synthetic reports (default: ZZSCALE)')
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic report seed (default: 0)')
+    parser.add_argument('--output', '-o', default=str(project_root / 'benchmarks' / 'results' / 'scaling.json'),
+                        help='Results JSON (default: benchmarks/results/scaling.json)')
+    parser.add_argument('--plot', default=None, help='Plot PNG (default: next to the results JSON)')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch ticker folder afterwards')
+    args = parser.parse_args()
+
+    ticker = args.ticker.upper()
+    scratch = project_root / 'Tickers' / ticker
+    if scratch.exists() and not args.keep:
+        print(f"⚠️  {scratch} already exists; pick another --ticker or pass --keep to reuse it")
+        sys.exit(1)
+
+    series = [(mode, backend) for mode in args.modes
+              for backend in (['pdf'] if mode in BACKEND_INDEPENDENT else args.backends)]
+    results = {'report_type': args.report_type, 'max_height': args.max_height, 'seed': args.seed,
+               'series': {f'{mode}/{backend}': [] for mode, backend in series}}
+
+    print(f"{'blocks':>7} {'series':<18} {'split':>9} {'render':>9} {'renders':>8} {'peak RSS':>9}")
+    print('-' * 66)
+    try:
+        for size in sorted(args.sizes):
+            write_report(ticker, args.report_type, size, seed=args.seed)
+            for mode, backend in series:
+                point = {'blocks': size, **run_point(ticker, args.report_type, mode, backend, args.max_height)}
+                results['series'][f'{mode}/{backend}'].append(point)
+                if 'error' in point:
+                    print(f"{size:>7} {mode + '/' + backend:<18} ❌ {point['error']}")
+                else:
+                    print(f"{size:>7} {mode + '/' + backend:<18} {point['split_seconds']:8.2f}s {point['render_seconds']:8.2f}s "
+                          f"{point['measurements']:>8} {point['peak_rss_mb']:7.0f}MB")
+    finally:
+        if not args.keep:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\n💾 Results written to {output}")
+    plot(results, Path(args.plot) if args.plot else output.with_suffix('.png'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+CLI Startup Benchmark
+
+Runs each entry point's --help under `python -X importtime` and reports wall clock
+and total import time per command, plus the slowest top-level imports. Heavy
+dependencies (WeasyPrint, PyMuPDF, pypandoc, Jinja, markdown) should not appear
+for commands that do not render or convert.
+
+Usage:
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --repeat 10 --top 8
+    python benchmarks/startup_time.py --command process_ticker
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+
+COMMANDS = {
+    'reports-gen': [str(project_root / 'reports-gen'), '--help'],
+    'process_ticker': [str(project_root / 'src' / 'process_ticker.py'), '--help'],
+    'generate_report': [str(project_root / 'src' / 'generate_report.py'), '--help'],
+    'docx_to_markdown': [str(project_root / 'src' / 'docx_to_markdown.py'), '--help'],
+    'create_config': [str(project_root / 'scripts' / 'create_config.py'), '--help'],
+    'reports-batch': [str(project_root / 'reports-batch'), '--help'],
+}
+
+# Modules that only a render or conversion should load
+HEAVY_MODULES = ('weasyprint', 'fitz', 'pymupdf', 'pypandoc', 'jinja2', 'markdown', 'frontmatter', 'PIL', 'fontTools')
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self µs, cumulative µs, nesting depth) for every line of -X importtime output"""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure(argv: List[str], repeat: int) -> Dict:
+    """Median wall clock and import time of a command over `repeat` runs"""
+    walls, imports = [], []
+    entries = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime', *argv], capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        entries = parse_importtime(result.stderr)
+        imports.append(sum(self_us for _, self_us, _, _ in entries) / 1e6)
+    top_level = sorted((entry for entry in entries if entry[3] == 0), key=lambda entry: -entry[2])
+    loaded = {module.split('.')[0] for module, _, _, _ in entries}
+    return {
+        'wall': statistics.median(walls),
+        'imports': statistics.median(imports),
+        'modules': len(entries),
+        'top': top_level,
+        'heavy': sorted(module for module in HEAVY_MODULES if module in loaded),
+        'returncode': result.returncode,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLI startup and import cost per entry point')
+    parser.add_argument('--command', '-c', action='append', choices=list(COMMANDS),
+                        help='Command to benchmark (repeatable, default: all)')
+    parser.add_argument('--repeat', '-n', type=int, default=5, help='Runs per command; the median is reported (default: 5)')
+    parser.add_argument('--top', type=int, default=5, help='Slowest top-level imports to list per command (default: 5)')
+    args = parser.parse_args()
+
+    print(f"{'command':<18} {'wall':>9} {'imports':>9} {'modules':>8}  heavy dependencies loaded")
+    print('-' * 78)
+    results = {}
+    for name in args.command or list(COMMANDS):
+        outcome = results[name] = measure(COMMANDS[name], args.repeat)
+        status = '' if outcome['returncode'] == 0 else f"  (exit {outcome['returncode']})"
+        print(f"{name:<18} {outcome['wall'] * 1000:7.0f}ms {outcome['imports'] * 1000:7.0f}ms {outcome['modules']:>8}  "
+              f"{', '.join(outcome['heavy']) or '-'}{status}")
+
+    for name, outcome in results.items():
+        print(f"\n📦 {name}: slowest top-level imports (cumulative)")
+        for module, _, cumulative_us, _ in outcome['top'][:args.top]:
+            print(f"   {cumulative_us / 1000:8.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
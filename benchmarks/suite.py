@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+
+Runs the first-page split and the full PDF render for every bundled ticker and
+report type, several times each, and records per case:
+
+    split time, full render time (median and min over the repeats),
+    measurement renders made by the split, peak RSS, output PDF size.
+
+Each case runs in a fresh interpreter so peak RSS is per report, and the persistent
+measurement cache and split memo are bypassed so every repeat does the real work.
+Results are written as JSON; `compare` flags regressions against a stored baseline.
+Everything runs offline on the CPU.
+
+Usage:
+    python benchmarks/suite.py run                                   # → benchmarks/results/<timestamp>.json
+    python benchmarks/suite.py run --repeat 5 --split-mode layout -o current.json
+    python benchmarks/suite.py run --save-baseline                   # Also store as benchmarks/baseline.json
+    python benchmarks/suite.py compare current.json                  # Against benchmarks/baseline.json
+    python benchmarks/suite.py compare current.json --baseline old.json --time-threshold 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+RESULTS_DIR = project_root / 'benchmarks' / 'results'
+DEFAULT_BASELINE = project_root / 'benchmarks' / 'baseline.json'
+
+TICKERS = ('AZEK', 'FFIV', 'HRI', 'IRTC', 'RMD', 'ZBRA')
+REPORT_TYPES = ('Initiating', 'Update')
+SPLIT_MODES = ('linear', 'bisect', 'layout', 'estimate', 'fragment')
+MEASURE_BACKENDS = ('pdf', 'render')
+
+
+def run_case(ticker: str, report_type: str, repeat: int, split_mode: str, max_height: float,
+             measure_backend: str = 'pdf') -> dict:
+    """Benchmark one report in this process (called in a fresh interpreter per case)"""
+    sys.path.insert(0, str(project_root / 'src'))
+    from generate_report import SPLIT_STATS, render_pdf
+
+    split_seconds, render_seconds = [], []
+    measurements = pdf_bytes = None
+    log = io.StringIO()
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / 'report.pdf'
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(log):
+                render_pdf(ticker=ticker, report_type=report_type, output_file=str(output), max_height_inches=max_height,
+                           split_mode=split_mode, measure_backend=measure_backend, use_measure_cache=False,
+                           use_split_memo=False)
+            render_seconds.append(time.perf_counter() - start)
+            split_seconds.append(SPLIT_STATS.get('seconds', 0.0))
+            measurements = SPLIT_STATS.get('measurements')
+            pdf_bytes = output.stat().st_size
+
+    return {
+        'split_seconds': split_seconds,
+        'render_seconds': render_seconds,
+        'measurements': measurements,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,  # KiB on Linux
+        'pdf_bytes': pdf_bytes,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def summarize(case: dict) -> dict:
+    """Medians and minimums of the repeated timings"""
+    return {
+        **case,
+        'split_median': statistics.median(case['split_seconds']),
+        'render_median': statistics.median(case['render_seconds']),
+        'render_min': min(case['render_seconds']),
+    }
+
+
+def command_run(args):
+    cases = [(ticker, report_type) for ticker in (args.ticker or TICKERS) for report_type in (args.report_type or REPORT_TYPES)]
+    results = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': args.repeat,
+            'split_mode': args.split_mode,
+            'measure_backend': args.measure_backend,
+            'max_height': args.max_height,
+        },
+        'cases': {},
+    }
+
+    print(f"{'case':<20} {'split':>8} {'render':>8} {'renders':>8} {'peak RSS':>9} {'PDF':>9}")
+    print('-' * 68)
+    for ticker, report_type in cases:
+        md_path = project_root / 'Tickers' / ticker / report_type / f'{ticker}.md'
+        name = f'{ticker}/{report_type}'
+        if not md_path.exists():
+            print(f"{name:<20} skipped (no {md_path.name}; run the DOCX conversion first)")
+            continue
+        cmd = [sys.executable, __file__, '_case', ticker, report_type, '--repeat', str(args.repeat),
+               '--split-mode', args.split_mode, '--max-height', str(args.max_height),
+               '--measure-backend', args.measure_backend]
+        child = subprocess.run(cmd, capture_output=True, text=True)
+        if child.returncode != 0:
+            print(f"{name:<20} ❌ failed: {(child.stderr.strip().splitlines() or ['no output'])[-1]}")
+            continue
+        case = results['cases'][name] = summarize(json.loads(child.stdout.strip().splitlines()[-1]))
+        print(f"{name:<20} {case['split_median']:7.2f}s {case['render_median']:7.2f}s {case['measurements']:>8} "
+              f"{case['peak_rss_mb']:7.0f}MB {case['pdf_bytes'] / 1024:7.0f}KB")
+
+    if not results['cases']:
+        print("⚠️  No case ran; nothing written")
+        sys.exit(1)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\n💾 Results written to {output}")
+    if args.save_baseline:
+        DEFAULT_BASELINE.write_text(json.dumps(results, indent=2))
+        print(f"📌 Saved as baseline {DEFAULT_BASELINE}")
+
+
+# (metric, relative threshold argument, absolute slack below which differences are noise)
+COMPARED_METRICS = (
+    ('split_median', 'time_threshold', 0.05),
+    ('render_median', 'time_threshold', 0.05),
+    ('measurements', None, 0),
+    ('peak_rss_mb', 'memory_threshold', 5.0),
+    ('pdf_bytes', 'size_threshold', 1024),
+)
+
+
+def command_compare(args):
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    print(f"Baseline {baseline['meta']['commit']} ({baseline['meta']['date']}) vs "
+          f"current {current['meta']['commit']} ({current['meta']['date']})")
+    if baseline['meta'].get('split_mode') != current['meta'].get('split_mode'):
+        print(f"⚠️  Split modes differ: {baseline['meta'].get('split_mode')} vs {current['meta'].get('split_mode')}")
+    if baseline['meta'].get('measure_backend', 'pdf') != current['meta'].get('measure_backend', 'pdf'):
+        print(f"⚠️  Measure backends differ: {baseline['meta'].get('measure_backend', 'pdf')} vs "
+              f"{current['meta'].get('measure_backend', 'pdf')}")
+
+    regressions = 0
+    for name in sorted(set(baseline['cases']) | set(current['cases'])):
+        if name not in current['cases'] or name not in baseline['cases']:
+            print(f"   {name:<20} only in {'baseline' if name in baseline['cases'] else 'current'}")
+            continue
+        old, new = baseline['cases'][name], current['cases'][name]
+        for metric, threshold_arg, slack in COMPARED_METRICS:
+            if old.get(metric) is None or new.get(metric) is None:
+                continue
+            limit = old[metric] * (1 + getattr(args, threshold_arg)) if threshold_arg else old[metric]
+            change = (new[metric] - old[metric]) / old[metric] if old[metric] else 0.0
+            regressed = new[metric] > limit and new[metric] - old[metric] > slack
+            regressions += regressed
+            if regressed or args.verbose:
+                print(f"   {'❌' if regressed else '  '} {name:<20} {metric:<14} {old[metric]:>12.3f} → {new[metric]:>12.3f} "
+                      f"({change:+.1%})")
+
+    if regressions:
+        print(f"\n❌ {regressions} regression(s)")
+        sys.exit(1)
+    print(f"\n✅ No regressions ({len(current['cases'])} case(s))")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the split and full render on the bundled Tickers')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Run the suite and write JSON results')
+    run.add_argument('--ticker', '-t', action='append', help=f"Ticker (repeatable, default: {', '.join(TICKERS)})")
+    run.add_argument('--report-type', '-r', action='append', choices=REPORT_TYPES,
+                     help='Report type (repeatable, default: both)')
+    run.add_argument('--repeat', '-n', type=int, default=3, help='Runs per case (default: 3)')
+    run.add_argument('--split-mode', default='linear', choices=SPLIT_MODES, help='Split mode (default: linear)')
+    run.add_argument('--measure-backend', default='pdf', choices=MEASURE_BACKENDS,
+                     help='Height measurement backend (default: pdf)')
+    run.add_argument('--max-height', type=float, default=9.5, help='First-page height in inches (default: 9.5)')
+    run.add_argument('--output', '-o', help='Results file (default: benchmarks/results/<timestamp>.json)')
+    run.add_argument('--save-baseline', action='store_true', help=f'Also store the results as {DEFAULT_BASELINE.name}')
+
+    compare = subparsers.add_parser('compare', help='Flag regressions of a results file against a baseline')
+    compare.add_argument('current', help='Results file to check')
+    compare.add_argument('--baseline', '-b', default=str(DEFAULT_BASELINE), help='Baseline results (default: benchmarks/baseline.json)')
+    compare.add_argument('--time-threshold', type=float, default=0.15, help='Allowed relative slowdown (default: 0.15)')
+    compare.add_argument('--memory-threshold', type=float, default=0.10, help='Allowed relative peak RSS growth (default: 0.10)')
+    compare.add_argument('--size-threshold', type=float, default=0.05, help='Allowed relative PDF size growth (default: 0.05)')
+    compare.add_argument('--verbose', '-v', action='store_true', help='Print every metric, not only regressions')
+
+    case = subparsers.add_parser('_case')  # Internal: one case in a fresh interpreter, JSON on stdout
+    case.add_argument('ticker')
+    case.add_argument('report_type')
+    case.add_argument('--repeat', type=int, default=3)
+    case.add_argument('--split-mode', default='linear')
+    case.add_argument('--max-height', type=float, default=9.5)
+    case.add_argument('--measure-backend', default='pdf', choices=MEASURE_BACKENDS)
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        command_run(args)
+    elif args.command == 'compare':
+        command_compare(args)
+    else:
+        print(json.dumps(run_case(args.ticker, args.report_type, args.repeat, args.split_mode, args.max_height,
+                                  args.measure_backend)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Synthetic Report Generator
+
+Writes deterministic markdown reports of any size in the dialect docx_to_markdown
+produces (title line, **ALL CAPS** bold headings, pandoc `-   ` bullets, Exhibit /
+image / Source groups, pipe tables, <sup> superscripts, unescaped $ amounts and
+<!-- APPENDIX --> sections), with images copied from assets/Images, so the split
+and render paths can be exercised at sizes well beyond the real 10-40 page reports.
+
+Usage:
+    python benchmarks/synthetic_report.py --blocks 400
+    python benchmarks/synthetic_report.py --blocks 2000 --ticker ZZBIG --report-type Update --appendices 3
+    python benchmarks/synthetic_report.py --blocks 300 --images 0 --tables 0 --seed 7
+"""
+
+import argparse
+import random
+import shutil
+from pathlib import Path
+from typing import List
+
+project_root = Path(__file__).parent.parent
+ASSET_IMAGES = project_root / 'assets' / 'Images'
+
+WORDS = (
+    'revenue margin guidance inventory channel destocking quarter backlog pricing volume demand '
+    'segment residential commercial capex leverage covenant refinancing EBITDA consensus multiple '
+    'valuation downside catalyst management outlook dealer distribution competitor share gross '
+    'operating free cash flow working capital receivables payables promotion elasticity housing '
+    'repair remodel contractor decking railing composite resin supply cost inflation normalization'
+).split()
+
+HEADINGS = (
+    'KEY POINTS', 'PREMISE OF THE SHORT', 'COMPANY DESCRIPTION', 'INVENTORY BUILD', 'MARGIN PRESSURE',
+    'VALUATION', 'CONSENSUS EXPECTATIONS', 'COMPETITIVE LANDSCAPE', 'MANAGEMENT COMMENTARY', 'RISKS TO THE THESIS',
+)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = ' '.join(rng.choice(WORDS) for _ in range(words))
+    # Sprinkle the constructs the conversion leaves behind: dollar amounts, superscripts, emphasis
+    roll = rng.random()
+    if roll < 0.2:
+        text += f' of ${rng.uniform(1, 500):.2f}M'
+    elif roll < 0.3:
+        text += f' in the {rng.randint(1, 4)}<sup>{rng.choice(["st", "nd", "rd", "th"])}</sup> quarter'
+    elif roll < 0.4:
+        text += f' (**{rng.choice(WORDS)}**)'
+    return text[0].upper() + text[1:] + '.'
+
+
+def _paragraph(rng: random.Random) -> str:
+    return ' '.join(_sentence(rng, rng.randint(8, 22)) for _ in range(rng.randint(2, 5)))
+
+
+def _table(rng: random.Random, number: int) -> List[str]:
+    columns = rng.randint(3, 6)
+    header = ['Metric'] + [f"FY{2020 + i}" for i in range(columns - 1)]
+    rows = [header, ['---'] * columns]
+    for _ in range(rng.randint(3, 8)):
+        rows.append([rng.choice(WORDS).title()] + [f'${rng.uniform(10, 900):,.1f}' for _ in range(columns - 1)])
+    return [f'Exhibit {number}: {_sentence(rng, 5)[:-1]}', '| ' + ' |\n| '.join(' | '.join(row) for row in rows) + ' |',
+            'Source: Company filings, The Bindle Paper estimates']
+
+
+def generate_markdown(
+    blocks: int,
+    seed: int = 0,
+    bullets: float = 0.3,
+    headings: int = 12,
+    images: int = 25,
+    tables: int = 30,
+    appendices: int = 1,
+    image_names: List[str] = None,
+) -> str:
+    """Build a synthetic report of roughly `blocks` markdown blocks (as parse_markdown_blocks counts them)
+
+    Args:
+        blocks: Target number of blocks in the main content
+        seed: Random seed; the same arguments always produce the same report
+        bullets: Fraction of body blocks that are bullet points
+        headings: A bold heading every this many blocks (0 for none)
+        images: An Exhibit / image / Source group every this many blocks (0 for none)
+        tables: An Exhibit / table / Source group every this many blocks (0 for none)
+        appendices: Number of <!-- APPENDIX --> sections after the main content
+        image_names: Files under images/ to reference (cycled)
+
+    Returns:
+        Markdown text
+    """
+    rng = random.Random(seed)
+    image_names = image_names or []
+    lines = [f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}: {_sentence(rng, 6)[:-1]}']
+    exhibit = 0
+    count = 1
+    while count < blocks:
+        if headings and count % headings == 1:
+            lines.append(f'**{HEADINGS[(count // headings) % len(HEADINGS)]}**')
+            count += 1
+        elif images and image_names and count % images == 0:
+            exhibit += 1
+            lines += [f'Exhibit {exhibit}: {_sentence(rng, 6)[:-1]}',
+                      f'![](images/{image_names[exhibit % len(image_names)]})',
+                      'Source: Company filings, The Bindle Paper']
+            count += 3
+        elif tables and count % tables == 0:
+            exhibit += 1
+            lines += _table(rng, exhibit)
+            count += 3
+        elif rng.random() < bullets:
+            lines.append(f'-   {_sentence(rng, rng.randint(10, 30))}')
+            count += 1
+        else:
+            lines.append(_paragraph(rng))
+            count += 1
+
+    for number in range(1, appendices + 1):
+        lines += ['<!-- APPENDIX -->', f'**APPENDIX {number}: {rng.choice(HEADINGS)}**']
+        lines += [_paragraph(rng) for _ in range(rng.randint(3, 8))]
+        if tables:
+            exhibit += 1
+            lines += _table(rng, exhibit)
+
+    return '\n\n'.join(lines) + '\n'
+
+
+def write_report(ticker: str, report_type: str, blocks: int, **options) -> Path:
+    """Write Tickers/{ticker}/{report_type}/{ticker}.md with its images; returns the markdown path"""
+    report_dir = project_root / 'Tickers' / ticker / report_type
+    images_dir = report_dir / 'images'
+    images_dir.mkdir(parents=True, exist_ok=True)
+    image_names = sorted(path.name for path in ASSET_IMAGES.glob('*.png'))
+    for name in image_names:
+        if not (images_dir / name).exists():
+            shutil.copyfile(ASSET_IMAGES / name, images_dir / name)
+
+    md_path = report_dir / f'{ticker}.md'
+    md_path.write_text(generate_markdown(blocks, image_names=image_names, **options), encoding='utf-8')
+    return md_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic report in the DOCX conversion dialect')
+    parser.add_argument('--blocks', '-n', type=int, default=400, help='Approximate number of markdown blocks (default: 400)')
+    parser.add_argument('--ticker', '-t', default='ZZSYNTH', help='Ticker folder to write to (default: ZZSYNTH)')
+    parser.add_argument('--report-type', '-r', default='Initiating', choices=['Initiating', 'Update'])
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--bullets', type=float, default=0.3, help='Fraction of body blocks that are bullets (default: 0.3)')
+    parser.add_argument('--headings', type=int, default=12, help='Bold heading every N blocks, 0 for none (default: 12)')
+    parser.add_argument('--images', type=int, default=25, help='Exhibit image every N blocks, 0 for none (default: 25)')
+    parser.add_argument('--tables', type=int, default=30, help='Exhibit table every N blocks, 0 for none (default: 30)')
+    parser.add_argument('--appendices', type=int, default=1, help='Number of appendix sections (default: 1)')
+    args = parser.parse_args()
+
+    md_path = write_report(args.ticker.upper(), args.report_type, args.blocks, seed=args.seed, bullets=args.bullets,
+                           headings=args.headings, images=args.images, tables=args.tables, appendices=args.appendices)
+    print(f"✅ Wrote {md_path} ({md_path.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -18,18 +18,25 @@ from typing import Dict, Any, Optional
 import shutil
 from datetime import datetime
 
-# Try rich for pretty output, fall back to basic
-try:
-    from rich.console import Console
-    from rich.prompt import Prompt, Confirm
-    from rich.panel import Panel
-    from rich.markdown import Markdown
-    from rich import print as rprint
-    HAS_RICH = True
-    console = Console()
-except ImportError:
-    HAS_RICH = False
-    console = None
+# rich gives pretty output when installed; it is loaded by load_rich() after argument
+# parsing so --help and argument errors do not pay for importing it
+HAS_RICH = False
+console = None
+Prompt = Confirm = Panel = None
+
+
+def load_rich():
+    """Try rich for pretty output, fall back to basic"""
+    global HAS_RICH, console, Prompt, Confirm, Panel
+    try:
+        from rich.console import Console
+        from rich.prompt import Prompt, Confirm
+        from rich.panel import Panel
+        HAS_RICH = True
+        console = Console()
+    except ImportError:
+        HAS_RICH = False
+        console = None
 
 
 # ============================================================================
@@ -688,6 +695,7 @@ Examples:
                        help='Edit existing config instead of creating new')
     
     args = parser.parse_args()
+    load_rich()
     
     ticker = args.ticker.upper()
     report_type = args.type
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Batch Report Generation
+
+Renders many tickers and report types in one invocation. Jobs fan out to a pool of
+warm worker processes (each imports WeasyPrint and the report modules once and keeps
+its caches across jobs), per-job status is streamed as jobs finish, and a throughput
+summary is printed at the end. A failing job is reported and the batch carries on.
+With --incremental only reports whose inputs changed since their last successful
+build are rendered (see build_graph.py), so an unchanged tree is checked in well
+under a second without starting any workers. With --convert (and --optimize-images)
+each report's DOCX is converted (and its images re-encoded) once, and its variants are
+rendered after that step finishes; image savings are recorded in .cache/image_savings.json.
+
+Usage:
+    python batch_reports.py                        # Every ticker, both report types
+    python batch_reports.py AZEK FFIV -r Update    # Selected tickers
+    python batch_reports.py 'A*' --variant branded --variant nonbranded --workers 4
+    python batch_reports.py --convert --incremental  # Rebuild only what changed
+    python batch_reports.py --optimize-images --jpeg-quality 80
+"""
+
+import contextlib
+import fnmatch
+import io
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import click
+
+from build_graph import BuildGraph, render_params
+from output_defaults import DEFAULT_DPI, DEFAULT_JPEG_QUALITY
+
+project_root = Path(__file__).parent.parent
+
+REPORT_TYPES = ('Initiating', 'Update')
+VARIANTS = ('branded', 'nonbranded')
+
+# (ticker, report type, nonbranded)
+Job = Tuple[str, str, bool]
+# (ticker, report type): one DOCX conversion and image optimization pass shared by every variant of the report
+Report = Tuple[str, str]
+
+
+def _init_worker():
+    """Import the pipeline and compile the templates once per worker so every job starts warm"""
+    sys.path.insert(0, str(Path(__file__).parent))
+    import generate_report  # noqa: F401
+    import template_env
+
+    template_env.warm()
+
+
+def _run_prepare(report: Report, convert: bool, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one report's DOCX and/or optimize its images in a worker; never raises so one job cannot take down the batch"""
+    ticker, report_type = report
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        output = savings = None
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            type_dir = project_root / 'Tickers' / ticker / report_type
+            if convert:
+                from docx_to_markdown import convert_docx_to_markdown
+
+                docx_name = f'{ticker}_update.docx' if report_type == 'Update' else f'{ticker}.docx'
+                output = convert_docx_to_markdown(str(type_dir / docx_name), ticker=ticker, output_dir=str(type_dir),
+                                                  report_type=report_type)
+            if options.get('optimize_images') and (type_dir / 'images').is_dir():
+                from image_optimizer import optimize_report
+
+                # One process per report: the batch already runs reports in parallel; the parent records the savings
+                savings = optimize_report(ticker, report_type, options['jpeg_quality'], workers=1, record=False)
+        return {'ok': True, 'output': output, 'savings': savings, 'seconds': time.perf_counter() - start,
+                'log': log.getvalue()}
+    except BaseException as e:
+        log.write(traceback.format_exc())
+        return {'ok': False, 'error': f'{type(e).__name__}: {e}', 'seconds': time.perf_counter() - start,
+                'log': log.getvalue()}
+
+
+def _run_job(job: Job, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Render one report in a worker (options are render_pdf keyword arguments); never raises so one job cannot take down the batch"""
+    ticker, report_type, nonbranded = job
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            from generate_report import render_pdf
+
+            output = render_pdf(ticker=ticker, report_type=report_type, nonbranded=nonbranded, **options)
+        return {'ok': True, 'output': output, 'seconds': time.perf_counter() - start, 'log': log.getvalue()}
+    except BaseException as e:
+        log.write(traceback.format_exc())
+        return {'ok': False, 'error': f'{type(e).__name__}: {e}', 'seconds': time.perf_counter() - start,
+                'log': log.getvalue()}
+
+
+def find_jobs(patterns: List[str], report_types: List[str], variants: List[str], convert: bool) -> List[Job]:
+    """Expand ticker names or glob patterns into jobs for every report with markdown (or DOCX when converting)"""
+    tickers_dir = project_root / 'Tickers'
+    names = sorted(path.name for path in tickers_dir.iterdir() if path.is_dir()) if tickers_dir.exists() else []
+    if patterns:
+        selected = [name for name in names if any(fnmatch.fnmatch(name, pattern.upper()) for pattern in patterns)]
+    else:
+        selected = names
+
+    jobs = []
+    for ticker in selected:
+        for report_type in report_types:
+            type_dir = tickers_dir / ticker / report_type
+            source = (type_dir / (f'{ticker}_update.docx' if report_type == 'Update' else f'{ticker}.docx')
+                      if convert else type_dir / f'{ticker}.md')
+            if not source.exists():
+                continue
+            for variant in variants:
+                jobs.append((ticker, report_type, variant == 'nonbranded'))
+    return jobs
+
+
+def _job_label(job: Job) -> str:
+    ticker, report_type, nonbranded = job
+    return f"{ticker} ({report_type}{', non-branded' if nonbranded else ''})"
+
+
+def _print_log(result: Dict[str, Any], verbose: bool):
+    log = result['log'].rstrip()
+    if log and (verbose or not result['ok']):
+        lines = log.splitlines()
+        shown = lines if verbose else lines[-15:]
+        print('\n'.join(f"   │ {line}" for line in shown))
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+@click.command()
+@click.argument('tickers', nargs=-1)
+@click.option('--report-type', '-r', 'report_types', type=click.Choice(list(REPORT_TYPES)), multiple=True,
+              help='Report type to render (repeatable, default: both)')
+@click.option('--variant', 'variants', type=click.Choice(list(VARIANTS)), multiple=True,
+              help='Branded and/or non-branded output (repeatable, default: branded)')
+@click.option('--workers', '-j', type=int, default=None,
+              help='Worker processes (default: CPU count)')
+@click.option('--convert', is_flag=True,
+              help='Convert each DOCX to markdown before rendering (default: render existing markdown)')
+@click.option('--max-height', type=float, default=9.5,
+              help='Maximum height in inches for first page content (default: 9.5)')
+@click.option('--split-mode', type=click.Choice(['linear', 'bisect', 'layout', 'estimate', 'fragment']), default='linear',
+              help='First-page split search (see process_ticker --help)')
+@click.option('--measure-backend', type=click.Choice(['pdf', 'render']), default='pdf',
+              help='Height measurement backend (see process_ticker --help)')
+@click.option('--image-placeholders', is_flag=True,
+              help='Measure images as same-size placeholders read from their headers instead of decoding them')
+@click.option('--image-dpi', type=click.IntRange(min=0), default=0,
+              help=f'Embed images wider than their column resampled to this resolution, e.g. {DEFAULT_DPI} '
+                   '(JPEGs are re-encoded, so this is lossy); default: 0, embed them as extracted')
+@click.option('--optimize-images', is_flag=True,
+              help='Re-encode each report\'s images in their smallest format before rendering and embed those')
+@click.option('--jpeg-quality', type=click.IntRange(1, 95), default=DEFAULT_JPEG_QUALITY,
+              help=f'JPEG quality for photographic images with --optimize-images (default: {DEFAULT_JPEG_QUALITY})')
+@click.option('--incremental', is_flag=True,
+              help='Only build reports whose inputs changed since their last successful build')
+@click.option('--verbose', '-v', is_flag=True, help='Print the full log of every job')
+def main(tickers, report_types, variants, workers, convert, max_height, split_mode, measure_backend,
+         image_placeholders, image_dpi, optimize_images, jpeg_quality, incremental, verbose):
+    """
+    Render many reports at once: TICKERS are names or glob patterns (default: every ticker in Tickers/)
+    """
+    jobs = find_jobs(list(tickers), list(report_types) or list(REPORT_TYPES), list(variants) or ['branded'], convert)
+    if not jobs:
+        print("⚠️  No matching reports found under Tickers/")
+        sys.exit(1)
+
+    # Per-job conversion: with --incremental only jobs whose DOCX changed are reconverted
+    job_convert = {job: convert for job in jobs}
+    graph = BuildGraph() if incremental else None
+    # render_pdf keyword arguments shared by every job; the build stamps compare their output-affecting subset
+    options = {
+        'max_height_inches': max_height,
+        'split_mode': split_mode,
+        'measure_backend': measure_backend,
+        'image_placeholders': image_placeholders,
+        'image_dpi': image_dpi,
+        'optimize_images': optimize_images,
+        'jpeg_quality': jpeg_quality,
+    }
+    params = render_params(options)
+    if graph:
+        check_start = time.perf_counter()
+        stale_jobs = []
+        for job in jobs:
+            ticker, report_type, nonbranded = job
+            convert_reason = graph.convert_stale(ticker, report_type) if convert else None
+            reason = convert_reason or graph.render_stale(ticker, report_type, nonbranded, params)
+            job_convert[job] = convert_reason is not None
+            if reason:
+                stale_jobs.append(job)
+                print(f"🔄 {_job_label(job)}: {reason}")
+        graph.save()
+        print(f"🔍 {len(jobs) - len(stale_jobs)} of {len(jobs)} report(s) up to date "
+              f"(checked in {(time.perf_counter() - check_start) * 1000:.0f} ms)")
+        jobs = stale_jobs
+        if not jobs:
+            return
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+
+    print(f"\n{'='*60}")
+    print(f"📚 Batch: {len(jobs)} report(s) on {workers} worker(s)")
+    print(f"{'='*60}")
+
+    results: Dict[Job, Dict[str, Any]] = {}
+    prepared = set()
+    savings: Dict[str, Dict[str, Any]] = {}
+    retried = set()
+    batch_start = time.perf_counter()
+    pending = list(jobs)
+    while pending:
+        # Spawned workers: a crash (e.g. out of memory) breaks only this pool, which is then restarted
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_worker)
+        futures: Dict[Any, Any] = {}
+        # Renders held back until their report is converted and its images optimized, so variants never race on them
+        waiting: Dict[Report, List[Job]] = {}
+        broken = False
+
+        def finish(job: Job, result: Dict[str, Any]):
+            results[job] = result
+            done = len(results)
+            if result['ok'] and graph:
+                ticker, report_type, nonbranded = job
+                graph.record_render(ticker, report_type, nonbranded, params, Path(result['output']))
+                graph.save()
+            if result['ok']:
+                print(f"✅ [{done}/{len(jobs)}] {_job_label(job)} in {result['seconds']:.1f}s → {result['output']}")
+            else:
+                print(f"❌ [{done}/{len(jobs)}] {_job_label(job)} failed after {result['seconds']:.1f}s: {result['error']}")
+            _print_log(result, verbose)
+
+        def submit(job: Job):
+            nonlocal broken
+            try:
+                futures[executor.submit(_run_job, job, options)] = job
+            except BrokenProcessPool as e:
+                broken = True
+                finish(job, {'ok': False, 'crashed': True, 'error': f'worker crashed: {e}', 'seconds': 0.0, 'log': ''})
+
+        for job in pending:
+            if (job_convert[job] or optimize_images) and job[:2] not in prepared:
+                waiting.setdefault(job[:2], []).append(job)
+            else:
+                submit(job)
+        for report, report_jobs in waiting.items():
+            convert_report = any(job_convert[job] for job in report_jobs)
+            futures[executor.submit(_run_prepare, report, convert_report, options)] = (report, convert_report)
+
+        try:
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool as e:
+                        broken = True
+                        result = {'ok': False, 'crashed': True, 'error': f'worker crashed: {e}', 'seconds': 0.0, 'log': ''}
+                    except Exception as e:
+                        result = {'ok': False, 'error': f'{type(e).__name__}: {e}', 'seconds': 0.0, 'log': ''}
+                    if len(task) == 3:
+                        finish(task, result)
+                        continue
+
+                    report, convert_report = task
+                    ticker, report_type = report
+                    step = 'conversion' if convert_report else 'image optimization'
+                    if result['ok']:
+                        prepared.add(report)
+                        if graph and convert_report:
+                            graph.record_convert(ticker, report_type)
+                            graph.save()
+                        done_steps = ['converted'] if convert_report else []
+                        if result['savings'] and result['savings']['images']:
+                            savings[f'{ticker}/{report_type}'] = summary = result['savings']
+                            saved = (summary['source_bytes'] - summary['bytes']) / (1024 * 1024)
+                            done_steps.append(f"{summary['images']} image(s) optimized, {saved:.1f} MiB saved")
+                        if done_steps:
+                            print(f"📝 {ticker} ({report_type}) {', '.join(done_steps)} in {result['seconds']:.1f}s")
+                        _print_log(result, verbose)
+                        for job in waiting.pop(report):
+                            submit(job)
+                    else:
+                        print(f"❌ {ticker} ({report_type}) {step} failed after {result['seconds']:.1f}s: {result['error']}")
+                        _print_log(result, verbose)
+                        for job in waiting.pop(report):
+                            finish(job, {**result, 'error': f"{step} failed: {result['error']}", 'log': ''})
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        round_jobs, pending = pending, []
+        if broken:
+            # Jobs lost with the crashed pool get one more chance in a fresh pool
+            pending = [job for job in round_jobs if results[job].get('crashed') and job not in retried]
+            retried.update(pending)
+            if pending:
+                print(f"🔁 Worker pool crashed; retrying {len(pending)} job(s) in a fresh pool")
+
+    elapsed = time.perf_counter() - batch_start
+    if savings:
+        from image_optimizer import record_savings
+
+        record_savings(savings)
+    succeeded = [result for result in results.values() if result['ok']]
+    failed = [job for job, result in results.items() if not result['ok']]
+    latencies = [result['seconds'] for result in succeeded]
+
+    print(f"\n{'='*60}")
+    print(f"📊 Batch summary")
+    print(f"{'='*60}")
+    print(f"   Reports: {len(succeeded)} succeeded, {len(failed)} failed, {len(jobs)} total")
+    print(f"   Wall clock: {elapsed:.1f}s on {workers} worker(s)")
+    if succeeded:
+        print(f"   Throughput: {len(succeeded) / elapsed * 60:.1f} reports/minute")
+        print(f"   Latency: p50 {statistics.median(latencies):.1f}s, p95 {_percentile(latencies, 0.95):.1f}s, "
+              f"max {max(latencies):.1f}s")
+    if failed:
+        print(f"   Failed: {', '.join(_job_label(job) for job in failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Incremental Build Graph
+
+Models each report as a small make-style dependency graph and keeps content-hash
+stamps of the inputs every stage was last built from:
+
+    {T}.docx ──convert──▶ {T}.md ──render──▶ PDF
+                                    ▲
+    config yaml, {T}_chart.png, images/*, template + CSS, src/*.py,
+    assets/Base (disclaimer, logos), fonts, render options
+
+A stage is stale when it has never been built, one of its outputs is missing, or the
+hash of any input (or of its options) differs from the stamp. Hashes are memoized by
+(mtime, size), so checking an unchanged tree only stats files and never reads them.
+
+Stamps live in .cache/build_stamps.json and are written by the caller (process_ticker,
+reports-batch) after a stage succeeds.
+
+Usage:
+    python src/build_graph.py status                 # Stale stages for every ticker
+    python src/build_graph.py status AZEK -r Update  # One ticker / report type
+    python src/build_graph.py forget AZEK            # Drop stamps so the next build is full
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+
+from output_defaults import DEFAULT_JPEG_QUALITY
+
+project_root = Path(__file__).parent.parent
+DEFAULT_STAMPS_PATH = project_root / '.cache' / 'build_stamps.json'
+
+REPORT_TYPES = ('Initiating', 'Update')
+
+TEMPLATES = {'Initiating': ('report.html', 'report.css'), 'Update': ('update.html', 'update.css')}
+FONTS = ('SourceSans3-Regular.ttf', 'SourceSans3-Bold.ttf')
+
+# render_pdf keyword arguments that change the PDF it writes, with render_pdf's defaults
+RENDER_OUTPUT_OPTIONS: Dict[str, Any] = {
+    'max_height_inches': 9.5,
+    'split_mode': 'linear',
+    'measure_backend': 'pdf',
+    'image_placeholders': False,
+    'image_dpi': 0,
+    'optimize_images': False,
+    'jpeg_quality': DEFAULT_JPEG_QUALITY,
+    'pdf_profile': None,
+}
+
+
+def docx_path(ticker: str, report_type: str) -> Path:
+    """Source DOCX of a report (Update reports use {TICKER}_update.docx)"""
+    name = f'{ticker}_update.docx' if report_type == 'Update' else f'{ticker}.docx'
+    return project_root / 'Tickers' / ticker / report_type / name
+
+
+def markdown_path(ticker: str, report_type: str) -> Path:
+    return project_root / 'Tickers' / ticker / report_type / f'{ticker}.md'
+
+
+def _relative(path: Path) -> str:
+    try:
+        return str(Path(path).relative_to(project_root))
+    except ValueError:
+        return str(path)
+
+
+class BuildGraph:
+    """Content-hash stamps for the convert and render stages of every report
+
+    Args:
+        stamps_path: JSON file holding stamps and the (mtime, size) → hash memo
+    """
+
+    def __init__(self, stamps_path: Path = DEFAULT_STAMPS_PATH):
+        self.stamps_path = Path(stamps_path)
+        try:
+            data = json.loads(self.stamps_path.read_text())
+        except (OSError, ValueError):
+            data = {}
+        # stage key -> {'inputs': {path: sha256}, 'params': str, 'outputs': [path], 'built': time}
+        self.stages: Dict[str, Dict[str, Any]] = data.get('stages', {})
+        # path -> [mtime_ns, size, sha256]
+        self.hashes: Dict[str, List] = data.get('hashes', {})
+        self._dirty = False
+
+    # ---- hashing -----------------------------------------------------------
+
+    def file_hash(self, path: Path) -> Optional[str]:
+        """sha256 of a file, or None if it does not exist (re-read only when mtime or size changed)"""
+        key = _relative(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        memo = self.hashes.get(key)
+        if memo and memo[0] == stat.st_mtime_ns and memo[1] == stat.st_size:
+            return memo[2]
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        self.hashes[key] = [stat.st_mtime_ns, stat.st_size, h.hexdigest()]
+        self._dirty = True
+        return h.hexdigest()
+
+    # ---- graph -------------------------------------------------------------
+
+    @staticmethod
+    def convert_key(ticker: str, report_type: str) -> str:
+        return f'{ticker}/{report_type}/convert'
+
+    @staticmethod
+    def render_key(ticker: str, report_type: str, nonbranded: bool) -> str:
+        return f"{ticker}/{report_type}/render{'-nb' if nonbranded else ''}"
+
+    def convert_inputs(self, ticker: str, report_type: str) -> List[Path]:
+        return [docx_path(ticker, report_type), project_root / 'src' / 'docx_to_markdown.py']
+
+    def render_inputs(self, ticker: str, report_type: str) -> List[Path]:
+        """Every file the rendered PDF depends on, including every pipeline module in src/"""
+        ticker_dir = project_root / 'Tickers' / ticker / report_type
+        config_name = f'{ticker}_updateconfig.yaml' if report_type == 'Update' else f'{ticker}_config.yaml'
+        templates_dir = project_root / 'src' / 'templates'
+        inputs = [
+            markdown_path(ticker, report_type),
+            ticker_dir / config_name,
+            ticker_dir / f'{ticker}_chart.png',
+            *(templates_dir / name for name in TEMPLATES[report_type]),
+            project_root / 'assets' / 'Base' / 'disclaimer.md',
+            project_root / 'assets' / 'Base' / 'bindle_logo.png',
+            project_root / 'assets' / 'Base' / 'symbol_logo.png',
+            *(project_root / 'assets' / 'fonts' / 'Source_Sans_3' / 'static' / name for name in FONTS),
+            *sorted((project_root / 'src').glob('*.py')),
+        ]
+        images_dir = ticker_dir / 'images'
+        if images_dir.is_dir():
+            inputs.extend(sorted(path for path in images_dir.rglob('*')
+                                 if path.is_file() and not path.name.endswith(':Zone.Identifier')))
+        return inputs
+
+    def _snapshot(self, inputs: List[Path]) -> Dict[str, Optional[str]]:
+        return {_relative(path): self.file_hash(path) for path in inputs}
+
+    def _stale_reason(self, key: str, inputs: List[Path], params: str) -> Optional[str]:
+        stamp = self.stages.get(key)
+        if stamp is None:
+            return 'never built'
+        for output in stamp.get('outputs', []):
+            if not (project_root / output).exists():
+                return f'missing output {output}'
+        if stamp.get('params') != params:
+            return 'options changed'
+        snapshot = self._snapshot(inputs)
+        if set(snapshot) != set(stamp['inputs']):
+            added = sorted(set(snapshot) - set(stamp['inputs']))
+            removed = sorted(set(stamp['inputs']) - set(snapshot))
+            return f"inputs {'added: ' + ', '.join(added) if added else 'removed: ' + ', '.join(removed)}"
+        for path, file_hash in snapshot.items():
+            if stamp['inputs'][path] != file_hash:
+                return f'{path} changed'
+        return None
+
+    def convert_stale(self, ticker: str, report_type: str) -> Optional[str]:
+        """Why the DOCX → markdown stage must run, or None if it is up to date"""
+        if not markdown_path(ticker, report_type).exists():
+            return 'markdown missing'
+        return self._stale_reason(self.convert_key(ticker, report_type), self.convert_inputs(ticker, report_type), '')
+
+    def render_stale(self, ticker: str, report_type: str, nonbranded: bool, params: Dict[str, Any]) -> Optional[str]:
+        """Why the markdown → PDF stage must run, or None if it is up to date
+
+        Args:
+            params: Render options that change the output (see render_params)
+        """
+        return self._stale_reason(self.render_key(ticker, report_type, nonbranded),
+                                  self.render_inputs(ticker, report_type), json.dumps(params, sort_keys=True))
+
+    def _record(self, key: str, inputs: List[Path], params: str, outputs: List[Path]):
+        self.stages[key] = {
+            'inputs': self._snapshot(inputs),
+            'params': params,
+            'outputs': [_relative(path) for path in outputs],
+            'built': time.time(),
+        }
+        self._dirty = True
+
+    def record_convert(self, ticker: str, report_type: str):
+        self._record(self.convert_key(ticker, report_type), self.convert_inputs(ticker, report_type), '',
+                     [markdown_path(ticker, report_type)])
+
+    def record_render(self, ticker: str, report_type: str, nonbranded: bool, params: Dict[str, Any], output: Path):
+        self._record(self.render_key(ticker, report_type, nonbranded), self.render_inputs(ticker, report_type),
+                     json.dumps(params, sort_keys=True), [Path(output)])
+
+    def forget(self, pattern: str = '*') -> int:
+        """Drop stamps whose stage key matches a glob; returns how many were removed"""
+        keys = [key for key in self.stages if fnmatch.fnmatch(key, pattern)]
+        for key in keys:
+            del self.stages[key]
+        self._dirty = self._dirty or bool(keys)
+        return len(keys)
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            self.stamps_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.stamps_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({'stages': self.stages, 'hashes': self.hashes}))
+            tmp_path.replace(self.stamps_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"   ⚠️  Could not write build stamps: {e}")
+
+
+def render_params(render_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Render options that are part of a PDF stamp
+
+    Args:
+        render_kwargs: Keyword arguments for render_pdf; options left out take render_pdf's defaults
+
+    Returns:
+        The RENDER_OUTPUT_OPTIONS subset of render_kwargs. The split inputs (height, mode,
+        measure backend, image placeholders), the embedded images and the PDF profile all
+        change the output; the caches, memo and worker counts only change how fast it is made.
+    """
+    return {name: render_kwargs.get(name, default) for name, default in RENDER_OUTPUT_OPTIONS.items()}
+
+
+def newest_pdf(ticker_dir: Path, since: float) -> Optional[Path]:
+    """Most recent PDF written in a report folder after `since` (for renders run as a subprocess)"""
+    pdfs = [path for path in ticker_dir.glob('*.pdf') if path.stat().st_mtime >= since]
+    return max(pdfs, key=lambda path: path.stat().st_mtime) if pdfs else None
+
+
+def find_reports(patterns: List[str], report_types: List[str]) -> List[Tuple[str, str]]:
+    """(ticker, report type) pairs under Tickers/ matching names or glob patterns"""
+    tickers_dir = project_root / 'Tickers'
+    names = sorted(path.name for path in tickers_dir.iterdir() if path.is_dir()) if tickers_dir.exists() else []
+    if patterns:
+        names = [name for name in names if any(fnmatch.fnmatch(name, pattern.upper()) for pattern in patterns)]
+    return [(name, report_type) for name in names for report_type in report_types
+            if (tickers_dir / name / report_type).is_dir()]
+
+
+@click.group()
+def cli():
+    """Inspect and reset the incremental build stamps"""
+
+
+@cli.command()
+@click.argument('tickers', nargs=-1)
+@click.option('--report-type', '-r', 'report_types', type=click.Choice(list(REPORT_TYPES)), multiple=True,
+              help='Report type (repeatable, default: both)')
+@click.option('--nonbranded', is_flag=True, help='Check the non-branded PDFs instead of the branded ones')
+@click.option('--max-height', type=float, default=9.5, help='Render option the stamps are compared against')
+@click.option('--split-mode', default='linear', help='Render option the stamps are compared against')
+def status(tickers, report_types, nonbranded, max_height, split_mode):
+    """Show which stages are stale and why"""
+    start = time.perf_counter()
+    graph = BuildGraph()
+    params = render_params({'max_height_inches': max_height, 'split_mode': split_mode})
+    stale = 0
+    for ticker, report_type in find_reports(list(tickers), list(report_types) or list(REPORT_TYPES)):
+        if docx_path(ticker, report_type).exists():
+            reason = graph.convert_stale(ticker, report_type)
+            stale += reason is not None
+            print(f"{'🔄' if reason else '✅'} {ticker} ({report_type}) convert: {reason or 'up to date'}")
+        if markdown_path(ticker, report_type).exists():
+            reason = graph.render_stale(ticker, report_type, nonbranded, params)
+            stale += reason is not None
+            print(f"{'🔄' if reason else '✅'} {ticker} ({report_type}) render: {reason or 'up to date'}")
+    graph.save()
+    print(f"\n{stale} stale stage(s), checked in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+@cli.command()
+@click.argument('tickers', nargs=-1)
+def forget(tickers):
+    """Drop stamps (all, or for TICKERS) so the next incremental build rebuilds them"""
+    graph = BuildGraph()
+    removed = sum(graph.forget(f'{ticker.upper()}/*') for ticker in tickers) if tickers else graph.forget()
+    graph.save()
+    print(f"🗑️  Forgot {removed} stage stamp(s)")
+
+
+if __name__ == '__main__':
+    cli()
@@ -10,10 +10,12 @@ import os
 import sys
 import click
 from pathlib import Path
-import pypandoc
 import re
 
+import tracing
 
+
+@tracing.traced('convert_docx_to_markdown')
 def convert_docx_to_markdown(docx_path: str, ticker: str = None, output_dir: str = None, report_type: str = 'Initiating') -> str:
     """
     Convert a DOCX file to Markdown while extracting images.
@@ -27,6 +29,8 @@ def convert_docx_to_markdown(docx_path: str, ticker: str = None, output_dir: str
     Returns:
         Path to the created markdown file
     """
+    import pypandoc  # Loaded only when a conversion actually runs
+    
     docx_path = Path(docx_path)
     
     if not docx_path.exists():
@@ -66,11 +70,12 @@ def convert_docx_to_markdown(docx_path: str, ticker: str = None, output_dir: str
         ]
         
         # Convert the file
-        markdown_content = pypandoc.convert_file(
-            str(docx_path),
-            'markdown',
-            extra_args=extra_args
-        )
+        with tracing.span('pandoc', file=docx_path.name):
+            markdown_content = pypandoc.convert_file(
+                str(docx_path),
+                'markdown',
+                extra_args=extra_args
+            )
         
         # Fix image paths in the markdown content
         # Pandoc extracts images to {extract_path}/media/ but we want them referenced as images/
@@ -114,6 +119,7 @@ def convert_docx_to_markdown(docx_path: str, ticker: str = None, output_dir: str
         raise
 
 
+@tracing.traced('postprocess fix_image_paths')
 def fix_image_paths(markdown_content: str) -> str:
     """
     Fix image paths in markdown content to point to the correct location.
@@ -140,6 +146,7 @@ def fix_image_paths(markdown_content: str) -> str:
     return re.sub(image_pattern, replace_image_path, markdown_content)
 
 
+@tracing.traced('postprocess unescape_dollar_signs')
 def unescape_dollar_signs(markdown_content: str) -> str:
     r"""
     Remove backslash escaping from dollar signs.
@@ -151,6 +158,7 @@ def unescape_dollar_signs(markdown_content: str) -> str:
     return markdown_content.replace(r'\$', '$')
 
 
+@tracing.traced('postprocess convert_superscripts')
 def convert_superscripts(markdown_content: str) -> str:
     """
     Convert pandoc superscript syntax ^text^ to HTML <sup>text</sup>.
@@ -164,6 +172,7 @@ def convert_superscripts(markdown_content: str) -> str:
     return re.sub(r'\^([^\^]{1,3})\^', r'<sup>\1</sup>', markdown_content)
 
 
+@tracing.traced('postprocess unescape_html_comments')
 def unescape_html_comments(markdown_content: str) -> str:
     """
     Unescape HTML comments that pandoc escaped during conversion.
@@ -184,6 +193,7 @@ def unescape_html_comments(markdown_content: str) -> str:
     return re.sub(r'\\<!\\--\s*(.*?)\s*\\--\\>', r'<!-- \1 -->', markdown_content)
 
 
+@tracing.traced('postprocess bold_all_caps_headings')
 def bold_all_caps_headings(markdown_content: str) -> str:
     """
     Convert standalone all-caps lines to bold markdown format.
@@ -293,6 +303,7 @@ def bold_all_caps_headings(markdown_content: str) -> str:
 #     return '\n'.join(result)
 
 
+@tracing.traced('images move_images_from_media_dir')
 def move_images_from_media_dir(images_dir: Path):
     """
     Move images from media/ subdirectory to images/ directory and remove the media directory.
@@ -327,6 +338,7 @@ def move_images_from_media_dir(images_dir: Path):
                 print(f"⚠️  Could not remove media directory: {cleanup_error}")
 
 
+@tracing.traced('images remove_unsupported_images')
 def remove_unsupported_images(images_dir: Path, markdown_file: Path):
     """
     Remove unsupported image formats (EMF, WMF) that PIL/WeasyPrint cannot handle.
@@ -363,7 +375,9 @@ def remove_unsupported_images(images_dir: Path, markdown_file: Path):
 @click.option('--output-dir', '-o', type=click.Path(path_type=Path), 
               help='Output directory for the markdown file (defaults to Tickers/{ticker}/{report_type}/)')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
-def main(docx_file: Path, ticker: str = None, report_type: str = 'Initiating', output_dir: Path = None, verbose: bool = False):
+@click.option('--trace', type=click.Path(path_type=Path), default=None,
+              help='Write a Chrome trace-event JSON of every stage to this path and print a timing summary')
+def main(docx_file: Path, ticker: str = None, report_type: str = 'Initiating', output_dir: Path = None, verbose: bool = False, trace: Path = None):
     """
     Convert a DOCX file to Markdown format while extracting and preserving images.
     
@@ -371,6 +385,9 @@ def main(docx_file: Path, ticker: str = None, report_type: str = 'Initiating', o
     
     Images are extracted to Tickers/{ticker}/{report_type}/images/ and markdown is saved to Tickers/{ticker}/{report_type}/{ticker}.md
     """
+    if trace:
+        tracing.enable(str(trace))
+    
     # Determine ticker from filename if not provided
     if ticker is None:
         ticker = docx_file.stem
@@ -385,6 +402,8 @@ def main(docx_file: Path, ticker: str = None, report_type: str = 'Initiating', o
     
     try:
         # Check if pandoc is available
+        import pypandoc
+        
         pypandoc.get_pandoc_version()
         
         # Convert the file
@@ -401,6 +420,8 @@ def main(docx_file: Path, ticker: str = None, report_type: str = 'Initiating', o
             print("   or")
             print("   uv run --with pypandoc-binary python -c \"import pypandoc; pypandoc.download_pandoc()\"")
         sys.exit(1)
+    finally:
+        tracing.finish()
 
 
 if __name__ == "__main__":
@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import sys
-import io
 import re
+import hashlib
+import json
+import time
 from pathlib import Path
-from typing import Any, Dict, Tuple, List
+from typing import Any, Callable, Dict, Tuple, List
 
-import frontmatter
-import markdown
-import yaml
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from weasyprint import HTML, CSS
+# WeasyPrint, PyMuPDF, python-markdown, frontmatter, PyYAML, Jinja, the template environment
+# and the image and PDF optimizers are imported inside the functions that need them, so
+# importing this module (e.g. for --help) stays cheap
+import tracing
+from output_defaults import DEFAULT_DPI, DEFAULT_JPEG_QUALITY, PDF_PROFILES
+from image_placeholders import PLACEHOLDER_FILL_RGB, PLACEHOLDER_PREFIX, image_signature, substitute_images
+from style_registry import get_registry
+from url_cache import get_fetcher
 
 
 def parse_markdown_blocks(content: str) -> List[str]:
@@ -86,75 +90,201 @@ def parse_markdown_blocks(content: str) -> List[str]:
     return blocks
 
 
-def measure_content_height(html_content: str, project_root: Path, column_width: float = 4.85) -> float:
-    """Render HTML content and return its height in inches
+BLOCK_HEADING = 'heading'
+BLOCK_BULLET = 'bullet'
+BLOCK_PARAGRAPH = 'paragraph'
+
+_LIST_ITEM_RE = re.compile(r'^([\*\-\+]|\d+\.)\s+')
+_ORDERED_ITEM_RE = re.compile(r'^\d+\.\s+')
+# A single-item list as md_to_html renders it: <ul>/<ol start="N"> wrapping one tight <li>
+_SINGLE_ITEM_LIST_RE = re.compile(r'^<(ul|ol)((?: start="\d+")?)>\n<li>(.*)</li>\n</\1>$', re.DOTALL)
+# Markdown whose meaning depends on other blocks: footnotes and reference links
+_REFERENCE_RE = re.compile(r'\[\^|^ {0,3}\[[^\]]+\]:', re.MULTILINE)
+# Blockquotes separated by blank lines merge into one <blockquote> across blocks
+_BLOCKQUOTE_RE = re.compile(r'^ {0,3}>', re.MULTILINE)
+
+
+def _needs_document_context(block: 'Block') -> bool:
+    """Whether a block converts differently on its own than inside the whole document
+    
+    Footnotes and reference links resolve against other blocks, indented blocks continue
+    the previous list item, adjacent blockquotes merge into one, and fenced code and raw
+    HTML may span blank lines (and so several blocks).
+    """
+    source = block.source
+    if _REFERENCE_RE.search(source) or _BLOCKQUOTE_RE.search(source):
+        return True
+    if source.startswith(('    ', '\t', '```', '~~~')):
+        return True
+    return source.startswith('<') and not source.startswith('<!--')
+
+
+class Block:
+    """One logical markdown block with its HTML fragment, converted once and reused
+    
+    Slotted because batch runs keep thousands of these alive.
+    """
+    __slots__ = ('source', 'kind', 'digest', '_html')
+    
+    def __init__(self, source: str, kind: str):
+        self.source = source
+        self.kind = kind  # BLOCK_HEADING, BLOCK_BULLET or BLOCK_PARAGRAPH
+        self.digest = hashlib.blake2b(source.encode('utf-8'), digest_size=16).digest()
+        self._html = None
+    
+    @property
+    def html(self) -> str:
+        """HTML fragment of this block on its own (converted on first use)"""
+        if self._html is None:
+            self._html = md_to_html(self.source)
+        return self._html
+    
+    @property
+    def ordered(self) -> bool:
+        return self.kind == BLOCK_BULLET and bool(_ORDERED_ITEM_RE.match(self.source.lstrip()))
+    
+    def __repr__(self) -> str:
+        preview = self.source[:30].replace('\n', ' ')
+        return f'<Block {self.kind} {preview!r}>'
+
+
+def block_kind(source: str) -> str:
+    """Classify a block from parse_markdown_blocks the same way the parser splits them"""
+    stripped = source.strip()
+    if stripped.startswith('#') or (stripped.startswith('**') and stripped.endswith('**') and '\n' not in stripped):
+        return BLOCK_HEADING
+    if _LIST_ITEM_RE.match(stripped):
+        return BLOCK_BULLET
+    return BLOCK_PARAGRAPH
+
+
+def parse_blocks(content: str) -> List[Block]:
+    """Parse markdown into typed blocks (see parse_markdown_blocks)"""
+    return [Block(source, block_kind(source)) for source in parse_markdown_blocks(content)]
+
+
+def blocks_to_markdown(blocks: List[Block]) -> str:
+    return "\n\n".join(block.source for block in blocks)
+
+
+def _list_run_html(run: List[Block]) -> str:
+    """HTML of consecutive list-item blocks, equal to converting them joined by blank lines"""
+    if len(run) == 1:
+        return run[0].html
+    items = []
+    for block in run:
+        match = _SINGLE_ITEM_LIST_RE.match(block.html)
+        if not match or '<p>' in match.group(3):
+            # Not a plain single-item list: let markdown build this run
+            return md_to_html(blocks_to_markdown(run))
+        items.append(match)
+    # Blank-line separated items make a loose list: every item's text is wrapped in <p>
+    tag, start_attr = items[0].group(1), items[0].group(2)
+    lis = '\n'.join(f'<li>\n<p>{match.group(3)}</p>\n</li>' for match in items)
+    return f'<{tag}{start_attr}>\n{lis}\n</{tag}>'
+
+
+def blocks_to_html(blocks: List[Block]) -> str:
+    """Assemble the HTML of blocks joined by blank lines from their cached fragments
+    
+    Equivalent to md_to_html(blocks_to_markdown(blocks)) but each block is converted
+    only once, however many prefixes or sections it takes part in.
+    """
+    if not blocks:
+        return ''
+    if any(_needs_document_context(block) for block in blocks):
+        # Fragments are not independent here; convert the text as a whole
+        return md_to_html(blocks_to_markdown(blocks))
+    
+    parts = []
+    i = 0
+    while i < len(blocks):
+        block = blocks[i]
+        if block.kind != BLOCK_BULLET:
+            # Markdown leaves a blank line after raw HTML (comments) when more content follows
+            raw = block.source.startswith('<!--') and i + 1 < len(blocks)
+            parts.append(block.html + '\n' if raw else block.html)
+            i += 1
+            continue
+        # Consecutive items of the same list type form one list (sane_lists separates ul/ol)
+        j = i + 1
+        while j < len(blocks) and blocks[j].kind == BLOCK_BULLET and blocks[j].ordered == block.ordered:
+            j += 1
+        parts.append(_list_run_html(blocks[i:j]))
+        i = j
+    return '\n'.join(part for part in parts if part)
+
+
+def _measurement_css(column_width: float, page_css: str = '') -> str:
+    """Stylesheet of the minimal measurement document that mimics the first-page column
     
     Args:
-        html_content: HTML to measure
-        project_root: Project root path for assets
         column_width: Width of column in inches (4.85 for Initiating, 3.81 for Update)
+        page_css: Extra CSS rules appended to the stylesheet (e.g. an @page override)
     """
-    templates_dir = project_root / 'templates'
-    
-    # Create minimal test HTML that mimics the actual column width
-    test_html = f'''
+    return f'''
+    @font-face {{
+      font-family: 'SourceSans3';
+      src: url('assets/fonts/Source_Sans_3/static/SourceSans3-Regular.ttf') format('truetype');
+      font-weight: 400;
+    }}
+    @font-face {{
+      font-family: 'SourceSans3';
+      src: url('assets/fonts/Source_Sans_3/static/SourceSans3-Bold.ttf') format('truetype');
+      font-weight: 700;
+    }}
+    body {{
+      font-family: 'SourceSans3', Arial, sans-serif;
+      margin: 0;
+      padding: 0;
+    }}
+    .test-container {{
+      /* Column width varies by report type:
+         Initiating: 4.85in (page - margins - sidebar - gap)
+         Update: 3.81in (two-column layout) */
+      width: {column_width}in;
+      padding: 0 0 0 0.1in;
+      box-sizing: border-box;
+    }}
+    .md-first > *:first-child {{
+      font-size: 22pt;
+      font-weight: 400;
+      line-height: 1.2;
+      margin-bottom: 0.24in;
+      margin-top: 0;
+      text-align: left;
+    }}
+    .md p {{ 
+      orphans: 2; 
+      widows: 2; 
+      margin-top: 0.1in; 
+      margin-bottom: 0.1in; 
+      text-align: justify; 
+    }}
+    .md > *:first-child {{ margin-top: 0; }}
+    .md h1, .md h2, .md h3 {{ 
+      break-after: avoid; 
+      break-inside: avoid; 
+      margin-top: 0.15in; 
+    }}
+    .md a {{
+      color: #ff0000;
+      text-decoration: underline;
+      word-wrap: break-word;
+      overflow-wrap: break-word;
+    }}
+    .md img {{ max-width: 100%; height: auto; }}
+    {page_css}
+    '''
+
+
+def _measurement_html(html_content: str) -> str:
+    """Wrap HTML content in the measurement document (styled by _measurement_css)"""
+    return f'''
     <!DOCTYPE html>
     <html>
     <head>
       <meta charset="utf-8" />
-      <style>
-        @font-face {{
-          font-family: 'SourceSans3';
-          src: url('assets/fonts/Source_Sans_3/static/SourceSans3-Regular.ttf') format('truetype');
-          font-weight: 400;
-        }}
-        @font-face {{
-          font-family: 'SourceSans3';
-          src: url('assets/fonts/Source_Sans_3/static/SourceSans3-Bold.ttf') format('truetype');
-          font-weight: 700;
-        }}
-        body {{
-          font-family: 'SourceSans3', Arial, sans-serif;
-          margin: 0;
-          padding: 0;
-        }}
-        .test-container {{
-          /* Column width varies by report type:
-             Initiating: 4.85in (page - margins - sidebar - gap)
-             Update: 3.81in (two-column layout) */
-          width: {column_width}in;
-          padding: 0 0 0 0.1in;
-          box-sizing: border-box;
-        }}
-        .md-first > *:first-child {{
-          font-size: 22pt;
-          font-weight: 400;
-          line-height: 1.2;
-          margin-bottom: 0.24in;
-          margin-top: 0;
-          text-align: left;
-        }}
-        .md p {{ 
-          orphans: 2; 
-          widows: 2; 
-          margin-top: 0.1in; 
-          margin-bottom: 0.1in; 
-          text-align: justify; 
-        }}
-        .md > *:first-child {{ margin-top: 0; }}
-        .md h1, .md h2, .md h3 {{ 
-          break-after: avoid; 
-          break-inside: avoid; 
-          margin-top: 0.15in; 
-        }}
-        .md a {{
-          color: #ff0000;
-          text-decoration: underline;
-          word-wrap: break-word;
-          overflow-wrap: break-word;
-        }}
-        .md img {{ max-width: 100%; height: auto; }}
-      </style>
     </head>
     <body>
       <div class="test-container">
@@ -165,24 +295,110 @@ def measure_content_height(html_content: str, project_root: Path, column_width:
     </body>
     </html>
     '''
+
+
+def measurement_resources(project_root: Path, column_width: float, page_css: str = '') -> Tuple[Any, Any]:
+    """Return (stylesheet, font configuration) for measurement renders, parsed once per process
+    
+    Both come from the shared style registry, so measurement renders and the final render
+    load the @font-face fonts into the same configuration.
+    """
+    return get_registry().inline_stylesheet(_measurement_css(column_width, page_css), str(project_root))
+
+
+_fitz = None
+
+
+def _pymupdf():
+    """PyMuPDF, imported on the first PDF measurement rather than on every call"""
+    global _fitz
+    if _fitz is None:
+        import fitz
+        
+        _fitz = fitz
+    return _fitz
+
+
+def _render_measurement(html_content: str, project_root: Path, column_width: float, page_css: str = ''):
+    """Lay out HTML content in the measurement document and return the WeasyPrint Document"""
+    from weasyprint import HTML
+    
+    stylesheet, font_config = measurement_resources(project_root, column_width, page_css)
+    with tracing.span('weasyprint layout (measure)'):
+        return HTML(string=_measurement_html(html_content), base_url=str(project_root), url_fetcher=get_fetcher()).render(
+            stylesheets=[stylesheet], font_config=font_config)
+
+
+def _iter_boxes(box, line=None):
+    """Yield (box, enclosing line box) for a WeasyPrint box and all its descendants"""
+    from weasyprint.formatting_structure import boxes
+    
+    if isinstance(box, boxes.LineBox):
+        line = box
+    yield box, line
+    for child in getattr(box, 'children', ()):
+        yield from _iter_boxes(child, line)
+
+
+def _content_bottom(page_box) -> float:
+    """Return the bottom of the lowest line or image on a laid-out page, in CSS pixels
+    
+    Mirrors what the PDF backend reads back with PyMuPDF: text lines and images,
+    ignoring empty containers and trailing margins.
+    """
+    from weasyprint.formatting_structure import boxes
+    
+    max_y = 0.0
+    for box, _ in _iter_boxes(page_box):
+        if isinstance(box, boxes.LineBox) and box.children:
+            max_y = max(max_y, box.position_y + box.height)
+        elif isinstance(box, boxes.ReplacedBox):
+            max_y = max(max_y, box.border_box_y() + box.border_height())
+    return max_y
+
+
+MEASURE_BACKENDS = ('pdf', 'render')
+
+
+def measure_content_height(html_content: str, project_root: Path, column_width: float = 4.85, backend: str = 'pdf') -> float:
+    """Render HTML content and return its height in inches
+    
+    Args:
+        html_content: HTML to measure
+        project_root: Project root path for assets
+        column_width: Width of column in inches (4.85 for Initiating, 3.81 for Update)
+        backend: 'pdf' writes a PDF and reads text bounding boxes back with PyMuPDF,
+                 'render' reads box positions straight from WeasyPrint's layout tree
+    """
+    if backend == 'render':
+        # Lay out only: no PDF serialization and no PyMuPDF parse
+        document = _render_measurement(html_content, project_root, column_width)
+        if not document.pages:
+            return 0.0
+        return _content_bottom(document.pages[0]._page_box) / 96.0  # CSS pixels → inches
+    
+    if backend != 'pdf':
+        raise ValueError(f"Unknown measurement backend: {backend} (expected one of {', '.join(MEASURE_BACKENDS)})")
     
     # Render to PDF in memory
-    pdf_bytes = HTML(string=test_html, base_url=str(project_root)).write_pdf()
+    from weasyprint import HTML
     
-    # Parse PDF to get height
-    from weasyprint.document import Document
-    import fitz  # PyMuPDF for PDF parsing
+    stylesheet, font_config = measurement_resources(project_root, column_width)
+    with tracing.span('weasyprint write_pdf (measure)'):
+        pdf_bytes = HTML(string=_measurement_html(html_content), base_url=str(project_root), url_fetcher=get_fetcher()).write_pdf(
+            stylesheets=[stylesheet], font_config=font_config)
     
     # Use PyMuPDF to get content height
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    if len(doc) == 0:
-        return 0.0
-    
-    page = doc[0]
-    # Get the bounding box of all content
-    blocks = page.get_text("dict")["blocks"]
+    with tracing.span('pymupdf parse (measure)'):
+        doc = _pymupdf().open(stream=pdf_bytes, filetype="pdf")
+        if len(doc) == 0:
+            return 0.0
+        
+        page = doc[0]
+        # Get the bounding box of all content
+        blocks = page.get_text("dict")["blocks"]
     
-    if not blocks:
+    if not blocks and PLACEHOLDER_PREFIX not in html_content:
         return 0.0
     
     # Find the bottom-most content
@@ -191,6 +407,13 @@ def measure_content_height(html_content: str, project_root: Path, column_width:
         if "bbox" in block:
             max_y = max(max_y, block["bbox"][3])  # bbox[3] is the bottom coordinate
     
+    if PLACEHOLDER_PREFIX in html_content:
+        # Image placeholders are vector drawings, not image blocks: find them by their fill
+        for drawing in page.get_drawings():
+            fill = drawing.get('fill')
+            if fill and all(abs(a - b) < 0.002 for a, b in zip(fill, PLACEHOLDER_FILL_RGB)):
+                max_y = max(max_y, drawing['rect'].y1)
+    
     doc.close()
     
     # Convert points to inches (72 points = 1 inch)
@@ -199,65 +422,642 @@ def measure_content_height(html_content: str, project_root: Path, column_width:
     return height_inches
 
 
-def split_markdown_by_height(
-    content: str,
-    max_height_inches: float,
+# Marker appended to each block so its position can be read back from one layout
+BLOCK_MARKER_PREFIX = 'block-end-'
+
+# A single very tall page keeps every block offset on one continuous y axis
+# (same width and default margins as the measurement page, so offsets match page 1)
+LAYOUT_PAGE_CSS = '@page { size: 210mm 2000in; }'
+
+
+def _mark_block(block: str, index: int, inline: bool = True) -> str:
+    """Append an empty marker element to the end of a markdown block's source
+    
+    The marker is inline (at the end of the block's last line) wherever markdown allows it,
+    so it sits on the block's last line box. Tables, raw HTML, rules and code fences cannot
+    take inline HTML on their last line, so they get a separate empty marker div instead
+    (as does every block when inline is False).
+    """
+    last_line = block.splitlines()[-1].strip() if block.strip() else ''
+    marker_id = f'{BLOCK_MARKER_PREFIX}{index}'
+    if (not inline or not last_line or last_line.startswith(('|', '+', '<', '```', '~~~'))
+            or re.match(r'^([-*_=])(\s*\1){2,}$', last_line)):
+        return f'{block}\n\n<div id="{marker_id}"></div>'
+    return f'{block}<span id="{marker_id}"></span>'
+
+
+def measure_block_offsets(blocks: List[Block], project_root: Path, column_width: float = 4.85, first_child: bool = True, image_base: Path = None) -> List[float]:
+    """Lay out all blocks once and return the cumulative bottom offset of each block
+    
+    Every block gets a marker element; after a single WeasyPrint layout the marker
+    positions give the bottom of each block, in inches from the top of the page
+    (the same coordinates measure_content_height reports for a prefix).
+    
+    Args:
+        blocks: Markdown blocks from parse_blocks
+        project_root: Project root path for assets
+        column_width: Width of column in inches (4.85 for Initiating, 3.81 for Update)
+        first_child: Whether blocks[0] starts the column. When False the blocks are laid out
+                     after an empty spacer, so blocks[0] is styled like a block mid-report
+        image_base: Directory images resolve against; when given, images are measured as
+                    same-size placeholders (see image_placeholders) instead of being decoded
+    
+    Returns:
+        offsets[i] is the rendered height of blocks[:i+1] in inches
+    """
+    document = _render_measurement(_marked_html(blocks, first_child, image_base), project_root, column_width, page_css=LAYOUT_PAGE_CSS)
+    
+    # Bottom of each marker in CSS pixels, on one continuous axis across pages
+    bottoms: Dict[int, float] = {}
+    page_top = 0.0
+    for page in document.pages:
+        for box, line in _iter_boxes(page._page_box):
+            element = box.element
+            if element is None or box.element_tag is None:
+                continue
+            marker_id = element.get('id') or ''
+            if not marker_id.startswith(BLOCK_MARKER_PREFIX):
+                continue
+            index = int(marker_id[len(BLOCK_MARKER_PREFIX):])
+            if line is not None:
+                # Inline marker: the block ends with the line box that holds it
+                bottom = line.position_y + line.height
+            else:
+                # Block marker: the block ends where the (empty) marker starts
+                bottom = box.position_y
+            bottoms[index] = max(bottoms.get(index, 0.0), page_top + bottom)
+        page_top += page.height
+    
+    return _offsets_from_bottoms(bottoms, len(blocks))
+
+
+def _marked_html(blocks: List[Block], first_child: bool = True, image_base: Path = None) -> str:
+    """HTML of blocks with a marker element at the end of each one (see _mark_block)"""
+    marked_md = "\n\n".join(_mark_block(block.source, i) for i, block in enumerate(blocks))
+    if not first_child:
+        marked_md = "<div></div>\n\n" + marked_md
+    html_content = md_to_html(marked_md)
+    return substitute_images(html_content, image_base) if image_base is not None else html_content
+
+
+def _offsets_from_bottoms(bottoms: Dict[int, float], count: int) -> List[float]:
+    """Turn marker bottoms in CSS pixels into monotonic block offsets in inches"""
+    # Blocks whose marker produced no box (e.g. HTML comments) end where the previous block ended
+    offsets = []
+    current = 0.0
+    for i in range(count):
+        current = max(current, bottoms.get(i, current))
+        offsets.append(current / 96.0)  # CSS pixels → inches
+    return offsets
+
+
+def estimate_block_offsets(blocks: List[Block], project_root: Path, column_width: float = 4.85, first_child: bool = True, image_base: Path = None) -> List[float]:
+    """Predict the offsets measure_block_offsets would return, without rendering
+    
+    Wraps text with the SourceSans3 glyph advances and applies the measurement
+    stylesheet's sizes and margins (see height_estimator). Typically within a line
+    or two of a real render; use it to pick candidates, not as the final word.
+    
+    Returns:
+        offsets[i] is the estimated height of blocks[:i+1] in inches
+    """
+    from height_estimator import get_estimator
+    
+    estimator = get_estimator(project_root, column_width)
+    with tracing.span('estimate offsets', blocks=len(blocks)):
+        estimator.layout(_marked_html(blocks, first_child, image_base))
+    bottoms = {
+        int(marker[len(BLOCK_MARKER_PREFIX):]): bottom
+        for marker, bottom in estimator.markers.items()
+        if marker.startswith(BLOCK_MARKER_PREFIX)
+    }
+    return _offsets_from_bottoms(bottoms, len(blocks))
+
+
+SPLIT_MODES = ('linear', 'bisect', 'layout', 'estimate')
+
+# Statistics of the most recent split (mode, backend, blocks, measurements, split index;
+# seconds is set by load_markdown_with_front_matter and includes the memo lookup)
+SPLIT_STATS: Dict[str, Any] = {}
+
+
+def _measure_prefixes(
+    blocks: List[Block],
+    counts: List[int],
     project_root: Path,
-    column_width: float = 4.85
-) -> Tuple[str, str]:
-    """Split markdown based on rendered height using incremental approach
+    column_width: float,
+    backend: str = 'pdf',
+    pool=None,
+    image_base: Path = None
+) -> List[Any]:
+    """Render prefixes of `counts` blocks and return their heights in inches
+    
+    Prefixes are measured concurrently when a MeasurePool is given. A failed measurement
+    yields its exception in place of the height, so callers can apply their own policy.
+    With image_base, images are measured as placeholders (see measure_block_offsets).
+    """
+    htmls = [blocks_to_html(blocks[:count]) for count in counts]
+    if image_base is not None:
+        htmls = [substitute_images(prefix_html, image_base) for prefix_html in htmls]
+    if pool is not None:
+        with tracing.span('measure prefixes (pool)', blocks=list(counts), backend=backend) as trace:
+            results = pool.measure_heights(htmls, column_width, backend)
+            trace.set(heights=[None if isinstance(height, Exception) else round(height, 3) for height in results])
+        return results
+    
+    results = []
+    for count, prefix_html in zip(counts, htmls):
+        with tracing.span('measure prefix', block_index=count - 1, blocks=count, backend=backend) as trace:
+            try:
+                results.append(measure_content_height(prefix_html, project_root, column_width, backend))
+                trace.set(height=round(results[-1], 3))
+            except Exception as e:
+                results.append(e)
+    return results
+
+
+# Fonts declared by the measurement stylesheet (part of every measurement cache key)
+MEASUREMENT_FONTS = ('SourceSans3-Regular.ttf', 'SourceSans3-Bold.ttf')
+
+_fingerprint_memo: Dict[Tuple, str] = {}
+
+
+def measurement_fingerprint(project_root: Path, column_width: float) -> str:
+    """Hash everything besides the markdown that affects a measurement:
+    column width, measurement CSS and font files"""
+    from measure_cache import digest
+    
+    font_paths = [project_root / 'assets' / 'fonts' / 'Source_Sans_3' / 'static' / name for name in MEASUREMENT_FONTS]
+    stamps = tuple((path.stat().st_mtime_ns, path.stat().st_size) if path.exists() else None for path in font_paths)
+    memo_key = (str(project_root), column_width, stamps)
+    if memo_key not in _fingerprint_memo:
+        parts = [repr(column_width).encode(), _measurement_css(column_width, page_css=LAYOUT_PAGE_CSS).encode()]
+        parts += [path.read_bytes() if path.exists() else b'' for path in font_paths]
+        _fingerprint_memo[memo_key] = digest(*parts)
+    return _fingerprint_memo[memo_key]
+
+
+def _continues_list(blocks: List[Block], i: int, j: int) -> bool:
+    """Whether blocks[i] and blocks[j] are items of one list (consecutive items of the same type)"""
+    return (0 <= min(i, j) and max(i, j) < len(blocks)
+            and blocks[i].kind == BLOCK_BULLET and blocks[j].kind == BLOCK_BULLET
+            and blocks[i].ordered == blocks[j].ordered)
+
+
+def _list_context(blocks: List[Block], i: int) -> Tuple[bytes, ...]:
+    """Extra cache key parts for a block next to a list item
+    
+    A list of more than one item is loose (every item wrapped in <p>), so a list item's height
+    depends on the items on both sides of it, and so does the increment of the block after it.
+    """
+    if not any(0 <= k < len(blocks) and blocks[k].kind == BLOCK_BULLET for k in (i - 1, i)):
+        return ()
+    loose = [_continues_list(blocks, k, k - 1) or _continues_list(blocks, k, k + 1) for k in (i - 1, i)]
+    return (b'loose-list:%d%d' % tuple(loose),)
+
+
+def _measure_block_windows(
+    blocks: List[Block],
+    windows: List[Tuple[int, int]],
+    project_root: Path,
+    column_width: float,
+    pool=None,
+    image_base: Path = None
+) -> Dict[int, float]:
+    """Lay out windows of blocks and return each block's height increment
+    
+    A window (start, end) covers blocks[start:end + 1] and is laid out together with the
+    block before it, so the increment includes the margin collapsed with that block.
+    List items at either edge bring a neighbouring item of their list along, so the list
+    is as loose or tight as in the full report. A window starting at the top of the report
+    starts the column.
+    
+    Returns:
+        {block index: its bottom minus the previous block's bottom, in inches}
+    """
+    layouts = []
+    for start, end in windows:
+        window_start = max(start - 1, 0)
+        if _continues_list(blocks, window_start, window_start - 1):
+            window_start -= 1
+        window_end = end + 1 if _continues_list(blocks, end, end + 1) else end
+        layouts.append((window_start, blocks[window_start:window_end + 1], window_start == 0))
+    
+    if pool is not None:
+        with tracing.span('measure block windows (pool)', windows=[list(w) for w in windows]):
+            all_offsets = pool.block_offsets(
+                [([block.source for block in window], first_child) for _, window, first_child in layouts], column_width,
+                image_base)
+    else:
+        all_offsets = []
+        for (start, end), (_, window, first_child) in zip(windows, layouts):
+            with tracing.span('measure block window', first_block=start, last_block=end) as trace:
+                all_offsets.append(measure_block_offsets(window, project_root, column_width, first_child=first_child, image_base=image_base))
+                trace.set(height=round(all_offsets[-1][-1], 3) if all_offsets[-1] else 0.0)
+    
+    deltas = {}
+    for (start, end), (window_start, _, _), offsets in zip(windows, layouts, all_offsets):
+        for i in range(start, end + 1):
+            j = i - window_start
+            deltas[i] = offsets[j] - offsets[j - 1] if i else offsets[0]
+    return deltas
+
+
+def _cumulative(deltas: List[float]) -> List[float]:
+    offsets = []
+    current = 0.0
+    for delta in deltas:
+        current += delta
+        offsets.append(current)
+    return offsets
+
+
+def measure_block_offsets_cached(
+    blocks: List[Block],
+    project_root: Path,
+    column_width: float = 4.85,
+    label: str = '',
+    pool=None,
+    image_base: Path = None
+) -> Tuple[List[float], int]:
+    """Cumulative block offsets like measure_block_offsets, served from the persistent cache
+    
+    The cache stores each block's height increment (its bottom minus the previous block's
+    bottom), keyed by the block, the block before it (margins collapse across the pair),
+    whether either of them sits in a loose list (see _list_context) and the measurement
+    fingerprint. Only runs of new or changed blocks are laid out, each together with its
+    preceding block for context.
     
     Args:
-        content: Markdown content to split
-        max_height_inches: Maximum height for first section
-        project_root: Project root path
+        blocks: Markdown blocks from parse_blocks
+        project_root: Project root path for assets
         column_width: Width of column in inches (4.85 for Initiating, 3.81 for Update)
+        label: Name of the report, recorded with the run's hit/miss statistics
+        pool: Optional MeasurePool that lays out the missing windows concurrently
+        image_base: Measure images as placeholders resolved against this directory;
+                    their sizes become part of the cache keys
+    
+    Returns:
+        (offsets in inches, number of layout renders made)
     """
+    from measure_cache import digest, get_cache
     
-    print(f"🔍 Splitting markdown by height (max: {max_height_inches}in, column: {column_width}in)...")
+    cache = get_cache()
+    context = measurement_fingerprint(project_root, column_width).encode()
+    if image_base is None:
+        keys = [
+            digest(context, blocks[i - 1].digest if i else b'', block.digest, *_list_context(blocks, i))
+            for i, block in enumerate(blocks)
+        ]
+    else:
+        # Placeholder heights depend on the referenced images' sizes, not just the markdown
+        context = digest(context, b'image-placeholders').encode()
+        keys = [
+            digest(context, blocks[i - 1].digest if i else b'', block.digest,
+                   image_signature(block.html, image_base) if '<img' in block.html else b'',
+                   *_list_context(blocks, i))
+            for i, block in enumerate(blocks)
+        ]
+    cached = cache.get_many(keys)
+    deltas: List[Any] = [cached.get(key) for key in keys]
+    missing = [i for i, delta in enumerate(deltas) if delta is None]
     
-    blocks = parse_markdown_blocks(content)
-    print(f"   Parsed {len(blocks)} markdown blocks")
+    # Group missing blocks into windows; blocks up to two apart share a window
+    # because each window starts one block early anyway
+    windows: List[List[int]] = []
+    for i in missing:
+        if windows and i - windows[-1][1] <= 2:
+            windows[-1][1] = i
+        else:
+            windows.append([i, i])
+    if pool is not None and len(windows) == 1 and len(missing) > 1:
+        # A cold cache is one big window: cut it up so every worker gets a share
+        windows = _chunk_windows(missing[0], missing[-1], pool.workers)
     
-    accumulated = []
+    fresh = _measure_block_windows(blocks, [tuple(w) for w in windows], project_root, column_width, pool, image_base)
+    for i, delta in fresh.items():
+        deltas[i] = delta
     
-    for i, block in enumerate(blocks):
-        # Try adding this block
-        test_content = "\n\n".join(accumulated + [block])
-        test_html = md_to_html(test_content)
+    cache.put_many({keys[i]: delta for i, delta in fresh.items()})
+    cache.record_run(label or f'{len(blocks)} blocks @ {column_width}in', len(blocks) - len(missing), len(missing))
+    print(f"   📦 Measurement cache: {len(blocks) - len(missing)} hit(s), {len(missing)} miss(es)")
+    
+    return _cumulative(deltas), len(windows)
+
+
+def _chunk_windows(start: int, end: int, chunks: int) -> List[List[int]]:
+    """Cut blocks[start:end + 1] into up to `chunks` contiguous windows of similar size"""
+    count = end - start + 1
+    chunks = max(1, min(chunks, count))
+    bounds = [start + count * k // chunks for k in range(chunks + 1)]
+    return [[bounds[k], bounds[k + 1] - 1] for k in range(chunks)]
+
+
+def _find_split_linear(
+    blocks: List[Block],
+    max_height_inches: float,
+    project_root: Path,
+    column_width: float,
+    backend: str = 'pdf',
+    pool=None,
+    image_base: Path = None
+) -> Tuple[int, int]:
+    """Measure every prefix in turn until one overflows
+    
+    With a pool, the next `pool.workers` prefixes are measured concurrently.
+    
+    Returns:
+        (number of blocks that fit on the first page, measurements made)
+    """
+    measurements = 0
+    batch = pool.workers if pool is not None else 1
+    
+    for batch_start in range(0, len(blocks), batch):
+        counts = list(range(batch_start + 1, min(batch_start + batch, len(blocks)) + 1))
+        results = _measure_prefixes(blocks, counts, project_root, column_width, backend, pool, image_base)
+        measurements += len(results)
         
-        # Measure height
-        try:
-            height = measure_content_height(test_html, project_root, column_width)
-            block_preview = block[:50].replace('\n', ' ') + ('...' if len(block) > 50 else '')
+        for i, height in zip(range(batch_start, len(blocks)), results):
+            if isinstance(height, Exception):
+                print(f"   ⚠️  Error measuring block {i}: {height}")
+                # On error, be conservative and stop here
+                # If we can't even measure the first block, fall back to it
+                return max(i, 1), measurements
+            
+            source = blocks[i].source
+            block_preview = source[:50].replace('\n', ' ') + ('...' if len(source) > 50 else '')
             print(f"   Block {i+1}/{len(blocks)}: cumulative height = {height:.2f}in | '{block_preview}'")
             
             if height > max_height_inches:
                 # This block would overflow
-                print(f"   ✂️  Split at block {i} (would exceed {max_height_inches}in)")
-                first_part = "\n\n".join(accumulated)
-                rest_part = "\n\n".join(blocks[i:])
-                return (first_part, rest_part)
-            
-            accumulated.append(block)
-            
-        except Exception as e:
-            print(f"   ⚠️  Error measuring block {i}: {e}")
-            # On error, be conservative and stop here
-            if accumulated:
-                first_part = "\n\n".join(accumulated)
-                rest_part = "\n\n".join(blocks[i:])
-                return (first_part, rest_part)
+                return i, measurements
+    
+    return len(blocks), measurements
+
+
+def _find_split_bisect(
+    blocks: List[Block],
+    max_height_inches: float,
+    project_root: Path,
+    column_width: float,
+    backend: str = 'pdf',
+    pool=None,
+    image_base: Path = None
+) -> Tuple[int, int]:
+    """Binary-search the first block whose prefix overflows
+    
+    Prefix height never decreases as blocks are added, so the first overflowing
+    block can be found with O(log n) prefix measurements instead of O(n).
+    With a pool of k workers each round measures k probes concurrently and
+    narrows the interval k+1 ways.
+    
+    Returns:
+        (number of blocks that fit on the first page, measurements made)
+    """
+    measurements = 0
+    failed = set()
+    probes_per_round = pool.workers if pool is not None else 1
+    
+    # Invariant: the first overflowing block index lies in [lo, hi]; hi == len(blocks) means none overflows
+    lo, hi = 0, len(blocks)
+    while lo < hi:
+        span = hi - lo
+        probes = sorted({lo + span * (k + 1) // (probes_per_round + 1) for k in range(probes_per_round)})
+        results = _measure_prefixes(blocks, [i + 1 for i in probes], project_root, column_width, backend, pool, image_base)
+        measurements += len(results)
+        
+        new_lo, new_hi = lo, hi
+        for i, height in zip(probes, results):
+            if isinstance(height, Exception):
+                print(f"   ⚠️  Error measuring block {i}: {height}")
+                # Treat errors as overflow, same as the linear search stopping there
+                failed.add(i)
+                overflow = True
             else:
-                # If we can't even measure the first block, fall back to it
-                return (block, "\n\n".join(blocks[i+1:]))
+                print(f"   Probe block {i+1}/{len(blocks)}: cumulative height = {height:.2f}in")
+                overflow = height > max_height_inches
+            if overflow:
+                new_hi = i
+                break
+            new_lo = i + 1
+        lo, hi = new_lo, new_hi
+    
+    if lo == 0 and 0 in failed:
+        # If we can't even measure the first block, fall back to it
+        return 1, measurements
+    return lo, measurements
+
+
+def _find_split_layout(
+    blocks: List[Block],
+    max_height_inches: float,
+    project_root: Path,
+    column_width: float,
+    backend: str = 'pdf',
+    use_cache: bool = True,
+    cache_label: str = '',
+    pool=None,
+    image_base: Path = None
+) -> Tuple[int, int]:
+    """Pick the split from one layout pass over all blocks (or none, when all are cached)
+    
+    With a pool the blocks are laid out as one window per worker, concurrently.
+    
+    Returns:
+        (number of blocks that fit on the first page, measurements made)
+    """
+    try:
+        if use_cache:
+            offsets, renders = measure_block_offsets_cached(blocks, project_root, column_width, cache_label, pool, image_base)
+        elif pool is not None:
+            windows = [tuple(w) for w in _chunk_windows(0, len(blocks) - 1, pool.workers)]
+            deltas = _measure_block_windows(blocks, windows, project_root, column_width, pool, image_base)
+            offsets, renders = _cumulative([deltas[i] for i in range(len(blocks))]), len(windows)
+        else:
+            with tracing.span('measure block window', first_block=0, last_block=len(blocks) - 1) as trace:
+                offsets, renders = measure_block_offsets(blocks, project_root, column_width, image_base=image_base), 1
+                trace.set(height=round(offsets[-1], 3) if offsets else 0.0)
+    except Exception as e:
+        print(f"   ⚠️  Error in single-pass layout: {e}")
+        print(f"   Falling back to bisect")
+        split_index, measurements = _find_split_bisect(blocks, max_height_inches, project_root, column_width, backend, pool, image_base)
+        return split_index, measurements + 1
+    
+    for i, height in enumerate(offsets):
+        if height > max_height_inches:
+            source = blocks[i].source
+            block_preview = source[:50].replace('\n', ' ') + ('...' if len(source) > 50 else '')
+            print(f"   Block {i+1}/{len(blocks)}: cumulative height = {height:.2f}in | '{block_preview}'")
+            return i, renders
+    return len(blocks), renders
+
+
+def _find_split_estimate(
+    blocks: List[Block],
+    max_height_inches: float,
+    project_root: Path,
+    column_width: float,
+    backend: str = 'pdf',
+    pool=None,
+    image_base: Path = None
+) -> Tuple[int, int]:
+    """Pick the split from analytic estimates, then confirm it with real renders
+    
+    If the rendered prefix overflows after all, step back one block at a time
+    until it fits. If it fits, render one more block to confirm that it is the first
+    overflowing one, and step forward while it still fits (the estimate was too high).
+    Each step is another render; an exact estimate costs two.
+    
+    Returns:
+        (number of blocks that fit on the first page, measurements made)
+    """
+    try:
+        offsets = estimate_block_offsets(blocks, project_root, column_width, image_base=image_base)
+    except Exception as e:
+        print(f"   ⚠️  Error estimating block heights: {e}")
+        print(f"   Falling back to bisect")
+        return _find_split_bisect(blocks, max_height_inches, project_root, column_width, backend, pool, image_base)
+    
+    # Start from at least one block, so an overestimated first block is still confirmed by a render
+    split_index = max(1, next((i for i, height in enumerate(offsets) if height > max_height_inches), len(blocks)))
     
-    # All content fits
-    print(f"   ✅ All content fits within {max_height_inches}in")
-    return (content, "")
+    measurements = 0
+    stepped_back = False
+    while True:
+        estimated = offsets[split_index - 1]
+        height = _measure_prefixes(blocks, [split_index], project_root, column_width, backend, pool, image_base)[0]
+        measurements += 1
+        failed = isinstance(height, Exception)
+        if failed:
+            print(f"   ⚠️  Error measuring block {split_index - 1}: {height}")
+        else:
+            print(f"   Estimated {estimated:.2f}in for {split_index} block(s), rendered {height:.2f}in")
+            if height <= max_height_inches:
+                break
+        if split_index == 1:
+            # Like the linear search: an unmeasurable first block stays, an overflowing one does not
+            return (1 if failed else 0), measurements
+        split_index -= 1
+        stepped_back = True
+    
+    # Stepping back stopped at the first fitting prefix, so the next block is known to overflow
+    while not stepped_back and split_index < len(blocks):
+        height = _measure_prefixes(blocks, [split_index + 1], project_root, column_width, backend, pool, image_base)[0]
+        measurements += 1
+        if isinstance(height, Exception):
+            # Same policy as the linear search: stop at a block that cannot be measured
+            print(f"   ⚠️  Error measuring block {split_index}: {height}")
+            break
+        print(f"   Estimated {offsets[split_index]:.2f}in for {split_index + 1} block(s), rendered {height:.2f}in")
+        if height > max_height_inches:
+            break
+        split_index += 1
+    return split_index, measurements
+
+
+def split_blocks_by_height(
+    blocks: List[Block],
+    max_height_inches: float,
+    project_root: Path,
+    column_width: float = 4.85,
+    mode: str = 'linear',
+    backend: str = 'pdf',
+    use_cache: bool = True,
+    cache_label: str = '',
+    workers: int = 0,
+    worker_memory_mb: int = None,
+    image_base: Path = None
+) -> int:
+    """Find how many leading blocks fit within max_height_inches when rendered
+    
+    Args:
+        blocks: Markdown blocks from parse_blocks
+        max_height_inches: Maximum height for first section
+        project_root: Project root path
+        column_width: Width of column in inches (4.85 for Initiating, 3.81 for Update)
+        mode: 'linear' measures every prefix until one overflows,
+              'bisect' binary-searches the first overflowing block (O(log n) renders),
+              'layout' reads every block's offset from a single layout pass,
+              'estimate' predicts offsets from glyph metrics and renders only the chosen split
+        backend: Measurement backend for prefix renders ('pdf' or 'render', see measure_content_height)
+        use_cache: Serve 'layout' block heights from the persistent measurement cache
+        cache_label: Report name recorded with the cache's per-run statistics
+        workers: Number of warm measurement worker processes (0 measures in this process)
+        worker_memory_mb: Memory ceiling per worker in MB (None for no limit)
+        image_base: Directory images resolve against; when given, images are measured as
+                    same-size placeholders read from their headers instead of being decoded
+    
+    Returns:
+        Number of blocks in the first section (len(blocks) when everything fits)
+    """
+    if mode not in SPLIT_MODES:
+        raise ValueError(f"Unknown split mode: {mode} (expected one of {', '.join(SPLIT_MODES)})")
+    
+    print(f"🔍 Splitting markdown by height (max: {max_height_inches}in, column: {column_width}in, mode: {mode})...")
+    print(f"   Parsed {len(blocks)} markdown blocks")
+    
+    pool = None
+    if workers and blocks:
+        from measure_pool import get_pool
+        pool = get_pool(project_root, workers, worker_memory_mb)
+        print(f"   Using {pool.workers} measurement worker(s)")
+    
+    with tracing.span('split', mode=mode, backend=backend, blocks=len(blocks)) as trace:
+        if not blocks:
+            split_index, measurements = 0, 0
+        elif mode == 'estimate':
+            split_index, measurements = _find_split_estimate(blocks, max_height_inches, project_root, column_width, backend, pool, image_base)
+        elif mode == 'layout':
+            split_index, measurements = _find_split_layout(blocks, max_height_inches, project_root, column_width, backend, use_cache, cache_label, pool, image_base)
+        elif mode == 'bisect':
+            split_index, measurements = _find_split_bisect(blocks, max_height_inches, project_root, column_width, backend, pool, image_base)
+        else:
+            split_index, measurements = _find_split_linear(blocks, max_height_inches, project_root, column_width, backend, pool, image_base)
+        trace.set(split_index=split_index, measurements=measurements)
+    
+    SPLIT_STATS.clear()
+    SPLIT_STATS.update(mode=mode, backend=backend, blocks=len(blocks), measurements=measurements, split_index=split_index)
+    print(f"   📏 {measurements} measurement render(s) for {len(blocks)} blocks")
+    
+    if split_index >= len(blocks):
+        # All content fits
+        print(f"   ✅ All content fits within {max_height_inches}in")
+    else:
+        print(f"   ✂️  Split at block {split_index} (would exceed {max_height_inches}in)")
+    return split_index
+
+
+def split_markdown_by_height(
+    content: str,
+    max_height_inches: float,
+    project_root: Path,
+    column_width: float = 4.85,
+    mode: str = 'linear',
+    backend: str = 'pdf',
+    use_cache: bool = True,
+    cache_label: str = '',
+    workers: int = 0,
+    worker_memory_mb: int = None,
+    image_base: Path = None
+) -> Tuple[str, str]:
+    """Split markdown based on rendered height (see split_blocks_by_height for the arguments)
+    
+    Returns:
+        (markdown for the first section, markdown for the rest)
+    """
+    blocks = parse_blocks(content)
+    split_index = split_blocks_by_height(
+        blocks, max_height_inches, project_root, column_width, mode, backend, use_cache, cache_label,
+        workers, worker_memory_mb, image_base)
+    
+    if split_index >= len(blocks):
+        return (content, "")
+    return (blocks_to_markdown(blocks[:split_index]), blocks_to_markdown(blocks[split_index:]))
 
 
 def md_to_html(md_text: str) -> str:
+    import markdown
+    
     return markdown.markdown(
         md_text,
         extensions=[
@@ -336,6 +1136,8 @@ def load_ticker_config(ticker_dir: Path, ticker: str) -> Dict[str, Any]:
         print(f"ℹ️  No config file found at {config_file}, using defaults")
         return {}
     
+    import yaml
+    
     try:
         with open(config_file, 'r', encoding='utf-8') as f:
             config = yaml.safe_load(f)
@@ -370,6 +1172,8 @@ def load_update_config(ticker_dir: Path, ticker: str) -> Dict[str, Any]:
         print(f"ℹ️  No update config file found at {config_file}, using defaults")
         return {}
     
+    import yaml
+    
     try:
         with open(config_file, 'r', encoding='utf-8') as f:
             config = yaml.safe_load(f)
@@ -432,12 +1236,173 @@ def format_table_date(date_str: str) -> str:
     return date_str
 
 
-def load_markdown_with_front_matter(md_path: Path, project_root: Path, max_height_inches: float = 9.5, report_type: str = 'Initiating', symbol_logo_url: str = None) -> Tuple[Dict[str, Any], str, str, List[str], bool]:
-    post = frontmatter.load(md_path)
-    meta = dict(post.metadata or {})
+# Split mode that lays out the real report template instead of the measurement document
+TEMPLATE_SPLIT_MODE = 'fragment'
+
+_BOLD_HEADING_RE = re.compile(r'^\*\*[^\n]*\*\*$')
+
+
+class TemplateProbe:
+    """Lays out the actual report template around candidate first-page HTML
+    
+    Args:
+        render_html: Renders the template HTML from (md_first_html, front matter)
+        base_url: Base URL of the final render (relative images resolve against it)
+        css_path: Template stylesheet of the final render
+    """
     
-    # Extract appendix content if present (before height-based splitting)
-    main_content, appendix_list, has_appendix = extract_appendix(post.content)
+    def __init__(self, render_html: Callable[[str, Dict[str, Any]], str], base_url: str, css_path: str):
+        self.render_html = render_html
+        self.base_url = base_url
+        self.css_path = css_path
+    
+    def fingerprint(self, meta: Dict[str, Any]) -> bytes:
+        """Hash of the template, its data and stylesheet without markdown (part of the split memo key)"""
+        from measure_cache import digest
+        return digest(self.render_html('', meta).encode('utf-8'), Path(self.css_path).read_bytes()).encode()
+    
+    def layout(self, first_html: str, meta: Dict[str, Any]):
+        from weasyprint import HTML
+        
+        stylesheet, font_config = get_registry().stylesheet(self.css_path)
+        with tracing.span('jinja render (template probe)'):
+            html = self.render_html(first_html, meta)
+        with tracing.span('weasyprint layout (template probe)'):
+            return HTML(string=html, base_url=self.base_url, url_fetcher=get_fetcher()).render(
+                stylesheets=[stylesheet], font_config=font_config)
+
+
+def split_blocks_in_template(
+    blocks: List[Block],
+    probe: TemplateProbe,
+    meta: Dict[str, Any],
+    make_first_red: bool = True
+) -> int:
+    """Find how many leading blocks the real template fits on page 1, from one layout
+    
+    All blocks go into md_first_html, styled exactly as the first section is in the final
+    render, each followed by a marker. WeasyPrint's own fragmentation (page and column
+    breaks, orphans/widows, break-after on headings) then decides what stays on page 1;
+    the first block whose marker is not within page 1's page area starts the continuation.
+    
+    Returns:
+        Number of blocks in the first section (len(blocks) when everything fits)
+    """
+    print(f"🔍 Splitting markdown in the report template (mode: {TEMPLATE_SPLIT_MODE})...")
+    print(f"   Parsed {len(blocks)} markdown blocks")
+    
+    # Bold-only paragraphs keep a div marker so style_bold_headings still recognizes them
+    marked_md = "\n\n".join(
+        _mark_block(block.source, i, inline=not _BOLD_HEADING_RE.match(block.source.strip()))
+        for i, block in enumerate(blocks)
+    )
+    first_html = style_exhibit_source_lines(md_to_html(marked_md))
+    first_html = style_bold_headings(first_html, first_page=True, make_first_red=make_first_red)
+    document = probe.layout(first_html, meta)
+    
+    present, on_first_page = set(), set()
+    for page_number, page in enumerate(document.pages):
+        page_box = page._page_box
+        # Content that does not fragment (e.g. a grid item) may overflow the page area
+        area_bottom = page_box.content_box_y() + page_box.height
+        for box, line in _iter_boxes(page_box):
+            element = box.element
+            if element is None or box.element_tag is None:
+                continue
+            marker_id = element.get('id') or ''
+            if not marker_id.startswith(BLOCK_MARKER_PREFIX):
+                continue
+            index = int(marker_id[len(BLOCK_MARKER_PREFIX):])
+            present.add(index)
+            bottom = line.position_y + line.height if line is not None else box.position_y
+            if page_number == 0 and bottom <= area_bottom + 0.01:
+                on_first_page.add(index)
+    
+    split_index = 0
+    for i in range(len(blocks)):
+        # Blocks whose marker produced no box (e.g. HTML comments) follow the previous block
+        if i in on_first_page or (i not in present and split_index == i):
+            split_index = i + 1
+        else:
+            break
+    if blocks and split_index == 0:
+        # Even the first block does not fit; it goes on the first page regardless
+        split_index = 1
+    
+    SPLIT_STATS.clear()
+    SPLIT_STATS.update(mode=TEMPLATE_SPLIT_MODE, backend='template', blocks=len(blocks), measurements=1, split_index=split_index)
+    print(f"   📏 1 template layout for {len(blocks)} blocks")
+    if split_index >= len(blocks):
+        print(f"   ✅ All content fits on the first page")
+    else:
+        print(f"   ✂️  Split at block {split_index} (first block past page 1)")
+    return split_index
+
+
+# Sidecar next to the markdown recording the last first-page split and its inputs
+SPLIT_MEMO_NAME = '.split.json'
+
+
+def split_memo_fingerprint(
+    content: str,
+    max_height_inches: float,
+    report_type: str,
+    column_width: float,
+    split_mode: str,
+    project_root: Path,
+    extra_inputs: bytes = b'',
+    measure_backend: str = 'pdf',
+    image_placeholders: bool = False
+) -> str:
+    """Hash every input of the first-page split: markdown, height, report type,
+    split mode, measure backend, image placeholders, and the measurement CSS and
+    fonts (via measurement_fingerprint)
+    
+    extra_inputs covers mode-specific inputs: image sizes when images are measured as
+    placeholders, the rendered template when the template itself is laid out.
+    """
+    from measure_cache import digest
+    
+    return digest(
+        content.encode('utf-8'),
+        repr(max_height_inches).encode(),
+        report_type.encode(),
+        split_mode.encode(),
+        measure_backend.encode(),
+        b'placeholders' if image_placeholders else b'images',
+        measurement_fingerprint(project_root, column_width).encode(),
+        extra_inputs,
+    )
+
+
+def read_split_memo(memo_path: Path, fingerprint: str, block_count: int):
+    """Return the memoized split index if the sidecar matches these inputs, else None"""
+    try:
+        memo = json.loads(memo_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if memo.get('fingerprint') != fingerprint or memo.get('blocks') != block_count:
+        return None
+    split_index = memo.get('split_index')
+    return split_index if isinstance(split_index, int) and 0 <= split_index <= block_count else None
+
+
+def write_split_memo(memo_path: Path, fingerprint: str, split_index: int, block_count: int):
+    try:
+        memo_path.write_text(json.dumps({'fingerprint': fingerprint, 'split_index': split_index, 'blocks': block_count}, indent=2))
+    except OSError as e:
+        print(f"   ⚠️  Could not write split memo {memo_path}: {e}")
+
+
+def load_markdown_with_front_matter(md_path: Path, project_root: Path, max_height_inches: float = 9.5, report_type: str = 'Initiating', symbol_logo_url: str = None, split_mode: str = 'linear', measure_backend: str = 'pdf', use_measure_cache: bool = True, measure_workers: int = 0, worker_memory_mb: int = None, use_split_memo: bool = True, image_placeholders: bool = False, template_probe: TemplateProbe = None) -> Tuple[Dict[str, Any], str, str, List[str], bool]:
+    import frontmatter
+    
+    with tracing.span('load markdown', file=md_path.name):
+        post = frontmatter.load(md_path)
+        meta = dict(post.metadata or {})
+        
+        # Extract appendix content if present (before height-based splitting)
+        main_content, appendix_list, has_appendix = extract_appendix(post.content)
     
     # Determine column width and adjust max height based on report type
     # Initiating: Single left column with sidebar (4.85in wide, 9.5in tall)
@@ -452,16 +1417,61 @@ def load_markdown_with_front_matter(md_path: Path, project_root: Path, max_heigh
         adjusted_max_height = max_height_inches
     
     # HEIGHT-BASED SPLIT of main content only (not appendix)
-    first_md, rest_md = split_markdown_by_height(
-        main_content,
-        max_height_inches=adjusted_max_height,
-        project_root=project_root,
-        column_width=column_width
-    )
+    with tracing.span('parse blocks') as trace:
+        blocks = parse_blocks(main_content)
+        trace.set(blocks=len(blocks))
+    
+    # Reuse the previous split when none of its inputs changed (e.g. config-only reruns)
+    memo_path = md_path.parent / SPLIT_MEMO_NAME
+    # Images resolve against the markdown's directory, like the final render's base_url
+    image_base = md_path.parent if image_placeholders else None
+    extra_inputs = b''
+    if image_base is not None:
+        extra_inputs = b'placeholders:' + b';'.join(image_signature(block.html, image_base) for block in blocks if '<img' in block.html)
+    if split_mode == TEMPLATE_SPLIT_MODE and template_probe is None:
+        print(f"⚠️  Split mode '{TEMPLATE_SPLIT_MODE}' needs the report template; using 'layout'")
+        split_mode = 'layout'
+    if split_mode == TEMPLATE_SPLIT_MODE:
+        extra_inputs += b'template:' + template_probe.fingerprint(meta)
+    split_start = time.perf_counter()
+    fingerprint = split_memo_fingerprint(main_content, adjusted_max_height, report_type, column_width, split_mode, project_root, extra_inputs,
+                                         measure_backend=measure_backend, image_placeholders=image_placeholders)
+    split_index = read_split_memo(memo_path, fingerprint, len(blocks)) if use_split_memo else None
+    if split_index is not None:
+        print(f"♻️  Reusing first-page split at block {split_index}/{len(blocks)} from {memo_path.name} (inputs unchanged)")
+        SPLIT_STATS.clear()
+        SPLIT_STATS.update(mode='memo', backend=measure_backend, blocks=len(blocks), measurements=0, split_index=split_index)
+    elif split_mode == TEMPLATE_SPLIT_MODE:
+        with tracing.span('split', mode=split_mode, blocks=len(blocks)) as trace:
+            split_index = split_blocks_in_template(blocks, template_probe, meta, make_first_red=(report_type == 'Initiating'))
+            trace.set(split_index=split_index, measurements=1)
+        write_split_memo(memo_path, fingerprint, split_index, len(blocks))
+    else:
+        split_index = split_blocks_by_height(
+            blocks,
+            max_height_inches=adjusted_max_height,
+            project_root=project_root,
+            column_width=column_width,
+            mode=split_mode,
+            backend=measure_backend,
+            use_cache=use_measure_cache,
+            cache_label=f'{md_path.parent.parent.name}/{md_path.parent.name}/{md_path.name}',
+            workers=measure_workers,
+            worker_memory_mb=worker_memory_mb,
+            image_base=image_base
+        )
+        write_split_memo(memo_path, fingerprint, split_index, len(blocks))
+    SPLIT_STATS['seconds'] = time.perf_counter() - split_start
     
-    # Convert markdown to HTML
-    first_html = md_to_html(first_md)
-    rest_html = md_to_html(rest_md)
+    # Convert markdown to HTML from the block fragments converted during the split
+    with tracing.span('markdown to html'):
+        if split_index >= len(blocks):
+            # All content fits: convert the original text as is
+            first_html = md_to_html(main_content)
+            rest_html = ''
+        else:
+            first_html = blocks_to_html(blocks[:split_index])
+            rest_html = blocks_to_html(blocks[split_index:])
     
     # Apply styling: Exhibit/Source lines and bold headings
     # For Initiating reports: first bold heading is red
@@ -487,13 +1497,15 @@ def load_markdown_with_front_matter(md_path: Path, project_root: Path, max_heigh
     appendix_htmls = []
     if has_appendix and appendix_list:
         for appendix_md in appendix_list:
-            appendix_html = md_to_html(appendix_md)
+            with tracing.span('markdown to html (appendix)'):
+                appendix_html = md_to_html(appendix_md)
             appendix_html = style_appendix_title(appendix_html)
             appendix_htmls.append(appendix_html)
     
     return meta, first_html, rest_html, appendix_htmls, has_appendix
 
 
+@tracing.traced('render_pdf')
 def render_pdf(
     ticker: str = 'AZEK',
     markdown_file: str = None,
@@ -501,7 +1513,23 @@ def render_pdf(
     max_height_inches: float = 9.5,
     report_type: str = 'Initiating',  # 'Initiating' or 'Update'
     nonbranded: bool = False,
+    split_mode: str = 'linear',  # 'linear', 'bisect', 'layout', 'estimate' or 'fragment'
+    measure_backend: str = 'pdf',  # 'pdf' or 'render'
+    use_measure_cache: bool = True,
+    measure_workers: int = 0,
+    worker_memory_mb: int = None,
+    use_split_memo: bool = True,
+    image_placeholders: bool = False,
+    image_dpi: int = 0,  # Resample images wider than their column to this resolution (e.g. DEFAULT_DPI); 0 embeds them as they are
+    optimize_images: bool = False,  # Re-encode images in their smallest format (see image_optimizer)
+    jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+    pdf_profile: str = None,  # Post-render PDF optimization profile (see pdf_optimizer.PROFILES), None to skip
 ) -> str:
+    from weasyprint import HTML
+    import image_derivatives
+    import image_optimizer
+    from template_env import get_template
+    
     project_root = Path(__file__).parent.parent  # Go up from src/ to project root
     templates_dir = Path(__file__).parent / 'templates'  # Templates are in src/templates/
 
@@ -520,8 +1548,6 @@ def render_pdf(
     # Get symbol logo URL only if not non-branded
     symbol_logo_url = None if nonbranded else (project_root / 'assets' / 'Base' / 'symbol_logo.png').as_uri()
 
-    meta, first_html, rest_html, appendix_htmls, has_appendix = load_markdown_with_front_matter(md_path, project_root, max_height_inches, report_type, symbol_logo_url)
-
     # Load disclaimer markdown
     disclaimer_path = project_root / 'assets' / 'Base' / 'disclaimer.md'
     if disclaimer_path.exists():
@@ -565,37 +1591,59 @@ def render_pdf(
         'chart_img': chart_img,
     }
 
-    # Configuration priority: global_defaults → ticker_config → front_matter
-    data = {**global_defaults, **ticker_config, **meta}
+    # Shared Jinja environment: templates compile once per process (or load from the bytecode cache)
+    with tracing.span('jinja load template'):
+        # Select template and CSS based on report type
+        if report_type == 'Update':
+            template = get_template('update.html', templates_dir)
+            css_path = str(templates_dir / 'update.css')
+        else:
+            # Initiating reports use standard template
+            template = get_template('report.html', templates_dir)
+            css_path = str(templates_dir / 'report.css')
+
+    def template_data(meta: Dict[str, Any]) -> Dict[str, Any]:
+        # Configuration priority: global_defaults → ticker_config → front_matter
+        data = {**global_defaults, **ticker_config, **meta}
+        
+        # Format table_date for display (MM.DD.YYYY → MM/DD/YYYY)
+        if 'table_date' in data:
+            data['table_date'] = format_table_date(data['table_date'])
+        return data
+    
+    def render_html(meta: Dict[str, Any], first_html: str, rest_html: str = '', appendix_htmls: List[str] = (), has_appendix: bool = False) -> str:
+        return template.render(
+            md_first_html=first_html,
+            md_cont_html=rest_html,
+            appendix_htmls=list(appendix_htmls),
+            has_appendix=has_appendix,
+            disclaimer_html=disclaimer_html,
+            nonbranded=nonbranded,
+            **template_data(meta)
+        )
     
-    # Format table_date for display (MM.DD.YYYY → MM/DD/YYYY)
-    if 'table_date' in data:
-        data['table_date'] = format_table_date(data['table_date'])
+    # The 'fragment' split lays out this same template, so it needs it before the split
+    template_probe = None
+    if split_mode == TEMPLATE_SPLIT_MODE:
+        template_probe = TemplateProbe(lambda first_html, meta: render_html(meta, first_html), base_url, css_path)
+    
+    meta, first_html, rest_html, appendix_htmls, has_appendix = load_markdown_with_front_matter(md_path, project_root, max_height_inches, report_type, symbol_logo_url, split_mode, measure_backend, use_measure_cache, measure_workers, worker_memory_mb, use_split_memo, image_placeholders, template_probe)
 
-    # Jinja environment
-    env = Environment(
-        loader=FileSystemLoader(str(templates_dir)),
-        autoescape=select_autoescape(['html'])
-    )
+    # When asked for, embed print-resolution derivatives of images wider than their column (same rendered size,
+    # fewer pixels) and/or images re-encoded in their smallest format
+    image_derivatives.reset_stats()
+    image_optimizer.reset_stats()
+    if image_dpi or optimize_images:
+        with tracing.span('image derivatives', dpi=image_dpi, optimize=optimize_images):
+            first_column = 3.81 if report_type == 'Update' else 4.85
+            first_html = image_derivatives.substitute_derivatives(first_html, Path(base_url), first_column, image_dpi,
+                                                                  optimize_images, jpeg_quality)
+            rest_html = image_derivatives.substitute_derivatives(rest_html, Path(base_url), image_derivatives.CONTINUATION_COLUMN_WIDTH,
+                                                                 image_dpi, optimize_images, jpeg_quality)
     
-    # Select template and CSS based on report type
-    if report_type == 'Update':
-        template = env.get_template('update.html')
-        css_path = str(templates_dir / 'update.css')
-    else:
-        # Initiating reports use standard template
-        template = env.get_template('report.html')
-        css_path = str(templates_dir / 'report.css')
-
-    html_str = template.render(
-        md_first_html=first_html,
-        md_cont_html=rest_html,
-        appendix_htmls=appendix_htmls,
-        has_appendix=has_appendix,
-        disclaimer_html=disclaimer_html,
-        nonbranded=nonbranded,
-        **data
-    )
+    data = template_data(meta)
+    with tracing.span('jinja render'):
+        html_str = render_html(meta, first_html, rest_html, appendix_htmls, has_appendix)
     
     # If output_file not specified, use ticker-based path in report type folder
     if output_file is None:
@@ -624,9 +1672,23 @@ def render_pdf(
     
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    HTML(string=html_str, base_url=base_url).write_pdf(
-        str(output_path), stylesheets=[CSS(css_path)]
-    )
+    # Fonts, logos, chart and images are served from the same in-memory cache as the measurement renders,
+    # and the stylesheet and font configuration are parsed once per process
+    fetcher = get_fetcher()
+    stylesheet, font_config = get_registry().stylesheet(css_path)
+    with tracing.span('weasyprint write_pdf', output=output_path.name):
+        HTML(string=html_str, base_url=base_url, url_fetcher=fetcher).write_pdf(
+            str(output_path), stylesheets=[stylesheet], font_config=font_config
+        )
+    fetcher.print_stats()
+    get_registry().print_stats()
+    image_derivatives.print_stats()
+    image_optimizer.print_stats()
+    
+    if pdf_profile:
+        from pdf_optimizer import optimize_pdf
+        
+        optimize_pdf(str(output_path), profile=pdf_profile)
 
     print(f"✅ Created: {output_path}")
     return str(output_path)
@@ -649,15 +1711,57 @@ if __name__ == '__main__':
                         help='Maximum height in inches for first page content (default: 9.5)')
     parser.add_argument('--nonbranded', action='store_true', default=False,
                         help='Generate non-branded version (no logos, minimal headers/footers)')
+    parser.add_argument('--split-mode', type=str, default='linear', choices=list(SPLIT_MODES) + [TEMPLATE_SPLIT_MODE],
+                        help='First-page split search: linear (one render per block), bisect (O(log n) renders), layout (one render), '
+                             'estimate (glyph metrics, one confirming render) or fragment (one layout of the real template)')
+    parser.add_argument('--measure-backend', type=str, default='pdf', choices=list(MEASURE_BACKENDS),
+                        help='Height measurement backend: pdf (write PDF, parse with PyMuPDF) or render (WeasyPrint layout tree)')
+    parser.add_argument('--no-measure-cache', action='store_true', default=False,
+                        help='Re-measure every block in layout split mode instead of using the persistent cache')
+    parser.add_argument('--measure-workers', type=int, default=0,
+                        help='Warm worker processes measuring split candidates concurrently (default: 0, measure in-process)')
+    parser.add_argument('--worker-memory-mb', type=int, default=None,
+                        help='Memory ceiling per measurement worker in MB (default: no limit)')
+    parser.add_argument('--no-split-memo', action='store_true',
+                        help=f'Always re-measure the first-page split instead of reusing {SPLIT_MEMO_NAME} when inputs are unchanged')
+    parser.add_argument('--image-placeholders', action='store_true',
+                        help='Measure images as same-size placeholders read from their headers instead of decoding them')
+    parser.add_argument('--image-dpi', type=int, default=0,
+                        help=f'Downsample images wider than their column to this resolution, e.g. {DEFAULT_DPI} (lossy for JPEGs; default: 0, embed originals)')
+    parser.add_argument('--optimize-images', action='store_true',
+                        help='Embed each image re-encoded as the smallest of palette PNG, PNG or JPEG (default: as extracted)')
+    parser.add_argument('--jpeg-quality', type=int, default=DEFAULT_JPEG_QUALITY,
+                        help=f'JPEG quality for photographic images (default: {DEFAULT_JPEG_QUALITY})')
+    parser.add_argument('--pdf-profile', type=str, default=None, choices=list(PDF_PROFILES),
+                        help='Post-process the PDF with PyMuPDF: print (lossless dedup/recompress), screen (also downsample '
+                             'images) or archive (lossless, no object streams); default: write as rendered')
+    parser.add_argument('--trace', type=str, default=None, metavar='PATH',
+                        help='Write a Chrome trace-event JSON of every stage to PATH and print a timing summary')
     
     args = parser.parse_args()
+    if args.trace:
+        tracing.enable(args.trace)
     
-    render_pdf(
-        ticker=args.ticker, 
-        markdown_file=args.markdown, 
-        output_file=args.output, 
-        max_height_inches=args.max_height,
-        report_type=args.report_type,
-        nonbranded=args.nonbranded
-    )
-
+    try:
+        render_pdf(
+            ticker=args.ticker, 
+            markdown_file=args.markdown, 
+            output_file=args.output, 
+            max_height_inches=args.max_height,
+            report_type=args.report_type,
+            nonbranded=args.nonbranded,
+            split_mode=args.split_mode,
+            measure_backend=args.measure_backend,
+            use_measure_cache=not args.no_measure_cache,
+            measure_workers=args.measure_workers,
+            worker_memory_mb=args.worker_memory_mb,
+            use_split_memo=not args.no_split_memo,
+            image_placeholders=args.image_placeholders,
+            image_dpi=args.image_dpi,
+            optimize_images=args.optimize_images,
+            jpeg_quality=args.jpeg_quality,
+            pdf_profile=args.pdf_profile
+        )
+    finally:
+        # Written on errors too, when the partial trace shows where the run failed
+        tracing.finish()
@@ -0,0 +1,475 @@
+"""
+Analytic Height Estimator
+
+Predicts how tall a piece of report HTML renders in the measurement column without
+running WeasyPrint. Text is wrapped greedily with the glyph advances of the static
+SourceSans3 fonts (the same files the measurement stylesheet declares), and block
+heights follow the measurement stylesheet and WeasyPrint's user-agent defaults:
+font sizes, 'normal' line heights, paragraph/heading/list margins and margin collapsing.
+
+The advance tables are read from the TTFs once, then kept in memory and as JSON under
+.cache/glyph_metrics/ so later processes skip fontTools entirely.
+
+Estimates are meant for choosing a split candidate; generate_report confirms the
+chosen split with a real render.
+"""
+
+import json
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+FONT_DIR = Path('assets') / 'fonts' / 'Source_Sans_3' / 'static'
+FONT_FILES = {False: 'SourceSans3-Regular.ttf', True: 'SourceSans3-Bold.ttf'}
+GLYPH_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'glyph_metrics'
+
+# CSS units in pixels
+PX_PER_IN = 96.0
+PX_PER_PT = 96.0 / 72.0
+
+# Geometry of the measurement document (see generate_report._measurement_css)
+PAGE_MARGIN_TOP = 75.0        # WeasyPrint's default page margin
+COLUMN_PADDING_LEFT = 0.1 * PX_PER_IN
+BASE_FONT_SIZE = 16.0
+PARAGRAPH_MARGIN = 0.1 * PX_PER_IN
+HEADING_MARGIN_TOP = 0.15 * PX_PER_IN
+FIRST_CHILD_FONT_SIZE = 22 * PX_PER_PT
+FIRST_CHILD_LINE_HEIGHT = 1.2
+FIRST_CHILD_MARGIN_BOTTOM = 0.24 * PX_PER_IN
+
+# User-agent defaults: heading font size and bottom margin, in em
+HEADINGS = {
+    'h1': (2.0, 0.67), 'h2': (1.5, 0.83), 'h3': (1.17, 1.0),
+    'h4': (1.0, 1.33), 'h5': (0.83, 1.67), 'h6': (0.67, 2.33),
+}
+LIST_INDENT = 40.0
+BLOCKQUOTE_INDENT = 40.0
+TABLE_BORDER_SPACING = 2.0
+TABLE_CELL_PADDING = 1.0
+MONOSPACE_ADVANCE = 0.6       # em per character
+
+BLOCK_TAGS = {
+    'p', 'div', 'ul', 'ol', 'li', 'blockquote', 'pre', 'table', 'thead', 'tbody',
+    'tr', 'td', 'th', 'hr', 'section', 'article', 'dl', 'dt', 'dd', 'figure',
+} | set(HEADINGS)
+VOID_TAGS = {'br', 'hr', 'img', 'input', 'meta', 'link', 'wbr'}
+BOLD_TAGS = {'strong', 'b', 'th'} | set(HEADINGS)
+MONOSPACE_TAGS = {'code', 'pre', 'kbd', 'samp', 'tt'}
+
+
+class GlyphMetrics:
+    """Advance widths and vertical metrics of one font, in em"""
+    __slots__ = ('advances', 'default_advance', 'line_height')
+
+    def __init__(self, advances: Dict[str, float], default_advance: float, line_height: float):
+        self.advances = advances
+        self.default_advance = default_advance
+        self.line_height = line_height  # 'normal' line height: ascent + descent + line gap
+
+    def text_width(self, text: str, font_size: float) -> float:
+        advances = self.advances
+        default = self.default_advance
+        return sum(advances.get(char, default) for char in text) * font_size
+
+    @classmethod
+    def from_font(cls, font_path: Path) -> 'GlyphMetrics':
+        from fontTools.ttLib import TTFont
+
+        font = TTFont(str(font_path), lazy=True)
+        units = float(font['head'].unitsPerEm)
+        hmtx = font['hmtx']
+        advances = {
+            chr(codepoint): hmtx[glyph][0] / units
+            for codepoint, glyph in font.getBestCmap().items()
+        }
+        hhea = font['hhea']
+        line_height = (hhea.ascent - hhea.descent + hhea.lineGap) / units
+        default_advance = hmtx['.notdef'][0] / units if '.notdef' in hmtx.metrics else 0.5
+        font.close()
+        return cls(advances, default_advance, line_height)
+
+    def to_json(self) -> dict:
+        return {'advances': self.advances, 'default_advance': self.default_advance, 'line_height': self.line_height}
+
+
+_metrics: Dict[Tuple[str, int, int], GlyphMetrics] = {}
+
+
+def load_metrics(font_path: Path) -> GlyphMetrics:
+    """Return a font's glyph metrics, computed once per font file version"""
+    stat = font_path.stat()
+    key = (str(font_path), stat.st_mtime_ns, stat.st_size)
+    if key in _metrics:
+        return _metrics[key]
+
+    cache_file = GLYPH_CACHE_DIR / f'{font_path.stem}.json'
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    metrics = None
+    if cache_file.exists():
+        try:
+            data = json.loads(cache_file.read_text())
+            if data.get('stamp') == stamp:
+                metrics = GlyphMetrics(data['advances'], data['default_advance'], data['line_height'])
+        except (ValueError, KeyError):
+            metrics = None
+    if metrics is None:
+        metrics = GlyphMetrics.from_font(font_path)
+        try:
+            GLYPH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps({'stamp': stamp, **metrics.to_json()}))
+        except OSError:
+            pass
+
+    _metrics[key] = metrics
+    return metrics
+
+
+class _Node:
+    __slots__ = ('tag', 'attrs', 'children')
+
+    def __init__(self, tag: str, attrs: Dict[str, str]):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List = []  # _Node or str
+
+
+class _TreeBuilder(HTMLParser):
+    """Minimal HTML tree: elements and text, comments dropped"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node('root', {})
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = _Node(tag, {name: value or '' for name, value in attrs})
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.stack[-1].children.append(_Node(tag, {name: value or '' for name, value in attrs}))
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+class _Flow:
+    """Vertical flow of line boxes with collapsing margins, in pixels"""
+
+    def __init__(self, top: float):
+        self.y = top
+        self.pending: List[float] = []
+
+    def margin(self, value: float):
+        self.pending.append(value)
+
+    def advance(self, height: float):
+        if self.pending:
+            # Adjoining margins collapse to the largest positive plus the most negative
+            self.y += max(max(self.pending), 0.0) + min(min(self.pending), 0.0)
+            self.pending = []
+        self.y += height
+
+
+class _Style:
+    __slots__ = ('font_size', 'line_height', 'bold', 'mono')
+
+    def __init__(self, font_size: float, line_height: Optional[float], bold: bool, mono: bool):
+        self.font_size = font_size
+        self.line_height = line_height  # Factor of font size; None for 'normal'
+        self.bold = bold
+        self.mono = mono
+
+    def derive(self, **changes) -> '_Style':
+        style = _Style(self.font_size, self.line_height, self.bold, self.mono)
+        for name, value in changes.items():
+            setattr(style, name, value)
+        return style
+
+
+class HeightEstimator:
+    """Lays out report HTML analytically in a column of the given width
+
+    Args:
+        project_root: Project root (fonts are read from assets/fonts/Source_Sans_3/static)
+        column_width: Width of column in inches (4.85 for Initiating, 3.81 for Update)
+    """
+
+    def __init__(self, project_root: Path, column_width: float):
+        self.fonts = {bold: load_metrics(Path(project_root) / FONT_DIR / name) for bold, name in FONT_FILES.items()}
+        self.content_width = column_width * PX_PER_IN - COLUMN_PADDING_LEFT
+        self.markers: Dict[str, float] = {}
+        self.bottom = PAGE_MARGIN_TOP
+
+    def layout(self, html_content: str, first_child: bool = True) -> float:
+        """Lay out HTML as the content of the measurement column
+
+        Records the bottom of every element with an id in self.markers (inline elements:
+        bottom of their line; block elements: where they start) and returns the bottom
+        of the last line, in pixels from the top of the page.
+        """
+        builder = _TreeBuilder()
+        builder.feed(html_content)
+        builder.close()
+
+        self.markers = {}
+        self.bottom = PAGE_MARGIN_TOP
+        flow = _Flow(PAGE_MARGIN_TOP)
+        base = _Style(BASE_FONT_SIZE, None, False, False)
+        self._layout_blocks(builder.root.children, flow, base, self.content_width, top_level=True, first_child=first_child)
+        return self.bottom
+
+    def _line_height(self, style: _Style) -> float:
+        if style.line_height is not None:
+            return style.line_height * style.font_size
+        return self.fonts[style.bold].line_height * style.font_size
+
+    def _layout_blocks(self, children: List, flow: _Flow, style: _Style, width: float,
+                       top_level: bool = False, first_child: bool = False, in_list: bool = False):
+        """Lay out a mix of block and inline children; runs of inline content form anonymous blocks"""
+        inline_run: List = []
+        first = top_level
+
+        for child in children:
+            if isinstance(child, _Node) and child.tag in BLOCK_TAGS:
+                self._layout_inline(inline_run, flow, style, width)
+                inline_run = []
+                self._layout_block(child, flow, style, width, is_first=first, first_child=first_child, in_list=in_list)
+                first = False
+            elif isinstance(child, _Node) and child.attrs.get('id') and not self._has_content([child]):
+                if inline_run and self._has_content(inline_run):
+                    inline_run.append(child)
+                else:
+                    # Empty element between blocks: it starts where the previous line ended
+                    self.markers[child.attrs['id']] = flow.y
+            else:
+                inline_run.append(child)
+                if first and self._has_content([child]):
+                    first = False
+        self._layout_inline(inline_run, flow, style, width)
+
+    def _layout_block(self, node: _Node, flow: _Flow, style: _Style, width: float,
+                      is_first: bool, first_child: bool, in_list: bool):
+        tag = node.tag
+        margin_top = margin_bottom = 0.0
+        indent = 0.0
+
+        if tag in HEADINGS:
+            size, bottom_em = HEADINGS[tag]
+            style = style.derive(font_size=BASE_FONT_SIZE * size, bold=True)
+            margin_top = HEADING_MARGIN_TOP if tag in ('h1', 'h2', 'h3') else style.font_size * bottom_em
+            margin_bottom = style.font_size * bottom_em
+        elif tag == 'p':
+            margin_top = margin_bottom = PARAGRAPH_MARGIN
+        elif tag in ('ul', 'ol', 'dl'):
+            if not in_list:
+                margin_top = margin_bottom = style.font_size
+            indent = LIST_INDENT if tag != 'dl' else 0.0
+        elif tag == 'dd':
+            indent = LIST_INDENT
+        elif tag == 'blockquote':
+            margin_top = margin_bottom = style.font_size
+            indent = 2 * BLOCKQUOTE_INDENT
+        elif tag == 'pre':
+            margin_top = margin_bottom = style.font_size
+            style = style.derive(mono=True)
+
+        if is_first:
+            # .md > *:first-child, and on the first page the title style of .md-first
+            margin_top = 0.0
+            if first_child:
+                style = style.derive(font_size=FIRST_CHILD_FONT_SIZE, line_height=FIRST_CHILD_LINE_HEIGHT, bold=False)
+                margin_bottom = FIRST_CHILD_MARGIN_BOTTOM
+
+        marker = node.attrs.get('id')
+        if marker and not self._has_content(node.children):
+            self.markers[marker] = flow.y
+
+        flow.margin(margin_top)
+        if tag == 'hr':
+            flow.margin(style.font_size * 0.5)
+            flow.advance(2.0)
+            self.bottom = max(self.bottom, flow.y)
+            flow.margin(style.font_size * 0.5)
+        elif tag == 'pre':
+            self._layout_preformatted(node, flow, style)
+        elif tag == 'table':
+            self._layout_table(node, flow, style, width)
+        else:
+            self._layout_blocks(node.children, flow, style, width - indent,
+                                in_list=in_list or tag in ('ul', 'ol', 'li', 'dl'))
+        flow.margin(margin_bottom)
+
+    def _layout_preformatted(self, node: _Node, flow: _Flow, style: _Style):
+        text = ''.join(self._text(node))
+        lines = text.rstrip('\n').split('\n') if text.strip() else []
+        if lines:
+            flow.advance(len(lines) * self._line_height(style))
+            self.bottom = max(self.bottom, flow.y)
+
+    def _layout_table(self, node: _Node, flow: _Flow, style: _Style, width: float):
+        rows = [row for row in self._descendants(node) if row.tag == 'tr']
+        if not rows:
+            return
+        columns = max(len([cell for cell in row.children if isinstance(cell, _Node) and cell.tag in ('td', 'th')])
+                      for row in rows) or 1
+        cell_width = (width - TABLE_BORDER_SPACING * (columns + 1)) / columns - 2 * TABLE_CELL_PADDING
+
+        height = TABLE_BORDER_SPACING
+        for row in rows:
+            row_height = 0.0
+            for cell in row.children:
+                if not isinstance(cell, _Node) or cell.tag not in ('td', 'th'):
+                    continue
+                cell_flow = _Flow(0.0)
+                saved_bottom = self.bottom
+                self.bottom = 0.0
+                self._layout_blocks(cell.children, cell_flow, style.derive(bold=style.bold or cell.tag == 'th'), cell_width)
+                row_height = max(row_height, self.bottom)
+                self.bottom = saved_bottom
+            height += row_height + 2 * TABLE_CELL_PADDING + TABLE_BORDER_SPACING
+        flow.advance(height)
+        self.bottom = max(self.bottom, flow.y)
+
+    def _layout_inline(self, run: List, flow: _Flow, style: _Style, width: float):
+        """Wrap inline content greedily and advance the flow by its lines"""
+        if not run or not self._has_content(run):
+            for item in run:
+                if isinstance(item, _Node) and item.attrs.get('id'):
+                    self.markers[item.attrs['id']] = flow.y
+            return
+
+        # Tokens: ('word', width, space before), ('marker', id), ('break',), ('image', width, height)
+        tokens: List[tuple] = []
+        state = {'word': 0.0, 'open': False, 'space': False, 'leading_space': False}
+        self._tokenize(run, style, tokens, state)
+        self._end_word(tokens, state)
+
+        line_height = self._line_height(style)
+        lines = 1
+        line_width = 0.0
+        image_height = 0.0  # Images are approximated as lines of their own (max-width: 100%; height: auto)
+        marker_lines: List[Tuple[str, int, float]] = []
+        for token in tokens:
+            if token[0] == 'marker':
+                marker_lines.append((token[1], lines, image_height))
+            elif token[0] == 'image':
+                _, image_width, natural_height = token
+                scaled = natural_height * min(1.0, width / image_width) if image_width else 0.0
+                if line_width:
+                    lines += 1
+                image_height += max(scaled - line_height, 0.0)
+                line_width = width
+            elif token[0] == 'break':
+                lines += 1
+                line_width = 0.0
+            else:
+                _, word_width, space = token
+                if line_width == 0.0:
+                    line_width = word_width
+                elif line_width + space + word_width <= width:
+                    line_width += space + word_width
+                else:
+                    lines += 1
+                    line_width = word_width
+
+        top = flow.y + (max(max(flow.pending), 0.0) if flow.pending else 0.0)
+        for marker, line, extra in marker_lines:
+            self.markers[marker] = top + line * line_height + extra
+        flow.advance(lines * line_height + image_height)
+        self.bottom = max(self.bottom, flow.y)
+
+    def _tokenize(self, items: List, style: _Style, tokens: List[tuple], state: dict):
+        metrics = self.fonts[style.bold]
+        for item in items:
+            if isinstance(item, str):
+                for piece in re.split(r'(\s+)', item):
+                    if not piece:
+                        continue
+                    if piece.isspace():
+                        if state['open']:
+                            self._end_word(tokens, state)
+                        state['space'] = self._advance(' ', style, metrics)
+                    else:
+                        if not state['open']:
+                            state['leading_space'] = state['space']
+                            state['open'] = True
+                        state['word'] += self._advance(piece, style, metrics)
+                continue
+
+            tag = item.tag
+            if item.attrs.get('id') and not self._has_content(item.children):
+                tokens.append(('marker', item.attrs['id']))
+            elif tag == 'br':
+                self._end_word(tokens, state)
+                tokens.append(('break',))
+                state['space'] = 0.0
+            elif tag == 'img' and item.attrs.get('data-width'):
+                # Placeholder with a known intrinsic size (see image_placeholders)
+                self._end_word(tokens, state)
+                tokens.append(('image', float(item.attrs['data-width']), float(item.attrs['data-height'])))
+            elif tag == 'img':
+                # Unresolved images render their alt text
+                self._tokenize([item.attrs.get('alt', '')], style, tokens, state)
+            else:
+                child_style = style
+                if tag in BOLD_TAGS and not style.bold:
+                    child_style = style.derive(bold=True)
+                elif tag in MONOSPACE_TAGS and not style.mono:
+                    child_style = style.derive(mono=True)
+                self._tokenize(item.children, child_style, tokens, state)
+
+    def _advance(self, text: str, style: _Style, metrics: GlyphMetrics) -> float:
+        if style.mono:
+            return len(text) * MONOSPACE_ADVANCE * style.font_size
+        return metrics.text_width(text, style.font_size)
+
+    @staticmethod
+    def _end_word(tokens: List[tuple], state: dict):
+        if state['open']:
+            tokens.append(('word', state['word'], state['leading_space'] or 0.0))
+        state['word'] = 0.0
+        state['open'] = False
+        state['leading_space'] = False
+
+    def _has_content(self, items: List) -> bool:
+        for item in items:
+            if isinstance(item, str):
+                if item.strip():
+                    return True
+            elif item.tag in ('br', 'hr') or (item.tag == 'img' and (item.attrs.get('alt') or item.attrs.get('data-width'))):
+                return True
+            elif self._has_content(item.children):
+                return True
+        return False
+
+    def _text(self, node: _Node) -> List[str]:
+        parts = []
+        for child in node.children:
+            parts.extend([child] if isinstance(child, str) else self._text(child))
+        return parts
+
+    def _descendants(self, node: _Node):
+        for child in node.children:
+            if isinstance(child, _Node):
+                yield child
+                yield from self._descendants(child)
+
+
+_estimators: Dict[Tuple[str, float], HeightEstimator] = {}
+
+
+def get_estimator(project_root: Path, column_width: float) -> HeightEstimator:
+    """Return the estimator for a column width, loading the font metrics on first use"""
+    key = (str(project_root), column_width)
+    if key not in _estimators:
+        _estimators[key] = HeightEstimator(project_root, column_width)
+    return _estimators[key]
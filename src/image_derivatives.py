@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Print-Resolution Image Derivatives
+
+Images extracted from the DOCX keep their source resolution, but `.md img { max-width:
+100% }` caps them at the column they land in (4.85in Initiating first page, 3.81in
+Update first page, 3.91in continuation columns). This module resamples every image
+wider than the column at the target DPI down to exactly that, and points the final
+render's <img> tags at the derivative. A derivative is still at least as wide as the
+column at 96 px/in, so it renders at the same size as the original; WeasyPrint just
+decodes and embeds fewer pixels.
+
+Derivatives are content-addressed (source hash, target size, DPI) under
+.cache/image_derivatives/, so each is produced once and shared by every report and
+process that references the same picture.
+
+Usage:
+    from image_derivatives import substitute_derivatives
+    html = substitute_derivatives(html, base_dir, column_width=4.85, dpi=300)
+
+Each derivative (or the original, when no resampling is needed) is then passed through
+image_optimizer, so the render embeds the smallest encoding of the fewest pixels.
+
+    python src/image_derivatives.py stats
+    python src/image_derivatives.py clear
+"""
+
+import hashlib
+import math
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import click
+
+import image_optimizer
+from image_placeholders import IMG_TAG_RE, SRC_RE, image_size, resolve_image, save_size_cache
+from output_defaults import DEFAULT_DPI, DEFAULT_JPEG_QUALITY
+
+DERIVATIVE_DIR = Path(__file__).parent.parent / '.cache' / 'image_derivatives'
+CSS_DPI = 96  # WeasyPrint's intrinsic image resolution (1 image pixel = 1 CSS px)
+
+# Width of a continuation column: (8.5in page - 0.15in - 0.23in margins - 0.3in gap) / 2
+CONTINUATION_COLUMN_WIDTH = 3.91
+
+_hashes: Dict[Tuple[str, int, int], str] = {}
+stats: Dict[str, int] = {'images': 0, 'derived': 0, 'reused': 0, 'source_bytes': 0, 'derivative_bytes': 0}
+
+
+def _file_hash(path: Path) -> str:
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _hashes:
+        _hashes[key] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return _hashes[key]
+
+
+def target_size(size: Tuple[int, int], column_width: float, dpi: int) -> Optional[Tuple[int, int]]:
+    """Pixel size of the derivative, or None when the source is no wider than the column at `dpi`"""
+    width, height = size
+    max_width = math.ceil(column_width * max(dpi, CSS_DPI))
+    if width <= max_width:
+        return None
+    return max_width, max(1, round(height * max_width / width))
+
+
+def _resample(source: Path, target: Path, size: Tuple[int, int], dpi: int):
+    """Write a Lanczos-resampled copy of `source` in its own format (atomically, safe across processes)"""
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image_format = image.format
+        if image.mode == 'P':
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        elif image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            image = image.convert('RGBA' if 'A' in image.mode else 'RGB')
+        resized = image.resize(size, Image.Resampling.LANCZOS)
+
+    partial = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    if image_format == 'JPEG':
+        resized.convert('RGB').save(partial, 'JPEG', quality=90, dpi=(dpi, dpi))
+    else:
+        resized.save(partial, 'PNG', dpi=(dpi, dpi), optimize=True)
+    os.replace(partial, target)
+
+
+def derivative_for(path: Path, column_width: float, dpi: int = DEFAULT_DPI) -> Optional[Path]:
+    """Return the cached derivative of an image for a column, creating it on first use
+
+    Returns None when the original should be used as is: it is unreadable, already no
+    wider than the column at `dpi`, or the derivative would not be smaller on disk.
+    """
+    size = image_size(path)
+    target = target_size(size, column_width, dpi) if size else None
+    if target is None:
+        return None
+
+    suffix = '.jpg' if path.suffix.lower() in ('.jpg', '.jpeg') else '.png'
+    derivative = DERIVATIVE_DIR / f'{_file_hash(path)[:24]}-{target[0]}x{target[1]}-{dpi}dpi{suffix}'
+    reused = derivative.exists()
+    if not reused:
+        DERIVATIVE_DIR.mkdir(parents=True, exist_ok=True)
+        try:
+            _resample(path, derivative, target, dpi)
+        except Exception as e:
+            print(f"   ⚠️  Could not resample {path.name}: {e}")
+            return None
+
+    source_bytes, derivative_bytes = path.stat().st_size, derivative.stat().st_size
+    if derivative_bytes >= source_bytes:
+        return None
+    stats['reused' if reused else 'derived'] += 1
+    stats['source_bytes'] += source_bytes
+    stats['derivative_bytes'] += derivative_bytes
+    return derivative
+
+
+def substitute_derivatives(html_content: str, base_dir: Path, column_width: float, dpi: int = DEFAULT_DPI,
+                           optimize: bool = False, jpeg_quality: int = DEFAULT_JPEG_QUALITY) -> str:
+    """Point every <img> to its print-resolution derivative and/or re-encoded copy
+
+    Args:
+        html_content: HTML whose <img> tags are rewritten
+        base_dir: Directory relative image paths resolve against
+        column_width: Width of the column the images are capped at, in inches
+        dpi: Resample images wider than the column at this resolution (0 keeps the source resolution)
+        optimize: Re-encode the (resampled) image in its smallest lossless or photographic format
+        jpeg_quality: JPEG quality the optimizer uses for photographs
+
+    Images that cannot be found, read or usefully reduced are left untouched.
+    """
+    if '<img' not in html_content.lower():
+        return html_content
+
+    def replace(match):
+        tag = match.group(0)
+        src_match = SRC_RE.search(tag)
+        path = resolve_image(src_match.group(1) or src_match.group(2) or '', base_dir) if src_match else None
+        if path is None or not path.is_file():
+            return tag
+        stats['images'] += 1
+        embedded = (derivative_for(path, column_width, dpi) if dpi else None) or path
+        if optimize:
+            embedded = image_optimizer.optimized_path(embedded, jpeg_quality) or embedded
+        if embedded == path:
+            return tag
+        return tag[:src_match.start()] + f'src="{embedded.as_uri()}"' + tag[src_match.end():]
+
+    result = IMG_TAG_RE.sub(replace, html_content)
+    save_size_cache()
+    return result
+
+
+def reset_stats():
+    """Zero the counters; render_pdf calls this so they describe one report, not the whole process"""
+    for key in stats:
+        stats[key] = 0
+
+
+def print_stats():
+    if not stats['images']:
+        return
+    replaced = stats['derived'] + stats['reused']
+    saved = (stats['source_bytes'] - stats['derivative_bytes']) / (1024 * 1024)
+    print(f"🖼️  Image derivatives: {replaced}/{stats['images']} image(s) downsampled "
+          f"({stats['derived']} new, {stats['reused']} cached), {saved:.1f} MiB less to embed")
+
+
+@click.group()
+def main():
+    """Inspect or clear the print-resolution image derivatives."""
+
+
+@main.command('stats')
+def show_stats():
+    """Show the number and size of cached derivatives."""
+    files = list(DERIVATIVE_DIR.glob('*-*dpi.*')) if DERIVATIVE_DIR.exists() else []
+    if not files:
+        print(f"ℹ️  No image derivatives in {DERIVATIVE_DIR}")
+        return
+    total = sum(path.stat().st_size for path in files)
+    print(f"📦 {DERIVATIVE_DIR}")
+    print(f"   {len(files)} derivative(s), {total / (1024 * 1024):.1f} MiB")
+
+
+@main.command()
+def clear():
+    """Delete all cached derivatives (they are recreated on the next render)."""
+    files = list(DERIVATIVE_DIR.glob('*-*dpi.*')) if DERIVATIVE_DIR.exists() else []
+    for path in files:
+        path.unlink()
+    print(f"🗑️  Removed {len(files)} derivative(s) from {DERIVATIVE_DIR}")
+
+
+if __name__ == '__main__':
+    main()
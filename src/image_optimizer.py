@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Image Optimizer
+
+Re-encodes report images in the cheapest format that keeps them intact:
+
+    palette   ≤256 colours (chart and table screenshots): exact 8-bit palette PNG
+    jpeg      opaque, many colours and high entropy (photographs): JPEG at --jpeg-quality
+    lossless  everything else: PNG recompressed at the highest zlib level
+
+Pixel dimensions never change, so the rendered layout is identical. A re-encoding is
+used only when it is smaller than the source; otherwise the original is kept.
+
+Results are content-addressed (source hash + JPEG quality) under .cache/image_optimized/,
+including "keep the original" decisions, so each image is classified and encoded once.
+Within a process, lookups are memoized by (path, mtime, size), so an unchanged file is
+not even re-read and re-hashed.
+
+The stage is opt-in (--optimize-images). process_ticker and reports-batch then run it
+over a report's images/ folder after the DOCX extraction and record the byte savings
+per report in .cache/image_savings.json. The final render picks up the cached results
+and optimizes anything new, such as print-resolution derivatives, on demand.
+
+Usage:
+    python src/image_optimizer.py optimize AZEK ZBRA --report-type Initiating
+    python src/image_optimizer.py optimize AZEK --jpeg-quality 80 --workers 4
+    python src/image_optimizer.py savings
+    python src/image_optimizer.py clear
+"""
+
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+
+from output_defaults import DEFAULT_JPEG_QUALITY
+
+project_root = Path(__file__).parent.parent
+OPTIMIZED_DIR = project_root / '.cache' / 'image_optimized'
+SAVINGS_PATH = project_root / '.cache' / 'image_savings.json'
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff')
+
+MAX_PALETTE_COLORS = 256
+# Photographs: more than this many distinct colours and at least this much luminance entropy (bits)
+PHOTO_MIN_COLORS = 4096
+PHOTO_MIN_ENTROPY = 6.5
+
+_results_by_stat: Dict[Tuple[str, int, int, int], Dict[str, Any]] = {}
+stats: Dict[str, int] = {'images': 0, 'optimized': 0, 'source_bytes': 0, 'optimized_bytes': 0}
+
+
+def classify(image) -> str:
+    """'palette', 'jpeg' or 'lossless' for a Pillow image, from its colour count and entropy"""
+    rgba = image.convert('RGBA')
+    if rgba.getcolors(maxcolors=MAX_PALETTE_COLORS) is not None:
+        return 'palette'
+    opaque = rgba.getextrema()[3][0] == 255
+    if opaque and rgba.getcolors(maxcolors=PHOTO_MIN_COLORS) is None and rgba.convert('L').entropy() >= PHOTO_MIN_ENTROPY:
+        return 'jpeg'
+    return 'lossless'
+
+
+def _encode_palette(image) -> Optional[bytes]:
+    """Exact palette PNG, or None if quantization would change a pixel"""
+    from PIL import Image, ImageChops
+
+    rgba = image.convert('RGBA')
+    opaque = rgba.getextrema()[3][0] == 255
+    source = rgba.convert('RGB') if opaque else rgba
+    method = Image.Quantize.MEDIANCUT if opaque else Image.Quantize.FASTOCTREE
+    paletted = source.quantize(colors=MAX_PALETTE_COLORS, method=method, dither=Image.Dither.NONE)
+    if ImageChops.difference(paletted.convert(source.mode), source).getbbox() is not None:
+        return None
+    buffer = io.BytesIO()
+    paletted.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def _encode(image, kind: str, jpeg_quality: int) -> Tuple[str, Optional[bytes]]:
+    """(kind actually used, encoded bytes) for a classification; palette falls back to lossless"""
+    if kind == 'palette':
+        data = _encode_palette(image)
+        if data is not None:
+            return 'palette', data
+        kind = 'lossless'
+    buffer = io.BytesIO()
+    if kind == 'jpeg':
+        image.convert('RGB').save(buffer, 'JPEG', quality=jpeg_quality, optimize=True)
+    else:
+        if image.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA', 'I;16'):
+            image = image.convert('RGBA')
+        image.save(buffer, 'PNG', optimize=True, compress_level=9)
+    return kind, buffer.getvalue()
+
+
+def optimize_image(path: Path, jpeg_quality: int = DEFAULT_JPEG_QUALITY) -> Dict[str, Any]:
+    """Classify and re-encode one image, reusing the cached result when there is one
+
+    Returns:
+        Dict with source, kind ('palette', 'jpeg', 'lossless' or 'original'), source_bytes,
+        bytes, path (the optimized file, None when the original is kept) and cached
+    """
+    path = Path(path)
+    stat = path.stat()
+    stat_key = (str(path), stat.st_mtime_ns, stat.st_size, jpeg_quality)
+    memo = _results_by_stat.get(stat_key)
+    if memo is not None and (memo['path'] is None or os.path.exists(memo['path'])):
+        return {**memo, 'cached': True}
+
+    data = path.read_bytes()
+    key = f'{hashlib.sha256(data).hexdigest()[:24]}-q{jpeg_quality}'
+    result = {'source': str(path), 'source_bytes': len(data), 'cached': True}
+
+    candidates = OPTIMIZED_DIR.glob(f'{key}.*') if OPTIMIZED_DIR.exists() else ()
+    existing = next((candidate for candidate in candidates if not candidate.name.endswith('.tmp')), None)
+    if existing is None:
+        result['cached'] = False
+        from PIL import Image
+
+        kind, encoded = 'original', None
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                image.load()
+                kind, encoded = _encode(image, classify(image), jpeg_quality)
+        except Exception as e:
+            print(f"   ⚠️  Could not optimize {path.name}: {e}")
+        if encoded is None or len(encoded) >= len(data):
+            kind, encoded = 'original', b''
+        suffix = {'jpeg': '.jpg', 'original': '.orig'}.get(kind, '.png')
+        existing = OPTIMIZED_DIR / f'{key}.{kind}{suffix}'
+        OPTIMIZED_DIR.mkdir(parents=True, exist_ok=True)
+        partial = existing.with_name(f'{existing.name}.{os.getpid()}.tmp')
+        partial.write_bytes(encoded)
+        os.replace(partial, existing)
+
+    kind = existing.name.split('.')[1]
+    result['kind'] = kind
+    result['path'] = None if kind == 'original' else str(existing)
+    result['bytes'] = len(data) if kind == 'original' else existing.stat().st_size
+    _results_by_stat[stat_key] = result
+    return result
+
+
+def optimized_path(path: Path, jpeg_quality: int = DEFAULT_JPEG_QUALITY) -> Optional[Path]:
+    """Optimized file to embed instead of `path` (None keeps the original); counts render stats"""
+    result = optimize_image(path, jpeg_quality)
+    stats['images'] += 1
+    stats['source_bytes'] += result['source_bytes']
+    stats['optimized_bytes'] += result['bytes']
+    if result['path'] is None:
+        return None
+    stats['optimized'] += 1
+    return Path(result['path'])
+
+
+def reset_stats():
+    """Zero the counters; render_pdf calls this so they describe one report, not the whole process"""
+    for key in stats:
+        stats[key] = 0
+
+
+def print_stats():
+    if not stats['images']:
+        return
+    saved = (stats['source_bytes'] - stats['optimized_bytes']) / (1024 * 1024)
+    print(f"🗜️  Image optimizer: {stats['optimized']}/{stats['images']} image(s) re-encoded, {saved:.1f} MiB saved")
+
+
+def report_images(ticker_dir: Path) -> List[Path]:
+    images_dir = ticker_dir / 'images'
+    if not images_dir.is_dir():
+        return []
+    return sorted(path for path in images_dir.iterdir() if path.suffix.lower() in IMAGE_SUFFIXES)
+
+
+def _optimize_job(path: str, jpeg_quality: int) -> Dict[str, Any]:
+    return optimize_image(Path(path), jpeg_quality)
+
+
+def optimize_report(ticker: str, report_type: str, jpeg_quality: int = DEFAULT_JPEG_QUALITY, workers: int = 0,
+                    record: bool = True) -> Dict[str, Any]:
+    """Optimize every image of a report (in parallel) and record the savings in .cache/image_savings.json
+
+    Args:
+        ticker: Ticker symbol
+        report_type: 'Initiating' or 'Update'
+        jpeg_quality: JPEG quality for photographic images
+        workers: Worker processes (default: one per CPU; 1 runs in this process)
+        record: Write the summary to .cache/image_savings.json (batch workers leave that to the parent)
+
+    Returns:
+        The recorded savings summary (images, source_bytes, bytes, by_kind)
+    """
+    label = f'{ticker}/{report_type}'
+    paths = report_images(project_root / 'Tickers' / ticker / report_type)
+    start = time.perf_counter()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+    if workers == 1:
+        results = [optimize_image(path, jpeg_quality) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            results = list(executor.map(_optimize_job, [str(path) for path in paths], [jpeg_quality] * len(paths)))
+
+    by_kind: Dict[str, int] = {}
+    for result in results:
+        by_kind[result['kind']] = by_kind.get(result['kind'], 0) + 1
+    summary = {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'jpeg_quality': jpeg_quality,
+        'images': len(results),
+        'source_bytes': sum(result['source_bytes'] for result in results),
+        'bytes': sum(result['bytes'] for result in results),
+        'by_kind': by_kind,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+    if results and record:
+        record_savings({label: summary})
+    saved = (summary['source_bytes'] - summary['bytes']) / (1024 * 1024)
+    kinds = ', '.join(f'{count} {kind}' for kind, count in sorted(by_kind.items()))
+    print(f"🗜️  {label}: {len(results)} image(s) ({kinds or 'none'}), {saved:.1f} MiB saved "
+          f"in {summary['seconds']:.2f}s")
+    return summary
+
+
+def record_savings(summaries: Dict[str, Dict[str, Any]]):
+    """Merge per-report summaries ('TICKER/Type' → optimize_report result) into .cache/image_savings.json"""
+    try:
+        savings = json.loads(SAVINGS_PATH.read_text())
+    except (OSError, ValueError):
+        savings = {}
+    savings.update(summaries)
+    try:
+        SAVINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        SAVINGS_PATH.write_text(json.dumps(savings, indent=2))
+    except OSError as e:
+        print(f"   ⚠️  Could not record image savings: {e}")
+
+
+@click.group()
+def main():
+    """Optimize report images and inspect the savings."""
+
+
+@main.command()
+@click.argument('tickers', nargs=-1, required=True)
+@click.option('--report-type', '-r', 'report_types', type=click.Choice(['Initiating', 'Update']), multiple=True,
+              help='Report type (repeatable, default: both)')
+@click.option('--jpeg-quality', type=click.IntRange(1, 95), default=DEFAULT_JPEG_QUALITY,
+              help=f'JPEG quality for photographic images (default: {DEFAULT_JPEG_QUALITY})')
+@click.option('--workers', '-j', type=int, default=0, help='Worker processes (default: one per CPU)')
+def optimize(tickers: Tuple[str, ...], report_types: Tuple[str, ...], jpeg_quality: int, workers: int):
+    """Optimize the images of TICKERS' reports."""
+    for ticker in tickers:
+        for report_type in report_types or ('Initiating', 'Update'):
+            if (project_root / 'Tickers' / ticker.upper() / report_type / 'images').is_dir():
+                optimize_report(ticker.upper(), report_type, jpeg_quality, workers)
+
+
+@main.command()
+def savings():
+    """Show the recorded byte savings per report."""
+    try:
+        recorded = json.loads(SAVINGS_PATH.read_text())
+    except (OSError, ValueError):
+        print(f"ℹ️  No savings recorded in {SAVINGS_PATH}")
+        return
+    print(f"{'Report':<22} {'Images':>6} {'Before':>10} {'After':>10} {'Saved':>7}  Formats")
+    for label, summary in sorted(recorded.items()):
+        before, after = summary['source_bytes'], summary['bytes']
+        kinds = ', '.join(f'{count} {kind}' for kind, count in sorted(summary['by_kind'].items()))
+        print(f"{label:<22} {summary['images']:>6} {before / 1024:>8.0f}KB {after / 1024:>8.0f}KB "
+              f"{(before - after) / before if before else 0:>6.1%}  {kinds}")
+
+
+@main.command()
+def clear():
+    """Delete the optimized images and recorded savings."""
+    files = list(OPTIMIZED_DIR.iterdir()) if OPTIMIZED_DIR.exists() else []
+    for path in files:
+        path.unlink()
+    SAVINGS_PATH.unlink(missing_ok=True)
+    print(f"🗑️  Removed {len(files)} optimized image(s) from {OPTIMIZED_DIR}")
+
+
+if __name__ == '__main__':
+    main()
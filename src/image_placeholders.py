@@ -0,0 +1,144 @@
+"""
+Image Placeholders for Measurement
+
+Measurement renders only need the size of each image, not its pixels. This module
+reads intrinsic dimensions from the image headers (Pillow opens files lazily and
+stops after the header) and swaps every resolvable <img> for a tiny SVG of the same
+intrinsic size. With the measurement stylesheet's `.md img { max-width: 100%;
+height: auto; }` the placeholder scales exactly like the real image, so WeasyPrint
+never decodes pixel data during the split.
+
+Dimension lookups are cached per file content hash, in memory and in
+.cache/image_sizes.json, so an image is only ever inspected once.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, unquote, urlparse
+
+SIZE_CACHE_PATH = Path(__file__).parent.parent / '.cache' / 'image_sizes.json'
+
+# Fill of the placeholder rectangle; the PDF measurement backend looks for it among drawings
+PLACEHOLDER_FILL = '#010203'
+PLACEHOLDER_FILL_RGB = (1 / 255, 2 / 255, 3 / 255)
+PLACEHOLDER_PREFIX = 'data:image/svg+xml,'
+
+IMG_TAG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+SRC_RE = re.compile(r'''\bsrc\s*=\s*(?:"([^"]*)"|'([^']*)')''', re.IGNORECASE)
+
+_sizes_by_hash: Optional[Dict[str, Tuple[int, int]]] = None
+_sizes_by_stat: Dict[Tuple[str, int, int], Optional[Tuple[int, int]]] = {}
+_dirty = False
+
+
+def _load_size_cache() -> Dict[str, Tuple[int, int]]:
+    global _sizes_by_hash
+    if _sizes_by_hash is None:
+        try:
+            _sizes_by_hash = {key: tuple(size) for key, size in json.loads(SIZE_CACHE_PATH.read_text()).items()}
+        except (OSError, ValueError):
+            _sizes_by_hash = {}
+    return _sizes_by_hash
+
+
+def save_size_cache():
+    """Write newly looked-up dimensions to .cache/image_sizes.json"""
+    global _dirty
+    if not _dirty or _sizes_by_hash is None:
+        return
+    try:
+        SIZE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        SIZE_CACHE_PATH.write_text(json.dumps(_sizes_by_hash))
+        _dirty = False
+    except OSError as e:
+        print(f"   ⚠️  Could not write image size cache: {e}")
+
+
+def image_size(path: Path) -> Optional[Tuple[int, int]]:
+    """Return (width, height) in pixels from the image header, or None if unreadable"""
+    global _dirty
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    stat_key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if stat_key in _sizes_by_stat:
+        return _sizes_by_stat[stat_key]
+
+    sizes = _load_size_cache()
+    file_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+    size = sizes.get(file_hash)
+    if size is None:
+        from PIL import Image
+
+        try:
+            with Image.open(path) as image:  # Reads the header only
+                size = image.size
+        except Exception:
+            size = None
+        if size is not None:
+            sizes[file_hash] = size
+            _dirty = True
+
+    _sizes_by_stat[stat_key] = size
+    return size
+
+
+def resolve_image(src: str, base_dir: Path) -> Optional[Path]:
+    """Map an <img src> to a local file (relative paths resolve against base_dir)"""
+    if src.startswith('data:'):
+        return None
+    parsed = urlparse(src)
+    if parsed.scheme == 'file':
+        return Path(unquote(parsed.path))
+    if parsed.scheme:
+        return None
+    return base_dir / unquote(parsed.path)
+
+
+def placeholder_src(width: int, height: int) -> str:
+    """Data URI of an SVG with the given intrinsic size"""
+    svg = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
+           f'<rect width="100%" height="100%" fill="{PLACEHOLDER_FILL}"/></svg>')
+    return PLACEHOLDER_PREFIX + quote(svg)
+
+
+def substitute_images(html_content: str, base_dir: Path) -> str:
+    """Replace every resolvable <img> with a same-size placeholder
+
+    Images that cannot be found or read are left untouched.
+    The intrinsic size is also kept as data-width/data-height for the height estimator.
+    """
+    if '<img' not in html_content.lower():
+        return html_content
+
+    def replace(match):
+        tag = match.group(0)
+        src_match = SRC_RE.search(tag)
+        if not src_match:
+            return tag
+        path = resolve_image(src_match.group(1) or src_match.group(2) or '', base_dir)
+        size = image_size(path) if path is not None else None
+        if size is None:
+            return tag
+        width, height = size
+        tag = tag[:src_match.start()] + f'src="{placeholder_src(width, height)}"' + tag[src_match.end():]
+        return tag[:4] + f' data-width="{width}" data-height="{height}"' + tag[4:]
+
+    result = IMG_TAG_RE.sub(replace, html_content)
+    save_size_cache()
+    return result
+
+
+def image_signature(html_content: str, base_dir: Path) -> bytes:
+    """Sizes of the images an HTML fragment references (part of measurement cache keys)"""
+    sizes = []
+    for tag in IMG_TAG_RE.findall(html_content):
+        src_match = SRC_RE.search(tag)
+        path = resolve_image(src_match.group(1) or src_match.group(2) or '', base_dir) if src_match else None
+        size = image_size(path) if path is not None else None
+        sizes.append(f'{size[0]}x{size[1]}' if size else '-')
+    return ','.join(sizes).encode()
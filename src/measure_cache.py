@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Block Measurement Cache
+
+Persistent, content-addressed cache of rendered block heights, shared by every run.
+Keys are computed by the caller (generate_report) from the block markdown, its
+preceding block, the column width, the measurement CSS and the font files, so a
+changed paragraph only invalidates itself and the block that follows it.
+
+The cache is a small SQLite database under .cache/ with size-bounded LRU eviction.
+Every split records its hits and misses so the hit rate per run can be inspected:
+
+Usage:
+    python src/measure_cache.py stats
+    python src/measure_cache.py stats --runs 50
+    python src/measure_cache.py clear
+"""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import click
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / '.cache' / 'measure_cache.sqlite3'
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+def digest(*parts: bytes) -> str:
+    """Hash byte strings into a hex key (parts are length-prefixed so they cannot run together)"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(len(part).to_bytes(8, 'little'))
+        h.update(part)
+    return h.hexdigest()
+
+
+class MeasureCache:
+    """SQLite-backed LRU cache mapping measurement keys to heights in inches"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS measurements (
+                key TEXT PRIMARY KEY,
+                height REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS measurements_last_used ON measurements (last_used);
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started REAL NOT NULL,
+                label TEXT NOT NULL,
+                hits INTEGER NOT NULL,
+                misses INTEGER NOT NULL
+            );
+        ''')
+        self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, float]:
+        """Return cached heights for the keys that are present and mark them as recently used"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        # Stay well below SQLite's host parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f'SELECT key, height FROM measurements WHERE key IN ({placeholders})', chunk)
+            found.update(rows.fetchall())
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                'UPDATE measurements SET last_used = ? WHERE key = ?',
+                [(now, key) for key in found])
+            self._conn.commit()
+        return found
+
+    def put_many(self, heights: Dict[str, float]):
+        """Store heights and evict the least recently used entries beyond max_entries"""
+        if not heights:
+            return
+        now = time.time()
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO measurements (key, height, last_used) VALUES (?, ?, ?)',
+            [(key, height, now) for key, height in heights.items()])
+        count = self._conn.execute('SELECT COUNT(*) FROM measurements').fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                'DELETE FROM measurements WHERE key IN '
+                '(SELECT key FROM measurements ORDER BY last_used ASC LIMIT ?)',
+                (count - self.max_entries,))
+        self._conn.commit()
+
+    def record_run(self, label: str, hits: int, misses: int):
+        """Record the hit/miss counts of one split"""
+        self._conn.execute(
+            'INSERT INTO runs (started, label, hits, misses) VALUES (?, ?, ?, ?)',
+            (time.time(), label, hits, misses))
+        self._conn.commit()
+
+    def recent_runs(self, limit: int = 20) -> List[tuple]:
+        """Return the most recent runs as (started, label, hits, misses), newest first"""
+        return self._conn.execute(
+            'SELECT started, label, hits, misses FROM runs ORDER BY id DESC LIMIT ?',
+            (limit,)).fetchall()
+
+    def entry_count(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM measurements').fetchone()[0]
+
+    def clear(self):
+        self._conn.executescript('DELETE FROM measurements; DELETE FROM runs;')
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+_default_cache: Optional[MeasureCache] = None
+
+
+def get_cache() -> MeasureCache:
+    """Return the process-wide cache at the default location"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = MeasureCache()
+    return _default_cache
+
+
+@click.group()
+def main():
+    """Inspect or clear the block measurement cache."""
+
+
+@main.command()
+@click.option('--runs', type=int, default=20, help='Number of recent runs to show (default: 20)')
+def stats(runs: int):
+    """Show cache size and hit rate per run."""
+    if not DEFAULT_CACHE_PATH.exists():
+        print(f"ℹ️  No measurement cache at {DEFAULT_CACHE_PATH}")
+        return
+
+    cache = MeasureCache()
+    print(f"📦 {DEFAULT_CACHE_PATH}")
+    print(f"   {cache.entry_count()} / {cache.max_entries} entries, "
+          f"{DEFAULT_CACHE_PATH.stat().st_size / 1024:.1f} KiB")
+
+    recent = cache.recent_runs(runs)
+    if not recent:
+        print("   No runs recorded yet")
+        return
+
+    print(f"\n{'Started':<20} {'Hits':>6} {'Misses':>7} {'Hit rate':>9}  Report")
+    total_hits = total_misses = 0
+    for started, label, hits, misses in recent:
+        total_hits += hits
+        total_misses += misses
+        rate = hits / (hits + misses) if hits + misses else 0.0
+        when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started))
+        print(f"{when:<20} {hits:>6} {misses:>7} {rate:>8.1%}  {label}")
+
+    total = total_hits + total_misses
+    if total:
+        print(f"\nOverall hit rate over {len(recent)} run(s): {total_hits / total:.1%}")
+    cache.close()
+
+
+@main.command()
+def clear():
+    """Delete all cached measurements and run statistics."""
+    if not DEFAULT_CACHE_PATH.exists():
+        print(f"ℹ️  No measurement cache at {DEFAULT_CACHE_PATH}")
+        return
+    cache = MeasureCache()
+    cache.clear()
+    cache.close()
+    print(f"🗑️  Cleared {DEFAULT_CACHE_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Measurement Worker Pool
+
+A process pool of warm measurement workers for split_markdown_by_height.
+Each worker imports WeasyPrint once and loads the font configuration and the
+measurement stylesheets in its initializer, so every measurement it makes
+skips the @font-face and Fontconfig setup. The split engine hands the pool
+whole batches of candidate prefixes or block windows and gathers the results.
+
+Worker count and a per-worker memory ceiling are configurable; a worker that
+exceeds its ceiling fails its task with MemoryError, which the split engine
+treats like any other measurement error.
+"""
+
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Column widths of the two report types, preloaded in every worker
+PRELOAD_COLUMN_WIDTHS = (4.85, 3.81)
+
+_worker_root: Optional[Path] = None
+
+
+def _init_worker(project_root: str, memory_limit_mb: Optional[int]):
+    """Apply the memory ceiling and warm up fonts and stylesheets (runs once per worker)"""
+    global _worker_root
+    _worker_root = Path(project_root)
+
+    if memory_limit_mb:
+        try:
+            import resource
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            print(f"⚠️  Could not set worker memory ceiling: {e}")
+
+    from generate_report import LAYOUT_PAGE_CSS, measurement_resources
+
+    for column_width in PRELOAD_COLUMN_WIDTHS:
+        measurement_resources(_worker_root, column_width)
+        measurement_resources(_worker_root, column_width, LAYOUT_PAGE_CSS)
+
+
+def _measure_html_task(html_content: str, column_width: float, backend: str):
+    from generate_report import measure_content_height
+
+    try:
+        return measure_content_height(html_content, _worker_root, column_width, backend)
+    except Exception as e:
+        # Return rather than raise so one failed measurement doesn't hide the others
+        return e
+
+
+def _block_offsets_task(sources: List[str], column_width: float, first_child: bool, image_base: Optional[str]):
+    from generate_report import Block, block_kind, measure_block_offsets
+
+    blocks = [Block(source, block_kind(source)) for source in sources]
+    return measure_block_offsets(blocks, _worker_root, column_width, first_child=first_child,
+                                 image_base=Path(image_base) if image_base else None)
+
+
+class MeasurePool:
+    """Process pool of warm measurement workers"""
+
+    def __init__(self, project_root: Path, workers: Optional[int] = None, memory_limit_mb: Optional[int] = None):
+        self.project_root = Path(project_root)
+        self.workers = workers or os.cpu_count() or 1
+        self.memory_limit_mb = memory_limit_mb
+        # Spawn fresh interpreters: forking a parent that already loaded Pango/GLib is not safe
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(str(self.project_root), memory_limit_mb),
+        )
+
+    def measure_heights(self, htmls: List[str], column_width: float, backend: str = 'pdf') -> List[object]:
+        """Measure HTML prefixes concurrently; each result is a height in inches or the exception raised"""
+        futures = [self._executor.submit(_measure_html_task, html, column_width, backend) for html in htmls]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def block_offsets(self, windows: List[Tuple[List[str], bool]], column_width: float,
+                      image_base: Optional[Path] = None) -> List[List[float]]:
+        """Lay out block windows concurrently; each window is (block sources, first_child)"""
+        base = str(image_base) if image_base is not None else None
+        futures = [
+            self._executor.submit(_block_offsets_task, sources, column_width, first_child, base)
+            for sources, first_child in windows
+        ]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pools: Dict[Tuple[str, int, Optional[int]], MeasurePool] = {}
+
+
+def get_pool(project_root: Path, workers: int, memory_limit_mb: Optional[int] = None) -> MeasurePool:
+    """Return a warm pool for these settings, starting it on first use and keeping it for the process"""
+    key = (str(project_root), workers, memory_limit_mb)
+    if key not in _pools:
+        _pools[key] = MeasurePool(project_root, workers, memory_limit_mb)
+    return _pools[key]
+
+
+@atexit.register
+def _shutdown_pools():
+    for pool in _pools.values():
+        pool.shutdown()
+    _pools.clear()
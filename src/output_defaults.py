@@ -0,0 +1,12 @@
+"""
+Output Defaults
+
+Defaults of the image and PDF output options, shared by render_pdf, the CLIs that
+forward them (process_ticker, batch_reports) and the build graph's stamps. This module
+imports nothing, so the CLIs can offer these options without loading the image and
+PDF optimizers (and click, multiprocessing and PyMuPDF with them).
+"""
+
+DEFAULT_DPI = 300  # Resolution of image derivatives (see image_derivatives); renders only make them when asked to
+DEFAULT_JPEG_QUALITY = 85  # JPEG quality of re-encoded photographic images (see image_optimizer)
+PDF_PROFILES = ('print', 'screen', 'archive')  # Output profiles of pdf_optimizer.PROFILES
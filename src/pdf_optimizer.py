@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+PDF Post-Processing Optimizer
+
+Optional pass over a finished PDF with PyMuPDF: identical image and font streams are
+merged into one object, content streams are recompressed and unused objects are
+garbage-collected. What else happens depends on the output profile:
+
+    print     lossless: deduplicate, recompress, compact into object streams
+    screen    print + sanitized content streams + images above 200 dpi resampled to 150 dpi (JPEG q80)
+    archive   lossless like print, but without object streams (PDF/A-1 does not allow them)
+
+The optimized file replaces the original only when it is smaller.
+
+Usage:
+    from pdf_optimizer import optimize_pdf
+    optimize_pdf('Tickers/AZEK/Initiating/AZEK.Issue01.02202025.pdf', profile='print')
+
+    python src/pdf_optimizer.py optimize report.pdf --profile screen -o report-web.pdf
+    python src/pdf_optimizer.py merge bundle.pdf a.pdf b.pdf --profile print
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import click
+
+import tracing
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    'print': {'clean': False, 'object_streams': True, 'images': None},
+    # images: (resample above dpi, target dpi, JPEG quality)
+    'screen': {'clean': True, 'object_streams': True, 'images': (200, 150, 80)},
+    'archive': {'clean': False, 'object_streams': False, 'images': None},
+}
+
+
+def _save(doc, target: Path, profile: str):
+    settings = PROFILES[profile]
+    if settings['images']:
+        threshold, target_dpi, quality = settings['images']
+        doc.rewrite_images(dpi_threshold=threshold, dpi_target=target_dpi, quality=quality)
+    doc.save(
+        str(target),
+        garbage=4,  # Drop unused objects, merge duplicates and compare stream contents
+        deflate=True,
+        deflate_images=True,
+        deflate_fonts=True,
+        clean=settings['clean'],
+        use_objstms=1 if settings['object_streams'] else 0,
+    )
+
+
+def _report(label: str, profile: str, before: int, after: int, seconds: float, kept: bool):
+    change = (after - before) / before if before else 0.0
+    outcome = 'kept the original (no smaller)' if kept else f'{change:+.1%}'
+    print(f"📉 PDF optimizer ({profile}): {label} {before / 1024:.0f} KB → {after / 1024:.0f} KB "
+          f"{outcome} in {seconds:.2f}s")
+
+
+def optimize_pdf(pdf_path: str, profile: str = 'print', output_path: Optional[str] = None) -> Dict[str, Any]:
+    """Deduplicate, recompress and garbage-collect a PDF
+
+    Args:
+        pdf_path: PDF to optimize
+        profile: Output profile (see PROFILES)
+        output_path: Where to write the result (default: replace pdf_path)
+
+    Returns:
+        Dict with bytes_before, bytes_after, seconds and output (the path that holds the result)
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown PDF profile: {profile} (expected one of {', '.join(PROFILES)})")
+    import fitz
+
+    source = Path(pdf_path)
+    output = Path(output_path) if output_path else source
+    partial = output.with_name(f'{output.name}.{os.getpid()}.tmp')
+    start = time.perf_counter()
+    with tracing.span('pdf optimize', profile=profile, file=source.name) as trace:
+        with fitz.open(str(source)) as doc:
+            _save(doc, partial, profile)
+        before, after = source.stat().st_size, partial.stat().st_size
+        kept = after >= before
+        if kept:
+            partial.unlink()
+            if output != source:
+                output.write_bytes(source.read_bytes())
+            after = before
+        else:
+            os.replace(partial, output)
+        trace.set(bytes_before=before, bytes_after=after)
+    seconds = time.perf_counter() - start
+    _report(source.name, profile, before, after, seconds, kept)
+    return {'bytes_before': before, 'bytes_after': after, 'seconds': seconds, 'output': str(output)}
+
+
+def merge_pdfs(pdf_paths: List[str], output_path: str, profile: str = 'print') -> Dict[str, Any]:
+    """Concatenate PDFs into one, sharing the fonts and logos they have in common
+
+    Returns:
+        Dict with bytes_before (sum of the inputs), bytes_after, seconds and output
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown PDF profile: {profile} (expected one of {', '.join(PROFILES)})")
+    import fitz
+
+    output = Path(output_path)
+    start = time.perf_counter()
+    with tracing.span('pdf merge', profile=profile, files=len(pdf_paths)):
+        with fitz.open() as merged:
+            for path in pdf_paths:
+                with fitz.open(str(path)) as doc:
+                    merged.insert_pdf(doc)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            _save(merged, output, profile)
+    before = sum(Path(path).stat().st_size for path in pdf_paths)
+    after = output.stat().st_size
+    seconds = time.perf_counter() - start
+    _report(f'{len(pdf_paths)} PDF(s) → {output.name}', profile, before, after, seconds, kept=False)
+    return {'bytes_before': before, 'bytes_after': after, 'seconds': seconds, 'output': str(output)}
+
+
+@click.group()
+def main():
+    """Shrink finished report PDFs."""
+
+
+@main.command()
+@click.argument('pdfs', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--profile', '-p', type=click.Choice(list(PROFILES)), default='print', help='Output profile (default: print)')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), default=None,
+              help='Output file (one input only; default: optimize in place)')
+def optimize(pdfs, profile: str, output: Optional[str]):
+    """Optimize PDFS in place (or into --output)."""
+    if output and len(pdfs) > 1:
+        raise click.UsageError('--output takes a single input PDF')
+    results = [optimize_pdf(pdf, profile, output) for pdf in pdfs]
+    if len(results) > 1:
+        before = sum(result['bytes_before'] for result in results)
+        after = sum(result['bytes_after'] for result in results)
+        print(f"\n📊 {len(results)} PDF(s): {before / 1024:.0f} KB → {after / 1024:.0f} KB "
+              f"({(after - before) / before:+.1%}) in {sum(result['seconds'] for result in results):.2f}s")
+
+
+@main.command()
+@click.argument('output', type=click.Path(dir_okay=False))
+@click.argument('pdfs', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--profile', '-p', type=click.Choice(list(PROFILES)), default='print', help='Output profile (default: print)')
+def merge(output: str, pdfs, profile: str):
+    """Merge PDFS into OUTPUT, deduplicating shared fonts and images."""
+    merge_pdfs(list(pdfs), output, profile)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,18 +6,44 @@ Runs the full pipeline to process a ticker from DOCX to PDF report:
 1. Convert DOCX to Markdown (with image extraction)
 2. Generate PDF report from Markdown
 
+Both steps run as child Python processes by default (isolated); --in-process calls
+convert_docx_to_markdown and render_pdf directly in this interpreter instead,
+sharing loaded modules and warm caches and skipping two interpreter startups.
+
+--incremental skips each step whose inputs are unchanged since it last succeeded
+(content-hash stamps, see build_graph.py). --watch then keeps the process warm and
+re-runs the stale steps whenever the DOCX, markdown, config, images, templates or
+assets change.
+
+When a render daemon is running (render_daemon.py start), both steps are forwarded to
+it so they run in its warm process; --no-daemon opts out.
+
 Usage:
     python process_ticker.py TICKER
     
 Example:
     python process_ticker.py AZEK
+    python process_ticker.py AZEK --in-process
+    python process_ticker.py AZEK --incremental
+    python process_ticker.py AZEK --skip-conversion --watch
+    python process_ticker.py AZEK --trace trace.json
 """
 
 import sys
 import subprocess
+import time
 from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
 import click
-import yaml
+
+import tracing
+from build_graph import BuildGraph, newest_pdf, render_params
+from output_defaults import DEFAULT_DPI, DEFAULT_JPEG_QUALITY, PDF_PROFILES
+from render_daemon import DaemonClient, find_daemon
+
+# Polling interval and how long files must stay unchanged before a rebuild (seconds)
+WATCH_INTERVAL = 0.25
+WATCH_DEBOUNCE = 0.2
 
 
 def get_pdf_filename(ticker: str, ticker_dir: Path) -> str:
@@ -29,6 +55,8 @@ def get_pdf_filename(ticker: str, ticker_dir: Path) -> str:
     
     # Try to load config to get report_saving info
     if config_file.exists():
+        import yaml
+        
         try:
             with open(config_file, 'r', encoding='utf-8') as f:
                 config = yaml.safe_load(f)
@@ -48,13 +76,15 @@ def run_command(cmd: list[str], description: str) -> bool:
     print(f"🔄 {description}")
     print(f"{'='*60}")
     
+    start = time.perf_counter()
     try:
-        result = subprocess.run(
-            cmd,
-            check=True,
-            capture_output=False,
-            text=True
-        )
+        with tracing.span(description, mode='subprocess'):
+            result = subprocess.run(
+                cmd,
+                check=True,
+                capture_output=False,
+                text=True
+            )
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -63,6 +93,126 @@ def run_command(cmd: list[str], description: str) -> bool:
     except Exception as e:
         print(f"❌ {description} failed: {str(e)}")
         return False
+    finally:
+        print(f"⏱️  {description}: {time.perf_counter() - start:.2f}s (subprocess)")
+
+
+def run_in_process(func: Callable, description: str, **kwargs) -> bool:
+    """Call a pipeline step in this interpreter and return success status (like run_command)"""
+    print(f"\n{'='*60}")
+    print(f"🔄 {description}")
+    print(f"{'='*60}")
+    
+    start = time.perf_counter()
+    try:
+        with tracing.span(description, mode='in-process'):
+            func(**kwargs)
+        print(f"✅ {description} completed successfully")
+        return True
+    except SystemExit as e:
+        print(f"❌ {description} failed with exit code {e.code}")
+        return False
+    except Exception as e:
+        print(f"❌ {description} failed: {str(e)}")
+        return False
+    finally:
+        print(f"⏱️  {description}: {time.perf_counter() - start:.2f}s (in-process)")
+
+
+def run_on_daemon(client: DaemonClient, kind: str, description: str, **kwargs) -> bool:
+    """Run a pipeline step on the render daemon and return success status (like run_command)"""
+    print(f"\n{'='*60}")
+    print(f"🔄 {description}")
+    print(f"{'='*60}")
+    
+    start = time.perf_counter()
+    try:
+        with tracing.span(description, mode='daemon'):
+            result = client.submit(kind, **kwargs)
+        if result['log']:
+            print(result['log'], end='')
+        if result['ok']:
+            print(f"✅ {description} completed successfully")
+        else:
+            print(f"❌ {description} failed: {result['error']}")
+        return result['ok']
+    except OSError as e:
+        print(f"❌ {description} failed: render daemon unreachable ({e})")
+        return False
+    finally:
+        print(f"⏱️  {description}: {time.perf_counter() - start:.2f}s (daemon)")
+
+
+def _watch_snapshot(graph: BuildGraph, ticker: str, report_type: str) -> Dict[str, Optional[Tuple[int, int]]]:
+    """(mtime, size) of every watched file; None for watched files that do not exist"""
+    snapshot = {}
+    for path in graph.convert_inputs(ticker, report_type) + graph.render_inputs(ticker, report_type):
+        try:
+            stat = path.stat()
+            snapshot[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            snapshot[str(path)] = None
+    return snapshot
+
+
+def watch_ticker(ticker: str, report_type: str, graph: BuildGraph, convert: bool, render: bool, render_kwargs: dict):
+    """
+    Poll the report's inputs and re-run the stale steps in this (warm) process until Ctrl-C.
+    
+    Args:
+        ticker: Stock ticker symbol
+        report_type: 'Initiating' or 'Update'
+        graph: Build stamps deciding which steps are stale
+        convert: Re-run DOCX conversion when the DOCX changes
+        render: Re-render the PDF when any of its inputs change
+        render_kwargs: Keyword arguments for render_pdf
+    """
+    from docx_to_markdown import convert_docx_to_markdown
+    from generate_report import render_pdf
+    
+    ticker_dir = Path(__file__).parent.parent / 'Tickers' / ticker / report_type
+    params = render_params(render_kwargs)
+    
+    print(f"👀 Watching {ticker} ({report_type}): markdown, config, images, templates and assets (Ctrl-C to stop)")
+    last = _watch_snapshot(graph, ticker, report_type)
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = _watch_snapshot(graph, ticker, report_type)
+            if current == last:
+                continue
+            # Debounce: editors often write a file in several steps
+            while True:
+                time.sleep(WATCH_DEBOUNCE)
+                settled = _watch_snapshot(graph, ticker, report_type)
+                if settled == current:
+                    break
+                current = settled
+            
+            changed = sorted(path for path in set(current) | set(last) if current.get(path) != last.get(path))
+            print(f"\n✏️  Changed: {', '.join(Path(path).name for path in changed)}")
+            start = time.perf_counter()
+            
+            docx = graph.convert_inputs(ticker, report_type)[0]
+            if convert and docx.exists() and graph.convert_stale(ticker, report_type):
+                if run_in_process(convert_docx_to_markdown, f"Converting {docx.name} to Markdown",
+                                  docx_path=str(docx), ticker=ticker, output_dir=str(ticker_dir), report_type=report_type):
+                    graph.record_convert(ticker, report_type)
+            
+            reason = graph.render_stale(ticker, report_type, render_kwargs['nonbranded'], params) if render else None
+            if reason:
+                render_start = time.time()
+                if run_in_process(render_pdf, f"Generating PDF report for {ticker}", **render_kwargs):
+                    output = newest_pdf(ticker_dir, render_start)
+                    if output:
+                        graph.record_render(ticker, report_type, render_kwargs['nonbranded'], params, output)
+            graph.save()
+            
+            print(f"⏱️  Rebuilt in {time.perf_counter() - start:.2f}s" if reason else "✅ Outputs already up to date")
+            # Our own writes (markdown, stamps) are not edits
+            last = _watch_snapshot(graph, ticker, report_type)
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped watching {ticker}")
 
 
 @click.command()
@@ -78,7 +228,41 @@ def run_command(cmd: list[str], description: str) -> bool:
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
 @click.option('--nonbranded', is_flag=True, default=False,
               help='Generate non-branded version (no logos, minimal headers/footers)')
-def main(ticker: str, report_type: str, skip_conversion: bool, skip_pdf: bool, max_height: float, verbose: bool, nonbranded: bool):
+@click.option('--split-mode', type=click.Choice(['linear', 'bisect', 'layout', 'estimate', 'fragment']), default='linear',
+              help='First-page split search: linear (one render per block), bisect (O(log n) renders), layout (one render), '
+                   'estimate (glyph metrics, one confirming render) or fragment (one layout of the real template)')
+@click.option('--measure-backend', type=click.Choice(['pdf', 'render']), default='pdf',
+              help='Height measurement backend: pdf (write PDF, parse with PyMuPDF) or render (WeasyPrint layout tree)')
+@click.option('--no-measure-cache', is_flag=True, default=False,
+              help='Re-measure every block in layout split mode instead of using the persistent cache')
+@click.option('--measure-workers', type=int, default=0,
+              help='Warm worker processes measuring split candidates concurrently (default: 0, measure in-process)')
+@click.option('--worker-memory-mb', type=int, default=None,
+              help='Memory ceiling per measurement worker in MB (default: no limit)')
+@click.option('--no-split-memo', is_flag=True, help='Always re-measure the first-page split instead of reusing .split.json')
+@click.option('--image-placeholders', is_flag=True,
+              help='Measure images as same-size placeholders read from their headers instead of decoding them')
+@click.option('--image-dpi', type=click.IntRange(min=0), default=0,
+              help=f'Embed images wider than their column resampled to this resolution, e.g. {DEFAULT_DPI} '
+                   '(JPEGs are re-encoded, so this is lossy); default: 0, embed them as extracted')
+@click.option('--optimize-images', is_flag=True,
+              help='Embed each image re-encoded as the smallest of palette PNG, PNG or JPEG (default: as extracted)')
+@click.option('--jpeg-quality', type=click.IntRange(1, 95), default=DEFAULT_JPEG_QUALITY,
+              help=f'JPEG quality for photographic images (default: {DEFAULT_JPEG_QUALITY})')
+@click.option('--pdf-profile', type=click.Choice(PDF_PROFILES), default=None,
+              help='Post-process the PDF with PyMuPDF: print (lossless dedup/recompress), screen (also downsample images) '
+                   'or archive (lossless, no object streams); default: write as rendered')
+@click.option('--in-process', is_flag=True,
+              help='Run conversion and PDF generation in this process instead of child Python processes')
+@click.option('--incremental', is_flag=True,
+              help='Skip steps whose inputs (DOCX, markdown, config, images, templates, fonts) are unchanged since their last successful run')
+@click.option('--watch', is_flag=True,
+              help='After the first run, stay running in-process and re-run stale steps whenever inputs change (implies --in-process --incremental)')
+@click.option('--no-daemon', is_flag=True,
+              help='Do not forward steps to a running render daemon')
+@click.option('--trace', type=click.Path(), default=None,
+              help='Write a Chrome trace-event JSON of every stage (including subprocesses) to this path and print a timing summary')
+def main(ticker: str, report_type: str, skip_conversion: bool, skip_pdf: bool, max_height: float, verbose: bool, nonbranded: bool, split_mode: str, measure_backend: str, no_measure_cache: bool, measure_workers: int, worker_memory_mb: int, no_split_memo: bool, image_placeholders: bool, image_dpi: int, optimize_images: bool, jpeg_quality: int, pdf_profile: str, in_process: bool, incremental: bool, watch: bool, no_daemon: bool, trace: str):
     """
     Process a ticker through the full pipeline: DOCX → Markdown → PDF
     
@@ -86,6 +270,13 @@ def main(ticker: str, report_type: str, skip_conversion: bool, skip_pdf: bool, m
     """
     project_root = Path(__file__).parent.parent  # Go up from src/ to project root
     ticker = ticker.upper()
+    if trace:
+        tracing.enable(trace)
+        # Written when the command exits, including on errors and after --watch is stopped
+        click.get_current_context().call_on_close(tracing.finish)
+    if watch:
+        # Watching only pays off with a warm process that knows what is already built
+        in_process = incremental = True
     
     # Define paths with report type subfolder
     ticker_dir = project_root / 'Tickers' / ticker / report_type
@@ -108,8 +299,19 @@ def main(ticker: str, report_type: str, skip_conversion: bool, skip_pdf: bool, m
     print(f"📝 Markdown file: {markdown_file}")
     print(f"📕 PDF report: {pdf_file}")
     
+    pipeline_start = time.perf_counter()
+    graph = BuildGraph() if incremental else None
+    # A running daemon already has everything warm; watch mode is its own warm process
+    daemon = None if no_daemon or watch else find_daemon()
+    if daemon:
+        print(f"🔌 Forwarding to render daemon at {daemon.base}")
+    mode = 'daemon' if daemon else 'in-process' if in_process else 'subprocess'
+    
     # Step 1: Convert DOCX to Markdown
-    if not skip_conversion:
+    convert_reason = graph.convert_stale(ticker, report_type) if graph and not skip_conversion and docx_file.exists() else 'forced'
+    if not skip_conversion and convert_reason is None:
+        print(f"\n⏭️  Markdown is up to date with {docx_file.name} (incremental)")
+    elif not skip_conversion:
         # Check if DOCX file exists
         if not docx_file.exists():
             print(f"\n❌ Error: DOCX file not found: {docx_file}")
@@ -117,20 +319,33 @@ def main(ticker: str, report_type: str, skip_conversion: bool, skip_pdf: bool, m
             print(f"💡 Please place {docx_filename} in {ticker_dir}")
             sys.exit(1)
         
-        # Run conversion
-        cmd = [
-            sys.executable,
-            str(project_root / 'src' / 'docx_to_markdown.py'),
-            str(docx_file),
-            '--ticker', ticker,
-            '--report-type', report_type
-        ]
-        if verbose:
-            cmd.append('--verbose')
-        
         docx_display = f'{ticker}_update.docx' if report_type == 'Update' else f'{ticker}.docx'
-        if not run_command(cmd, f"Converting {docx_display} to Markdown"):
+        if daemon:
+            ok = run_on_daemon(daemon, 'convert', f"Converting {docx_display} to Markdown",
+                               docx_path=str(docx_file), ticker=ticker, output_dir=str(ticker_dir), report_type=report_type)
+        elif in_process:
+            from docx_to_markdown import convert_docx_to_markdown
+            
+            ok = run_in_process(convert_docx_to_markdown, f"Converting {docx_display} to Markdown",
+                                docx_path=str(docx_file), ticker=ticker, output_dir=str(ticker_dir), report_type=report_type)
+        else:
+            # Run conversion
+            cmd = [
+                sys.executable,
+                str(project_root / 'src' / 'docx_to_markdown.py'),
+                str(docx_file),
+                '--ticker', ticker,
+                '--report-type', report_type,
+                '--output-dir', str(ticker_dir)
+            ]
+            if verbose:
+                cmd.append('--verbose')
+            ok = run_command(cmd, f"Converting {docx_display} to Markdown")
+        if not ok:
             sys.exit(1)
+        if graph:
+            graph.record_convert(ticker, report_type)
+            graph.save()
     else:
         print(f"\n⏭️  Skipping DOCX conversion")
         # Check if markdown exists if we're skipping conversion
@@ -140,39 +355,106 @@ def main(ticker: str, report_type: str, skip_conversion: bool, skip_pdf: bool, m
             sys.exit(1)
     
     # Step 2: Generate PDF report
-    if not skip_pdf:
+    render_kwargs = dict(
+        ticker=ticker,
+        report_type=report_type,
+        max_height_inches=max_height,
+        nonbranded=nonbranded,
+        split_mode=split_mode,
+        measure_backend=measure_backend,
+        use_measure_cache=not no_measure_cache,
+        measure_workers=measure_workers,
+        worker_memory_mb=worker_memory_mb,
+        use_split_memo=not no_split_memo,
+        image_placeholders=image_placeholders,
+        image_dpi=image_dpi,
+        optimize_images=optimize_images,
+        jpeg_quality=jpeg_quality,
+        pdf_profile=pdf_profile,
+    )
+    params = render_params(render_kwargs)
+    render_reason = graph.render_stale(ticker, report_type, nonbranded, params) if graph and not skip_pdf and markdown_file.exists() else 'forced'
+    render_start = time.time()
+    if not skip_pdf and render_reason is None:
+        print(f"\n⏭️  PDF is up to date (incremental)")
+    elif not skip_pdf:
+        if graph:
+            print(f"\n🔄 Rebuilding PDF: {render_reason}")
         # Check if markdown file exists
         if not markdown_file.exists():
             print(f"\n❌ Error: Markdown file not found: {markdown_file}")
             print(f"💡 DOCX conversion may have failed")
             sys.exit(1)
         
-        # Run PDF generation
-        cmd = [
-            sys.executable,
-            str(project_root / 'src' / 'generate_report.py'),
-            '--ticker', ticker,
-            '--report-type', report_type,
-            '--max-height', str(max_height)
-        ]
+        # Re-encode the extracted images in parallel up front; the render then only looks the results up
+        if optimize_images and (ticker_dir / 'images').is_dir():
+            from image_optimizer import optimize_report
+            
+            run_in_process(optimize_report, "Optimizing report images", ticker=ticker, report_type=report_type,
+                           jpeg_quality=jpeg_quality)
         
-        if nonbranded:
-            cmd.append('--nonbranded')
+        if daemon:
+            if not run_on_daemon(daemon, 'render', f"Generating PDF report for {ticker}", **render_kwargs):
+                sys.exit(1)
+        elif in_process:
+            from generate_report import render_pdf
+            
+            ok = run_in_process(render_pdf, f"Generating PDF report for {ticker}", **render_kwargs)
+            if not ok:
+                sys.exit(1)
+        else:
+            # Run PDF generation
+            cmd = [
+                sys.executable,
+                str(project_root / 'src' / 'generate_report.py'),
+                '--ticker', ticker,
+                '--report-type', report_type,
+                '--max-height', str(max_height),
+                '--split-mode', split_mode,
+                '--measure-backend', measure_backend
+            ]
+            
+            if nonbranded:
+                cmd.append('--nonbranded')
+            if no_measure_cache:
+                cmd.append('--no-measure-cache')
+            if measure_workers:
+                cmd.extend(['--measure-workers', str(measure_workers)])
+            if worker_memory_mb:
+                cmd.extend(['--worker-memory-mb', str(worker_memory_mb)])
+            if no_split_memo:
+                cmd.append('--no-split-memo')
+            if image_placeholders:
+                cmd.append('--image-placeholders')
+            cmd.extend(['--image-dpi', str(image_dpi)])
+            if optimize_images:
+                cmd.extend(['--optimize-images', '--jpeg-quality', str(jpeg_quality)])
+            if pdf_profile:
+                cmd.extend(['--pdf-profile', pdf_profile])
+            
+            if not run_command(cmd, f"Generating PDF report for {ticker}"):
+                sys.exit(1)
         
-        if not run_command(cmd, f"Generating PDF report for {ticker}"):
-            sys.exit(1)
+        output = newest_pdf(ticker_dir, render_start) if graph else None
+        if output:
+            graph.record_render(ticker, report_type, nonbranded, params, output)
+            graph.save()
     else:
         print(f"\n⏭️  Skipping PDF generation")
     
     # Summary
     print(f"\n{'='*60}")
     print(f"🎉 Pipeline completed for {ticker}")
+    print(f"⏱️  Wall clock: {time.perf_counter() - pipeline_start:.2f}s ({mode})")
     print(f"{'='*60}")
     if not skip_conversion:
         print(f"✅ Markdown: {markdown_file}")
     if not skip_pdf:
         print(f"✅ PDF Report: {pdf_file}")
     print()
+    
+    if watch:
+        watch_ticker(ticker, report_type, graph, not skip_conversion, not skip_pdf, render_kwargs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Render Daemon
+
+A long-lived local server that keeps the pipeline warm: WeasyPrint, PyMuPDF,
+pypandoc and Jinja are imported once, and the measurement stylesheets, fonts,
+URL cache and split caches persist across jobs. Jobs (DOCX conversion or PDF
+render) arrive over localhost HTTP, wait in a queue, and run on a fixed number
+of warm worker processes, so concurrent jobs never share WeasyPrint, the
+measurement caches or the render statistics. A worker that crashes is replaced.
+
+While a daemon is running, reports-gen forwards its steps to it automatically
+(see process_ticker --no-daemon). The daemon advertises its port in
+.cache/render_daemon.json, together with a random token that every request must
+carry in the X-Daemon-Token header; the file is readable by its owner only, so
+other local users cannot submit jobs (which write files) or stop the daemon.
+
+Endpoints:
+    POST /jobs      {"kind": "render" | "convert", "kwargs": {...}} → waits, returns the result
+    GET  /health    status, queue depth, running/completed/failed jobs, render latency
+    POST /shutdown  stop after the running jobs finish (queued jobs fail)
+
+Usage:
+    python src/render_daemon.py start               # Serve in the foreground
+    python src/render_daemon.py start --concurrency 2
+    python src/render_daemon.py status
+    python src/render_daemon.py stop
+"""
+
+import contextlib
+import hmac
+import io
+import json
+import multiprocessing
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import click
+
+project_root = Path(__file__).parent.parent
+STATE_PATH = project_root / '.cache' / 'render_daemon.json'
+DEFAULT_PORT = 8765
+TOKEN_HEADER = 'X-Daemon-Token'
+
+JOB_KINDS = ('render', 'convert')
+
+
+def _init_worker():
+    """Import the pipeline and load the stylesheets, fonts and report templates once per worker"""
+    sys.path.insert(0, str(Path(__file__).parent))
+    start = time.perf_counter()
+    import docx_to_markdown  # noqa: F401
+    import generate_report
+    import template_env
+    from style_registry import get_registry
+
+    try:
+        for column_width in (3.81, 4.85):  # Update and Initiating first-page columns
+            generate_report.measurement_resources(project_root, column_width)
+        for css_path in sorted(template_env.TEMPLATES_DIR.glob('*.css')):
+            get_registry().stylesheet(str(css_path))
+    except Exception as e:
+        print(f"⚠️  Could not preload stylesheets and fonts: {e}")
+    template_env.warm()
+    print(f"🔥 Worker {os.getpid()} warm in {time.perf_counter() - start:.2f}s", flush=True)
+
+
+def _warm_job() -> int:
+    return os.getpid()
+
+
+def _run_job(kind: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one pipeline step in a worker process; never raises so one job cannot take down the worker"""
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            if kind == 'convert':
+                from docx_to_markdown import convert_docx_to_markdown
+
+                output = convert_docx_to_markdown(**kwargs)
+            else:
+                from generate_report import render_pdf
+
+                output = render_pdf(**kwargs)
+        ok, error = True, None
+    except BaseException as e:
+        log.write(traceback.format_exc())
+        ok, output, error = False, None, f'{type(e).__name__}: {e}'
+    return {'ok': ok, 'output': str(output) if output else None, 'error': error, 'log': log.getvalue(),
+            'seconds': time.perf_counter() - start}
+
+
+def _failed_result(job: Dict[str, Any], error: str, start: Optional[float] = None) -> Dict[str, Any]:
+    """Result of a job that did not run to completion in a worker"""
+    now = time.perf_counter()
+    start = now if start is None else start
+    return {'ok': False, 'output': None, 'error': error, 'log': '', 'seconds': now - start,
+            'queue_seconds': start - job['queued']}
+
+
+class RenderDaemon:
+    """Job queue plus dispatcher threads handing jobs to a pool of warm worker processes
+
+    Args:
+        concurrency: Number of jobs (and worker processes) running at once
+    """
+
+    def __init__(self, concurrency: int = 1):
+        self.concurrency = max(1, concurrency)
+        self.jobs: 'queue.Queue[Optional[Dict[str, Any]]]' = queue.Queue()
+        self.started = time.time()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.latencies: List[float] = []
+        self.lock = threading.Lock()
+        self.stopping = False
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # Spawned, not forked: workers never inherit the dispatcher and HTTP threads
+        return ProcessPoolExecutor(max_workers=self.concurrency, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker)
+
+    def warm_up(self):
+        """Start every worker process so the first jobs find the pipeline already imported and warm"""
+        start = time.perf_counter()
+        self.executor = self._new_executor()
+        # One task per worker spawns them all; each logs its own warm-up as it finishes
+        for future in [self.executor.submit(_warm_job) for _ in range(self.concurrency)]:
+            future.result()
+        print(f"🔥 Started {self.concurrency} worker process(es) in {time.perf_counter() - start:.2f}s")
+
+    def start_workers(self):
+        if self.executor is None:
+            self.executor = self._new_executor()
+        for index in range(self.concurrency):
+            threading.Thread(target=self._worker, name=f'render-dispatch-{index}', daemon=True).start()
+
+    def stop_workers(self):
+        """Let the running jobs finish, fail the queued ones and stop the worker processes"""
+        with self.lock:
+            self.stopping = True
+            # Nothing is queued after this point (see submit), so the sentinels come last
+            while True:
+                try:
+                    job = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not None:
+                    job['result'] = _failed_result(job, 'daemon stopping')
+                    job['done'].set()
+            for _ in range(self.concurrency):
+                self.jobs.put(None)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, kind: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a job and block until it has run"""
+        job = {'kind': kind, 'kwargs': kwargs, 'queued': time.perf_counter(), 'done': threading.Event()}
+        with self.lock:
+            if self.stopping:
+                return _failed_result(job, 'daemon stopping')
+            self.jobs.put(job)
+        job['done'].wait()
+        return job['result']
+
+    def _worker(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            try:
+                with self.lock:
+                    self.running += 1
+                job['result'] = self._run(job)
+                with self.lock:
+                    self.running -= 1
+                    if job['result']['ok']:
+                        self.completed += 1
+                        if job['kind'] == 'render':
+                            self.latencies = (self.latencies + [job['result']['seconds']])[-500:]
+                    else:
+                        self.failed += 1
+                status = '✅' if job['result']['ok'] else '❌'
+                print(f"{status} {job['kind']} {job['kwargs'].get('ticker', '')} in {job['result']['seconds']:.2f}s "
+                      f"(queued {job['result']['queue_seconds']:.2f}s)")
+            finally:
+                # The client waits on this; it must be released whatever happened above
+                job.setdefault('result', _failed_result(job, 'dispatcher error'))
+                job['done'].set()
+
+    def _run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        executor = self.executor
+        try:
+            result = executor.submit(_run_job, job['kind'], job['kwargs']).result()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. out of memory); replace the pool once for every job that hit it
+            with self.lock:
+                if self.executor is executor and not self.stopping:
+                    self.executor = self._new_executor()
+                    print(f"🔁 Worker pool crashed; started a fresh one")
+            result = _failed_result(job, f'worker crashed: {e}', start)
+        except Exception as e:
+            # E.g. the pool shut down (RuntimeError) or cancelled the job (CancelledError) while stopping
+            result = _failed_result(job, f'{type(e).__name__}: {e}', start)
+        result['queue_seconds'] = start - job['queued']
+        return result
+
+    def health(self) -> Dict[str, Any]:
+        import statistics
+        
+        with self.lock:
+            latencies = sorted(self.latencies)
+            return {
+                'status': 'ok',
+                'pid': os.getpid(),
+                'uptime_seconds': round(time.time() - self.started, 1),
+                'concurrency': self.concurrency,
+                'queue_depth': self.jobs.qsize(),
+                'running': self.running,
+                'completed': self.completed,
+                'failed': self.failed,
+                'render_latency_seconds': {
+                    'count': len(latencies),
+                    'p50': round(statistics.median(latencies), 3) if latencies else None,
+                    'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3) if latencies else None,
+                    'max': round(latencies[-1], 3) if latencies else None,
+                },
+            }
+
+
+def _write_state(state: Dict[str, Any]):
+    """Write the state file readable by its owner only, since it holds the daemon's token"""
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(STATE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.chmod(STATE_PATH, 0o600)  # The mode above only applies when the file is created
+    with os.fdopen(fd, 'w') as f:
+        json.dump(state, f)
+
+
+def _make_handler(daemon: RenderDaemon, server_holder: list, token: str):
+    from http.server import BaseHTTPRequestHandler
+    
+    class Handler(BaseHTTPRequestHandler):
+        def _authorized(self) -> bool:
+            if hmac.compare_digest(self.headers.get(TOKEN_HEADER, ''), token):
+                return True
+            self._send(403, {'error': 'missing or wrong daemon token'})
+            return False
+
+        def _send(self, status: int, payload: Dict[str, Any]):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path == '/health':
+                self._send(200, daemon.health())
+            else:
+                self._send(404, {'error': f'unknown path {self.path}'})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            if self.path == '/shutdown':
+                self._send(200, {'status': 'stopping'})
+                threading.Thread(target=server_holder[0].shutdown, daemon=True).start()
+                return
+            if self.path != '/jobs':
+                self._send(404, {'error': f'unknown path {self.path}'})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                kind, kwargs = request['kind'], request.get('kwargs', {})
+                if kind not in JOB_KINDS:
+                    raise ValueError(f'unknown job kind {kind!r}')
+            except (ValueError, KeyError, TypeError) as e:
+                self._send(400, {'error': f'bad job: {e}'})
+                return
+            self._send(200, daemon.submit(kind, kwargs))
+
+        def log_message(self, format, *args):
+            pass  # Jobs are logged by the workers
+
+    return Handler
+
+
+def serve(port: int = DEFAULT_PORT, concurrency: int = 1):
+    """Run the daemon in the foreground until /shutdown or Ctrl-C"""
+    from http.server import ThreadingHTTPServer
+    
+    daemon = RenderDaemon(concurrency)
+    daemon.warm_up()
+    token = secrets.token_urlsafe(32)
+    server_holder: list = []
+    server = ThreadingHTTPServer(('127.0.0.1', port), _make_handler(daemon, server_holder, token))
+    server_holder.append(server)
+    daemon.start_workers()
+
+    _write_state({'port': server.server_address[1], 'pid': os.getpid(), 'token': token})
+    print(f"🚀 Render daemon listening on http://127.0.0.1:{server.server_address[1]} "
+          f"({daemon.concurrency} worker process(es), pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.stop_workers()
+        try:
+            if json.loads(STATE_PATH.read_text()).get('pid') == os.getpid():
+                STATE_PATH.unlink()
+        except (OSError, ValueError):
+            pass
+        print("👋 Render daemon stopped")
+
+
+class DaemonClient:
+    """Thin client for a running render daemon"""
+
+    def __init__(self, port: int, token: str):
+        self.base = f'http://127.0.0.1:{port}'
+        self.token = token
+
+    def _request(self, path: str, payload: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        import urllib.request  # Only clients that found a daemon pay for the HTTP stack
+        
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.base + path, data=data, method='GET' if path == '/health' else 'POST',
+                                         headers={'Content-Type': 'application/json', TOKEN_HEADER: self.token})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+
+    def health(self, timeout: float = 0.5) -> Dict[str, Any]:
+        return self._request('/health', timeout=timeout)
+
+    def submit(self, kind: str, **kwargs) -> Dict[str, Any]:
+        return self._request('/jobs', {'kind': kind, 'kwargs': kwargs})
+
+    def shutdown(self) -> Dict[str, Any]:
+        return self._request('/shutdown', timeout=5)
+
+
+def find_daemon() -> Optional[DaemonClient]:
+    """Client for the running daemon, or None if none answers its health check"""
+    try:
+        state = json.loads(STATE_PATH.read_text())
+        port, token = state['port'], state['token']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    client = DaemonClient(port, token)
+    try:
+        client.health()
+    except (OSError, ValueError):
+        return None
+    return client
+
+
+@click.group()
+def cli():
+    """Keep the report pipeline warm in a local daemon"""
+
+
+@cli.command()
+@click.option('--port', type=int, default=DEFAULT_PORT, help=f'Localhost port (default: {DEFAULT_PORT}, 0 for any free port)')
+@click.option('--concurrency', '-j', type=int, default=1, help='Jobs running at once (default: 1)')
+def start(port, concurrency):
+    """Start the daemon in the foreground"""
+    if find_daemon():
+        print("⚠️  A render daemon is already running (see `status`)")
+        sys.exit(1)
+    serve(port, concurrency)
+
+
+@cli.command()
+def status():
+    """Print the running daemon's health and metrics"""
+    client = find_daemon()
+    if client is None:
+        print("💤 No render daemon running")
+        sys.exit(1)
+    print(json.dumps(client.health(), indent=2))
+
+
+@cli.command()
+def stop():
+    """Stop the running daemon"""
+    client = find_daemon()
+    if client is None:
+        print("💤 No render daemon running")
+        sys.exit(1)
+    client.shutdown()
+    print("🛑 Render daemon stopping")
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,123 @@
+"""
+Stylesheet and Font Registry
+
+Parsed WeasyPrint stylesheets and one FontConfiguration shared by every render in a
+process. report.css / update.css and the measurement stylesheet are parsed once,
+their @font-face rules (and the template's inline ones, registered on the first
+render) load their fonts once, and every HTML.render / write_pdf call gets the same
+objects.
+
+Stylesheet files are revalidated against their mtime and size on every lookup and
+reparsed when edited. If a font file changes, the font configuration and every
+stylesheet parsed against it are dropped.
+
+Usage:
+    from style_registry import get_registry
+    stylesheet, font_config = get_registry().stylesheet(css_path)
+    HTML(...).write_pdf(target, stylesheets=[stylesheet], font_config=font_config)
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from url_cache import get_fetcher
+
+FONTS_DIR = Path(__file__).parent.parent / 'assets' / 'fonts' / 'Source_Sans_3' / 'static'
+REPORT_FONTS = ('SourceSans3-Regular.ttf', 'SourceSans3-Bold.ttf')
+
+
+def _signature(paths: Iterable[Path]) -> Tuple[Tuple[int, int], ...]:
+    """(mtime_ns, size) per file; missing files count as (0, 0)"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((0, 0))
+    return tuple(signature)
+
+
+class StyleRegistry:
+    """Parsed stylesheets and the shared font configuration, invalidated on file changes
+
+    Args:
+        font_files: Font files loaded through @font-face; a change to any of them resets the fonts
+    """
+
+    def __init__(self, font_files: Iterable[Path] = tuple(FONTS_DIR / name for name in REPORT_FONTS)):
+        self.font_files = tuple(font_files)
+        self._font_config = None
+        self._font_signature = None
+        # key -> (file signature or None for inline CSS, parsed CSS)
+        self._stylesheets: Dict[Tuple[str, ...], Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {'hits': 0, 'parses': 0, 'font_resets': 0}
+
+    def _current_font_config(self):
+        """The shared FontConfiguration, recreated (dropping parsed stylesheets) when a font file changed"""
+        signature = _signature(self.font_files)
+        if self._font_config is None or signature != self._font_signature:
+            from weasyprint.text.fonts import FontConfiguration
+
+            if self._font_config is not None:
+                self.stats['font_resets'] += 1
+            self._font_config = FontConfiguration()
+            self._font_signature = signature
+            self._stylesheets.clear()
+        return self._font_config
+
+    def _get(self, key: Tuple[str, ...], signature: Optional[Tuple], parse) -> Tuple[Any, Any]:
+        with self._lock:
+            font_config = self._current_font_config()
+            entry = self._stylesheets.get(key)
+            if entry is not None and entry[0] == signature:
+                self.stats['hits'] += 1
+                return entry[1], font_config
+            self.stats['parses'] += 1
+            stylesheet = parse(font_config)
+            self._stylesheets[key] = (signature, stylesheet)
+            return stylesheet, font_config
+
+    def stylesheet(self, css_path: str) -> Tuple[Any, Any]:
+        """Return (parsed stylesheet, font configuration) for a CSS file, reparsing it when it changed"""
+        from weasyprint import CSS
+
+        path = str(Path(css_path).resolve())
+        return self._get(('file', path), _signature([path]),
+                         lambda font_config: CSS(path, url_fetcher=get_fetcher(), font_config=font_config))
+
+    def inline_stylesheet(self, css: str, base_url: str) -> Tuple[Any, Any]:
+        """Return (parsed stylesheet, font configuration) for CSS source text"""
+        from weasyprint import CSS
+
+        return self._get(('string', css, base_url), None,
+                         lambda font_config: CSS(string=css, base_url=base_url, url_fetcher=get_fetcher(),
+                                                 font_config=font_config))
+
+    def clear(self):
+        with self._lock:
+            self._stylesheets.clear()
+            self._font_config = self._font_signature = None
+
+    def print_stats(self, label: str = 'Stylesheets'):
+        stats = self.stats
+        lookups = stats['hits'] + stats['parses']
+        if not lookups:
+            return
+        resets = f", {stats['font_resets']} font reset(s)" if stats['font_resets'] else ''
+        print(f"🎨 {label}: {stats['hits']}/{lookups} lookup(s) reused a parsed stylesheet "
+              f"({len(self._stylesheets)} held{resets})")
+
+
+_registry: Optional[StyleRegistry] = None
+
+
+def get_registry() -> StyleRegistry:
+    """Return the process-wide style registry"""
+    global _registry
+    if _registry is None:
+        _registry = StyleRegistry()
+    return _registry
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Shared Jinja Environment
+
+One Jinja environment per templates directory, shared by every render in a process,
+so report.html / update.html are compiled once per process instead of once per
+report. Templates are re-checked against their mtime on every lookup (auto_reload)
+and recompiled only when edited.
+
+Compiled templates are also written to a bytecode cache under .cache/jinja_bytecode/,
+keyed by template name and source checksum, so a cold process (a batch worker, the
+daemon, a one-off render) loads precompiled code instead of parsing the templates.
+`compile-templates` fills that cache ahead of time.
+
+Usage:
+    from template_env import get_template
+    template = get_template('report.html')
+
+    python src/template_env.py compile-templates
+    python src/template_env.py clear
+"""
+
+from pathlib import Path
+from typing import Dict, List
+
+import click
+
+TEMPLATES_DIR = Path(__file__).parent / 'templates'
+BYTECODE_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'jinja_bytecode'
+
+_environments: Dict[str, 'jinja2.Environment'] = {}
+
+
+def get_environment(templates_dir: Path = TEMPLATES_DIR):
+    """Return the process-wide environment for a templates directory, creating it on first use"""
+    key = str(Path(templates_dir).resolve())
+    env = _environments.get(key)
+    if env is None:
+        from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        env = _environments[key] = Environment(
+            loader=FileSystemLoader(key),
+            autoescape=select_autoescape(['html']),
+            bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+            auto_reload=True,  # Recompile a template when its mtime changes
+        )
+    return env
+
+
+def get_template(name: str, templates_dir: Path = TEMPLATES_DIR):
+    """Compiled template `name` (from memory, the bytecode cache or the source, in that order)"""
+    return get_environment(templates_dir).get_template(name)
+
+
+def template_names(templates_dir: Path = TEMPLATES_DIR) -> List[str]:
+    return sorted(path.name for path in Path(templates_dir).glob('*.html'))
+
+
+def warm(templates_dir: Path = TEMPLATES_DIR) -> List[str]:
+    """Load every template into the process environment (and the bytecode cache); returns their names"""
+    names = template_names(templates_dir)
+    for name in names:
+        get_template(name, templates_dir)
+    return names
+
+
+@click.group()
+def main():
+    """Precompile or clear the Jinja template bytecode cache."""
+
+
+@main.command('compile-templates')
+@click.option('--templates-dir', type=click.Path(exists=True, file_okay=False, path_type=Path), default=TEMPLATES_DIR,
+              help='Templates directory (default: src/templates)')
+def compile_templates(templates_dir: Path):
+    """Compile every template into the bytecode cache."""
+    names = warm(templates_dir)
+    if not names:
+        print(f"ℹ️  No templates in {templates_dir}")
+        return
+    for name in names:
+        print(f"   ✓ {name}")
+    print(f"✅ Compiled {len(names)} template(s) into {BYTECODE_CACHE_DIR}")
+
+
+@main.command()
+def clear():
+    """Delete the compiled templates."""
+    if not BYTECODE_CACHE_DIR.exists():
+        print(f"ℹ️  No template cache at {BYTECODE_CACHE_DIR}")
+        return
+    removed = 0
+    for path in BYTECODE_CACHE_DIR.glob('__jinja2_*.cache'):
+        path.unlink()
+        removed += 1
+    print(f"🗑️  Removed {removed} compiled template(s) from {BYTECODE_CACHE_DIR}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+Pipeline Tracing
+
+Lightweight spans around the pipeline stages, written as a Chrome trace-event JSON
+file (open it in chrome://tracing or https://ui.perfetto.dev) plus an aggregated
+text summary. Tracing is off unless enabled, and a disabled span costs one call.
+
+The process that calls enable() owns the trace. It exports REPORTS_TRACE so child
+processes it starts (the DOCX conversion and PDF render subprocesses) record too;
+each child writes its events to a part file on exit, and finish() merges them.
+
+Usage:
+    import tracing
+    tracing.enable('trace.json')
+    with tracing.span('pandoc', file=name):
+        ...
+    with tracing.span('measure prefix', blocks=12) as s:
+        s.set(height=height)
+    tracing.finish()
+
+    @tracing.traced('render_pdf')
+    def render_pdf(...): ...
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+TRACE_ENV = 'REPORTS_TRACE'
+
+_events: List[Dict[str, Any]] = []
+_trace_path: Optional[Path] = None
+_owner = False
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start', 'wall_start')
+
+    def __init__(self, name: str, args: Dict[str, Any]):
+        self.name = name
+        self.args = args
+
+    def set(self, **args):
+        """Annotate the span (e.g. with a result known only at the end)"""
+        self.args.update(args)
+
+    def __enter__(self):
+        self.wall_start = time.time_ns() // 1000
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        _events.append({
+            'name': self.name,
+            'ph': 'X',
+            'ts': self.wall_start,
+            'dur': round((time.perf_counter() - self.start) * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': threading.get_native_id(),
+            'args': self.args,
+        })
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def enabled() -> bool:
+    return _trace_path is not None
+
+
+def span(name: str, **args):
+    """Context manager timing one stage; a no-op unless tracing is enabled"""
+    if _trace_path is None:
+        return _NO_SPAN
+    return _Span(name, args)
+
+
+def traced(name: str):
+    """Decorator wrapping every call of a function in a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _process_name_event() -> Dict[str, Any]:
+    return {'name': 'process_name', 'ph': 'M', 'pid': os.getpid(),
+            'args': {'name': Path(sys.argv[0]).name if sys.argv and sys.argv[0] else 'python'}}
+
+
+def enable(path: str):
+    """Start recording into `path` (this process owns the trace; children started from now on record too)"""
+    global _trace_path, _owner
+    _trace_path = Path(path).resolve()
+    _owner = True
+    _events.clear()
+    os.environ[TRACE_ENV] = str(_trace_path)
+    for stale in _trace_path.parent.glob(f'{_trace_path.name}.*.part'):
+        stale.unlink()
+
+
+def _write_part():
+    """Child processes: hand the recorded events to the owner through a part file"""
+    if _trace_path is None or _owner or not _events:
+        return
+    part = _trace_path.parent / f'{_trace_path.name}.{os.getpid()}.part'
+    try:
+        part.write_text(json.dumps([_process_name_event()] + _events))
+    except OSError:
+        pass
+
+
+def finish(summary: bool = True) -> Optional[Path]:
+    """Write the Chrome trace (merging child processes' events) and print the summary"""
+    global _trace_path, _owner
+    if _trace_path is None or not _owner:
+        return None
+    events = [_process_name_event()] + _events
+    for part in sorted(_trace_path.parent.glob(f'{_trace_path.name}.*.part')):
+        try:
+            events.extend(json.loads(part.read_text()))
+        except (OSError, ValueError):
+            pass
+        part.unlink()
+
+    _trace_path.parent.mkdir(parents=True, exist_ok=True)
+    _trace_path.write_text(json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}))
+    if summary:
+        print_summary(events)
+    print(f"🧭 Trace written to {_trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+
+    path = _trace_path
+    os.environ.pop(TRACE_ENV, None)
+    _trace_path, _owner = None, False
+    return path
+
+
+def print_summary(events: List[Dict[str, Any]], limit: int = 25):
+    """Aggregate spans by name: count, total, mean and max time"""
+    spans = [event for event in events if event.get('ph') == 'X']
+    if not spans:
+        return
+    totals: Dict[str, List[float]] = defaultdict(list)
+    for event in spans:
+        totals[event['name']].append(event['dur'] / 1000.0)
+    wall = (max(e['ts'] + e['dur'] for e in spans) - min(e['ts'] for e in spans)) / 1000.0
+
+    print(f"\n{'='*60}")
+    print(f"🧭 Trace summary ({len(spans)} spans, {wall:.0f} ms wall)")
+    print(f"{'='*60}")
+    print(f"   {'span':<32} {'count':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9}")
+    for name, durations in sorted(totals.items(), key=lambda item: -sum(item[1]))[:limit]:
+        print(f"   {name[:32]:<32} {len(durations):>6} {sum(durations):>10.1f} "
+              f"{sum(durations) / len(durations):>9.1f} {max(durations):>9.1f}")
+
+
+# Child processes started by a tracing parent record into the same trace
+if os.environ.get(TRACE_ENV):
+    _trace_path = Path(os.environ[TRACE_ENV])
+    atexit.register(_write_part)
@@ -0,0 +1,116 @@
+"""
+Caching URL Fetcher
+
+A WeasyPrint url_fetcher shared by every render in a process. Measurement renders
+and the final write_pdf resolve the same file:// fonts, logos, chart and images
+again and again; this fetcher keeps their bytes in a size-bounded in-memory LRU,
+revalidated against each file's mtime and size on every fetch. Each file is read
+once into an immutable bytes object that every later fetch hands out as is.
+
+Non-file URLs (http, data:) go straight to WeasyPrint's default fetcher.
+
+Usage:
+    from url_cache import get_fetcher
+    HTML(string=html, base_url=base, url_fetcher=get_fetcher()).write_pdf(...)
+    get_fetcher().print_stats()
+"""
+
+import mimetypes
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+
+class CachingURLFetcher:
+    """Callable url_fetcher with an LRU cache of local files
+
+    Args:
+        max_bytes: Upper bound on cached bytes
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        # path -> (mtime_ns, size, bytes)
+        self._entries = OrderedDict()
+        self._cached_bytes = 0
+        self.stats: Dict[str, int] = {
+            'hits': 0, 'misses': 0, 'bytes_from_cache': 0, 'bytes_from_disk': 0,
+            'evictions': 0, 'passthrough': 0,
+        }
+
+    def __call__(self, url: str, *args, **kwargs) -> Dict[str, Any]:
+        if not url.startswith('file:'):
+            from weasyprint import default_url_fetcher
+
+            self.stats['passthrough'] += 1
+            return default_url_fetcher(url, *args, **kwargs)
+
+        from urllib.request import url2pathname  # Deferred: urllib.request pulls in the whole HTTP stack
+        
+        path = url2pathname(url.split('?')[0].split('#')[0].removeprefix('file:'))
+        data = self._read(path)
+        result = {'string': data, 'redirected_url': url, 'path': path}
+        mime_type, _ = mimetypes.guess_type(path)
+        if mime_type:
+            result['mime_type'] = mime_type
+        return result
+
+    def _read(self, path: str) -> bytes:
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self._entries.move_to_end(path)
+            self.stats['hits'] += 1
+            self.stats['bytes_from_cache'] += stat.st_size
+            return entry[2]
+
+        if entry is not None:
+            self._evict(path)
+        self.stats['misses'] += 1
+        self.stats['bytes_from_disk'] += stat.st_size
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        if stat.st_size <= self.max_bytes:
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, data)
+            self._cached_bytes += stat.st_size
+            while self._cached_bytes > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+                self.stats['evictions'] += 1
+        return data
+
+    def _evict(self, path: str):
+        _, size, _ = self._entries.pop(path)
+        self._cached_bytes -= size
+
+    @property
+    def cached_bytes(self) -> int:
+        return self._cached_bytes
+
+    def clear(self):
+        for path in list(self._entries):
+            self._evict(path)
+
+    def print_stats(self, label: str = 'URL cache'):
+        stats = self.stats
+        fetches = stats['hits'] + stats['misses']
+        if not fetches:
+            return
+        mib = 1024 * 1024
+        print(f"📦 {label}: {stats['hits']}/{fetches} file fetch(es) from memory, "
+              f"{stats['bytes_from_cache'] / mib:.1f} MiB from cache vs {stats['bytes_from_disk'] / mib:.1f} MiB from disk "
+              f"({len(self._entries)} file(s), {self._cached_bytes / mib:.1f} MiB held)")
+
+
+_fetcher: Optional[CachingURLFetcher] = None
+
+
+def get_fetcher() -> CachingURLFetcher:
+    """Return the process-wide caching fetcher"""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = CachingURLFetcher()
+    return _fetcher
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The pipeline modules are flat files in src/, imported the same way the entry scripts do
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
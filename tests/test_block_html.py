@@ -0,0 +1,58 @@
+"""blocks_to_html must be byte-identical to converting the joined markdown as a whole"""
+
+import random
+
+import pytest
+
+from generate_report import blocks_to_html, blocks_to_markdown, md_to_html, parse_blocks
+
+CASES = [
+    'Title line\n\nFirst paragraph.\n\nSecond paragraph.',
+    '**KEY POINTS**\n\n-   First bullet\n\n-   Second bullet\n\nClosing paragraph.',
+    '1. one\n\n2. two\n\n- three',
+    '> First quote\n\n> Second quote',
+    'Paragraph\n\n> quote one\n> still one\n\n> quote two\n\nAfter the quotes.',
+    'Text\n> lazy quote\n\n> next quote',
+    'Exhibit 1: Revenue\n\n![](images/image1.png)\n\nSource: Company filings',
+    '| a | b |\n|---|---|\n| 1 | 2 |\n\nBelow the table.',
+    'Intro\n\n<!-- APPENDIX -->\n\n**APPENDIX**',
+    'See the note[^1].\n\n[^1]: The note.',
+    '- item\n\n    continued code-like indent',
+]
+
+PIECES = [
+    'Plain paragraph with $5.00 and "quotes".', '**HEADING**', '# Title', '-   bullet one', '-   bullet two',
+    '1. first', '2. second', '* star item', '> quoted line', '> another quote\n> continued',
+    'Exhibit 1: chart', '![](images/a.png)', '| a | b |\n|---|---|\n| 1 | 2 |', '<!-- APPENDIX -->',
+    'Text<sup>st</sup> quarter', '    indented code',
+]
+
+
+def assert_equivalent(markdown_text: str):
+    blocks = parse_blocks(markdown_text)
+    assert blocks_to_html(blocks) == md_to_html(blocks_to_markdown(blocks))
+
+
+@pytest.mark.parametrize('markdown_text', CASES)
+def test_known_cases(markdown_text):
+    assert_equivalent(markdown_text)
+
+
+def test_adjacent_blockquotes_merge_like_the_whole_document():
+    blocks = parse_blocks('> First quote\n\n> Second quote')
+    html = blocks_to_html(blocks)
+    assert html.count('<blockquote>') == 1
+    assert html == md_to_html(blocks_to_markdown(blocks))
+
+
+def test_every_prefix_and_suffix_matches():
+    blocks = parse_blocks('\n\n'.join(CASES[:8]))
+    for split in range(len(blocks) + 1):
+        for part in (blocks[:split], blocks[split:]):
+            assert blocks_to_html(part) == md_to_html(blocks_to_markdown(part))
+
+
+def test_random_documents():
+    rng = random.Random(0)
+    for _ in range(500):
+        assert_equivalent('\n\n'.join(rng.choice(PIECES) for _ in range(rng.randint(1, 8))))
@@ -0,0 +1,112 @@
+"""Incremental build staleness rules for the render stage"""
+
+import inspect
+import os
+
+import pytest
+
+import build_graph
+from build_graph import RENDER_OUTPUT_OPTIONS, BuildGraph, render_params
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """A minimal project: one Initiating report, its template and two pipeline modules"""
+    monkeypatch.setattr(build_graph, 'project_root', tmp_path)
+    report_dir = tmp_path / 'Tickers' / 'AZEK' / 'Initiating'
+    (report_dir / 'images').mkdir(parents=True)
+    (report_dir / 'AZEK.md').write_text('# Report\n\nBody.\n')
+    (report_dir / 'AZEK_config.yaml').write_text('ticker: AZEK\n')
+    (report_dir / 'images' / 'image1.png').write_bytes(b'png')
+    (tmp_path / 'src' / 'templates').mkdir(parents=True)
+    (tmp_path / 'src' / 'templates' / 'report.html').write_text('<html></html>')
+    (tmp_path / 'src' / 'generate_report.py').write_text('# renderer\n')
+    (tmp_path / 'src' / 'image_optimizer.py').write_text('# optimizer\n')
+    return tmp_path
+
+
+def build(graph: BuildGraph, tree, params):
+    output = tree / 'Tickers' / 'AZEK' / 'Initiating' / 'AZEK.Issue01.pdf'
+    output.write_bytes(b'%PDF')
+    graph.record_render('AZEK', 'Initiating', False, params, output)
+    return output
+
+
+def touch(path, text):
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_never_built_then_up_to_date(tree):
+    graph = BuildGraph(tree / 'stamps.json')
+    params = render_params({})
+    assert graph.render_stale('AZEK', 'Initiating', False, params) == 'never built'
+    build(graph, tree, params)
+    assert graph.render_stale('AZEK', 'Initiating', False, params) is None
+    assert graph.render_stale('AZEK', 'Initiating', True, params) == 'never built'
+
+
+def test_stamps_survive_a_reload(tree):
+    graph = BuildGraph(tree / 'stamps.json')
+    params = render_params({})
+    build(graph, tree, params)
+    graph.save()
+    assert BuildGraph(tree / 'stamps.json').render_stale('AZEK', 'Initiating', False, params) is None
+
+
+def test_edited_markdown_is_stale(tree):
+    graph = BuildGraph(tree / 'stamps.json')
+    build(graph, tree, render_params({}))
+    touch(tree / 'Tickers' / 'AZEK' / 'Initiating' / 'AZEK.md', '# Report\n\nEdited.\n')
+    assert graph.render_stale('AZEK', 'Initiating', False, render_params({})) == 'Tickers/AZEK/Initiating/AZEK.md changed'
+
+
+def test_touched_but_identical_file_is_not_stale(tree):
+    graph = BuildGraph(tree / 'stamps.json')
+    build(graph, tree, render_params({}))
+    touch(tree / 'Tickers' / 'AZEK' / 'Initiating' / 'AZEK.md', '# Report\n\nBody.\n')
+    assert graph.render_stale('AZEK', 'Initiating', False, render_params({})) is None
+
+
+def test_any_pipeline_module_is_an_input(tree):
+    graph = BuildGraph(tree / 'stamps.json')
+    build(graph, tree, render_params({}))
+    touch(tree / 'src' / 'image_optimizer.py', '# optimizer, tuned\n')
+    assert graph.render_stale('AZEK', 'Initiating', False, render_params({})) == 'src/image_optimizer.py changed'
+
+
+def test_added_image_and_missing_output_are_stale(tree):
+    graph = BuildGraph(tree / 'stamps.json')
+    output = build(graph, tree, render_params({}))
+    (tree / 'Tickers' / 'AZEK' / 'Initiating' / 'images' / 'image2.png').write_bytes(b'png2')
+    assert graph.render_stale('AZEK', 'Initiating', False, render_params({})).startswith('inputs added')
+    output.unlink()
+    assert graph.render_stale('AZEK', 'Initiating', False, render_params({})).startswith('missing output')
+
+
+@pytest.mark.parametrize('option, value', [
+    ('max_height_inches', 9.0),
+    ('split_mode', 'bisect'),
+    ('measure_backend', 'render'),
+    ('image_placeholders', True),
+    ('image_dpi', 150),
+    ('optimize_images', not RENDER_OUTPUT_OPTIONS['optimize_images']),
+    ('jpeg_quality', 70),
+    ('pdf_profile', 'screen'),
+])
+def test_output_affecting_option_change_is_stale(tree, option, value):
+    graph = BuildGraph(tree / 'stamps.json')
+    build(graph, tree, render_params({}))
+    assert graph.render_stale('AZEK', 'Initiating', False, render_params({option: value})) == 'options changed'
+
+
+def test_speed_only_options_are_not_part_of_the_stamp():
+    assert render_params({'use_measure_cache': False, 'measure_workers': 4, 'use_split_memo': False}) == render_params({})
+
+
+def test_option_defaults_match_render_pdf():
+    from generate_report import render_pdf
+
+    defaults = {name: parameter.default for name, parameter in inspect.signature(render_pdf).parameters.items()}
+    assert {name: defaults[name] for name in RENDER_OUTPUT_OPTIONS} == RENDER_OUTPUT_OPTIONS
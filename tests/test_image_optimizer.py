@@ -0,0 +1,63 @@
+"""image_optimizer: stat-keyed memo in front of the content-addressed cache"""
+
+import os
+
+import pytest
+
+PIL = pytest.importorskip('PIL')
+
+import image_optimizer
+
+
+@pytest.fixture
+def optimizer(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_optimizer, 'OPTIMIZED_DIR', tmp_path / 'optimized')
+    monkeypatch.setattr(image_optimizer, '_results_by_stat', {})
+    return image_optimizer
+
+
+def write_chart(path, color=(200, 30, 30)):
+    from PIL import Image
+
+    image = Image.new('RGB', (120, 80), (255, 255, 255))
+    image.paste(color, (10, 10, 60, 50))
+    image.save(path, 'PNG', compress_level=0)
+
+
+def test_unchanged_file_is_not_reread(optimizer, tmp_path, monkeypatch):
+    chart = tmp_path / 'chart.png'
+    write_chart(chart)
+    first = optimizer.optimize_image(chart)
+    assert first['kind'] == 'palette' and not first['cached']
+    assert first['bytes'] < first['source_bytes']
+
+    monkeypatch.setattr(optimizer.hashlib, 'sha256', lambda *args: pytest.fail('re-hashed an unchanged file'))
+    second = optimizer.optimize_image(chart)
+    assert second['cached'] and second['path'] == first['path']
+
+
+def test_changed_file_is_reoptimized(optimizer, tmp_path):
+    chart = tmp_path / 'chart.png'
+    write_chart(chart)
+    first = optimizer.optimize_image(chart)
+    write_chart(chart, color=(30, 30, 200))
+    stat = chart.stat()
+    os.utime(chart, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = optimizer.optimize_image(chart)
+    assert not second['cached'] and second['path'] != first['path']
+
+
+def test_jpeg_quality_is_part_of_the_key(optimizer, tmp_path):
+    chart = tmp_path / 'chart.png'
+    write_chart(chart)
+    optimizer.optimize_image(chart, jpeg_quality=85)
+    assert not optimizer.optimize_image(chart, jpeg_quality=70)['cached']
+
+
+def test_stats_reset_per_render(optimizer, tmp_path):
+    chart = tmp_path / 'chart.png'
+    write_chart(chart)
+    optimizer.optimized_path(chart)
+    assert optimizer.stats['images'] == 1
+    optimizer.reset_stats()
+    assert all(value == 0 for value in optimizer.stats.values())
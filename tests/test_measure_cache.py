@@ -0,0 +1,78 @@
+"""MeasureCache: persistent heights with least-recently-used eviction"""
+
+import itertools
+
+import pytest
+
+import generate_report
+import measure_cache
+from measure_cache import MeasureCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    ticks = itertools.count(1)
+    monkeypatch.setattr(measure_cache.time, 'time', lambda: float(next(ticks)))
+
+
+def test_heights_persist_across_connections(tmp_path):
+    cache = MeasureCache(tmp_path / 'cache.sqlite3')
+    cache.put_many({'a': 1.25, 'b': 0.5})
+    cache.close()
+    reopened = MeasureCache(tmp_path / 'cache.sqlite3')
+    assert reopened.get_many(['a', 'b', 'missing']) == {'a': 1.25, 'b': 0.5}
+    reopened.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = MeasureCache(tmp_path / 'cache.sqlite3', max_entries=3)
+    cache.put_many({'a': 1.0})
+    cache.put_many({'b': 2.0})
+    cache.put_many({'c': 3.0})
+    cache.get_many(['a'])  # 'b' is now the least recently used
+    cache.put_many({'d': 4.0})
+    assert cache.entry_count() == 3
+    assert cache.get_many(['a', 'b', 'c', 'd']) == {'a': 1.0, 'c': 3.0, 'd': 4.0}
+    cache.close()
+
+
+def test_digest_separates_parts():
+    assert measure_cache.digest(b'ab', b'c') != measure_cache.digest(b'a', b'bc')
+
+
+def fake_block_offsets(window, project_root, column_width=4.85, first_child=True, image_base=None):
+    """measure_block_offsets stand-in: list items are taller in a loose (multi-item) list"""
+    offsets, current = [], 0.0
+    for k, block in enumerate(window):
+        neighbours = [window[n] for n in (k - 1, k + 1) if 0 <= n < len(window)]
+        loose = block.kind == 'bullet' and any(n.kind == 'bullet' for n in neighbours)
+        current += 0.5 if loose else 0.25
+        offsets.append(current)
+    return offsets
+
+
+@pytest.fixture
+def cached_offsets(tmp_path, monkeypatch):
+    monkeypatch.setattr(measure_cache, '_default_cache', MeasureCache(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(generate_report, 'measurement_fingerprint', lambda project_root, column_width: 'fingerprint')
+    monkeypatch.setattr(generate_report, 'measure_block_offsets', fake_block_offsets)
+    
+    def offsets(content):
+        blocks = generate_report.parse_blocks(content)
+        return generate_report.measure_block_offsets_cached(blocks, tmp_path)[0]
+    return offsets
+
+
+@pytest.mark.parametrize('content', [
+    'Intro\n\n-   one\n\n-   two\n\nOutro',
+    'Intro\n\n-   one\n\nOutro',
+    '-   one\n\n-   two\n\n-   three',
+    '-   one\n\n-   two\n\n-   3',
+    'Preface\n\n-   one\n\n-   two',
+])
+def test_list_items_are_keyed_on_whether_the_list_continues(cached_offsets, content):
+    # Warm the cache with every variant first, so each content mixes hits and misses
+    for warm in ['Intro\n\n-   one\n\nOutro', 'Intro\n\n-   one\n\n-   two\n\nOutro', '-   one\n\n-   two\n\n-   three',
+                 'Intro\n\n-   one\n\n-   two']:
+        cached_offsets(warm)
+    assert cached_offsets(content) == fake_block_offsets(generate_report.parse_blocks(content), None)
@@ -0,0 +1,91 @@
+"""pdf_optimizer profiles on PDFs generated with PyMuPDF"""
+
+import io
+
+import pytest
+
+fitz = pytest.importorskip('fitz')
+PIL = pytest.importorskip('PIL')
+
+import output_defaults
+from pdf_optimizer import PROFILES, merge_pdfs, optimize_pdf
+
+
+def noisy_png(size=(300, 200), seed=1) -> bytes:
+    import random
+
+    from PIL import Image
+
+    rng = random.Random(seed)
+    image = Image.new('RGB', size)
+    image.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(size[0] * size[1])])
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def write_report(path, pages=3):
+    """A PDF whose pages each embed their own copy of the same image, saved without compression"""
+    image = noisy_png()
+    with fitz.open() as doc:
+        for number in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f'Page {number + 1}')
+            page.insert_image(fitz.Rect(72, 100, 372, 300), stream=image)
+        doc.save(str(path), deflate=False, garbage=0)
+    return path
+
+
+@pytest.mark.parametrize('profile', ['print', 'screen', 'archive'])
+def test_profiles_shrink_duplicated_images(tmp_path, profile):
+    source = write_report(tmp_path / 'report.pdf')
+    before = source.stat().st_size
+    result = optimize_pdf(str(source), profile)
+    assert result['bytes_before'] == before
+    assert result['bytes_after'] == source.stat().st_size < before
+    with fitz.open(str(source)) as doc:
+        assert doc.page_count == 3
+        assert 'Page 2' in doc[1].get_text()
+
+
+def test_archive_profile_has_no_object_streams(tmp_path):
+    source = write_report(tmp_path / 'report.pdf')
+    optimize_pdf(str(source), 'archive')
+    assert b'/ObjStm' not in source.read_bytes()
+
+
+def test_output_path_leaves_the_source_untouched(tmp_path):
+    source = write_report(tmp_path / 'report.pdf')
+    original = source.read_bytes()
+    result = optimize_pdf(str(source), 'print', str(tmp_path / 'web.pdf'))
+    assert source.read_bytes() == original
+    assert result['output'] == str(tmp_path / 'web.pdf')
+
+
+def test_already_optimal_pdf_is_kept(tmp_path):
+    source = write_report(tmp_path / 'report.pdf')
+    optimize_pdf(str(source), 'print')
+    optimized = source.read_bytes()
+    result = optimize_pdf(str(source), 'print')
+    assert result['bytes_after'] == result['bytes_before']
+    assert source.read_bytes() == optimized
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_merge_keeps_every_page(tmp_path):
+    first = write_report(tmp_path / 'a.pdf', pages=2)
+    second = write_report(tmp_path / 'b.pdf', pages=1)
+    result = merge_pdfs([str(first), str(second)], str(tmp_path / 'bundle.pdf'))
+    with fitz.open(result['output']) as doc:
+        assert doc.page_count == 3
+    assert result['bytes_after'] < result['bytes_before']
+
+
+def test_unknown_profile_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        optimize_pdf(str(tmp_path / 'missing.pdf'), 'poster')
+
+
+def test_profile_names_match_output_defaults():
+    # The CLIs offer output_defaults.PDF_PROFILES without importing this module
+    assert tuple(PROFILES) == output_defaults.PDF_PROFILES
@@ -0,0 +1,131 @@
+"""The bisect and estimate splits must find the same first-page split as the linear scan"""
+
+import math
+import random
+import re
+
+import pytest
+
+import generate_report
+from generate_report import _find_split_bisect, _find_split_estimate, _find_split_linear, parse_blocks, split_blocks_by_height
+
+
+def fake_heights(heights, failing=frozenset()):
+    """measure_content_height stand-in: a prefix is as tall as the blocks it contains"""
+    def measure(html_content, project_root, column_width=4.85, backend='pdf'):
+        indices = [int(index) for index in re.findall(r'Block(\d+)', html_content)]
+        if failing.intersection(indices):
+            raise RuntimeError(f'render failed with block {min(failing.intersection(indices))}')
+        return sum(heights[index] for index in indices)
+    return measure
+
+
+class FakePool:
+    """MeasurePool stand-in measuring every probe of a round in one call"""
+
+    def __init__(self, workers, measure):
+        self.workers = workers
+        self.measure = measure
+
+    def measure_heights(self, htmls, column_width, backend):
+        results = []
+        for html_content in htmls:
+            try:
+                results.append(self.measure(html_content, None, column_width, backend))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+def make_blocks(count):
+    return parse_blocks('\n\n'.join(f'Block{index} text.' for index in range(count)))
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_bisect_matches_linear(seed, tmp_path, monkeypatch):
+    rng = random.Random(seed)
+    heights = [rng.choice([0.0, 0.2, 0.5, 1.4, 3.0]) for _ in range(rng.randint(1, 40))]
+    monkeypatch.setattr(generate_report, 'measure_content_height', fake_heights(heights))
+    blocks = make_blocks(len(heights))
+    max_height = rng.uniform(0.1, sum(heights) + 1)
+
+    linear = split_blocks_by_height(blocks, max_height, tmp_path, mode='linear', use_cache=False)
+    bisect = split_blocks_by_height(blocks, max_height, tmp_path, mode='bisect', use_cache=False)
+    assert bisect == linear
+
+
+@pytest.mark.parametrize('workers', [1, 2, 3, 7])
+def test_pooled_bisect_matches_linear(workers, tmp_path):
+    rng = random.Random(workers)
+    for _ in range(25):
+        heights = [rng.uniform(0, 2) for _ in range(rng.randint(1, 60))]
+        pool = FakePool(workers, fake_heights(heights))
+        blocks = make_blocks(len(heights))
+        max_height = rng.uniform(0.5, sum(heights) * 1.1)
+        linear, _ = _find_split_linear(blocks, max_height, tmp_path, 4.85, 'pdf', pool)
+        bisect, _ = _find_split_bisect(blocks, max_height, tmp_path, 4.85, 'pdf', pool)
+        assert bisect == linear
+
+
+def fake_estimate(heights, scale):
+    """estimate_block_offsets stand-in: the real offsets scaled by `scale` (> 1 overestimates)"""
+    def estimate(blocks, project_root, column_width=4.85, first_child=True, image_base=None):
+        offsets, total = [], 0.0
+        for index in range(len(blocks)):
+            total += heights[index]
+            offsets.append(total * scale)
+        return offsets
+    return estimate
+
+
+@pytest.mark.parametrize('scale', [0.5, 0.8, 1.0, 1.25, 2.0, 10.0])
+def test_estimate_matches_linear(scale, tmp_path, monkeypatch):
+    rng = random.Random(int(scale * 100))
+    for _ in range(25):
+        heights = [rng.choice([0.0, 0.2, 0.5, 1.4, 3.0]) for _ in range(rng.randint(1, 40))]
+        monkeypatch.setattr(generate_report, 'measure_content_height', fake_heights(heights))
+        monkeypatch.setattr(generate_report, 'estimate_block_offsets', fake_estimate(heights, scale))
+        blocks = make_blocks(len(heights))
+        max_height = rng.uniform(0.1, sum(heights) + 1)
+        linear, _ = _find_split_linear(blocks, max_height, tmp_path, 4.85)
+        estimate, _ = _find_split_estimate(blocks, max_height, tmp_path, 4.85)
+        assert estimate == linear
+
+
+def test_overestimate_steps_forward_to_the_first_overflow(tmp_path, monkeypatch):
+    heights = [1.0] * 12
+    monkeypatch.setattr(generate_report, 'measure_content_height', fake_heights(heights))
+    monkeypatch.setattr(generate_report, 'estimate_block_offsets', fake_estimate(heights, 1.5))
+    split_index, measurements = _find_split_estimate(make_blocks(len(heights)), 9.5, tmp_path, 4.85)
+    # The estimate stops at 6 blocks; 9 fit, so 6 → 7 → 8 → 9 fit and 10 overflows
+    assert (split_index, measurements) == (9, 5)
+
+
+def test_exact_estimate_costs_two_renders(tmp_path, monkeypatch):
+    heights = [1.0] * 12
+    monkeypatch.setattr(generate_report, 'measure_content_height', fake_heights(heights))
+    monkeypatch.setattr(generate_report, 'estimate_block_offsets', fake_estimate(heights, 1.0))
+    assert _find_split_estimate(make_blocks(len(heights)), 9.5, tmp_path, 4.85) == (9, 2)
+
+
+def test_bisect_measures_logarithmically(tmp_path, monkeypatch):
+    heights = [0.25] * 64
+    monkeypatch.setattr(generate_report, 'measure_content_height', fake_heights(heights))
+    blocks = make_blocks(len(heights))
+    split_index, measurements = _find_split_bisect(blocks, 9.5, tmp_path, 4.85)
+    assert split_index == 38
+    assert measurements <= math.ceil(math.log2(len(blocks) + 1))
+
+
+def test_everything_fits(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_report, 'measure_content_height', fake_heights([0.1] * 5))
+    blocks = make_blocks(5)
+    assert split_blocks_by_height(blocks, 9.5, tmp_path, mode='linear', use_cache=False) == 5
+    assert split_blocks_by_height(blocks, 9.5, tmp_path, mode='bisect', use_cache=False) == 5
+
+
+def test_unmeasurable_first_block_keeps_one_block(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_report, 'measure_content_height', fake_heights([1.0] * 6, failing={0}))
+    blocks = make_blocks(6)
+    assert split_blocks_by_height(blocks, 9.5, tmp_path, mode='linear', use_cache=False) == 1
+    assert split_blocks_by_height(blocks, 9.5, tmp_path, mode='bisect', use_cache=False) == 1
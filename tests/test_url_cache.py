@@ -0,0 +1,41 @@
+"""CachingURLFetcher: revalidation, shared bytes on hits and LRU eviction"""
+
+import os
+
+from url_cache import CachingURLFetcher
+
+
+def test_hit_returns_the_cached_bytes_object(tmp_path):
+    path = tmp_path / 'logo.png'
+    path.write_bytes(b'x' * 4096)
+    fetcher = CachingURLFetcher()
+    first = fetcher(path.as_uri())['string']
+    second = fetcher(path.as_uri())['string']
+    assert second is first
+    assert fetcher.stats['hits'] == 1 and fetcher.stats['misses'] == 1
+
+
+def test_changed_file_is_reread(tmp_path):
+    path = tmp_path / 'chart.png'
+    path.write_bytes(b'old')
+    fetcher = CachingURLFetcher()
+    fetcher(path.as_uri())
+    path.write_bytes(b'newer')
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    assert fetcher(path.as_uri())['string'] == b'newer'
+    assert fetcher.cached_bytes == len(b'newer')
+
+
+def test_least_recently_used_file_is_evicted(tmp_path):
+    paths = [tmp_path / f'{name}.bin' for name in 'abc']
+    for path in paths:
+        path.write_bytes(b'0' * 100)
+    fetcher = CachingURLFetcher(max_bytes=250)
+    fetcher(paths[0].as_uri())
+    fetcher(paths[1].as_uri())
+    fetcher(paths[0].as_uri())  # a is now more recent than b
+    fetcher(paths[2].as_uri())
+    assert fetcher.stats['evictions'] == 1
+    assert fetcher.cached_bytes == 200
+    fetcher(paths[0].as_uri())
+    assert fetcher.stats['hits'] == 2